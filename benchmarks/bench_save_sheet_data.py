@@ -0,0 +1,102 @@
+"""对比 save_sheet_data 批量写入与逐行写入的性能
+
+同时测量不做任何值转换、直接 executemany 写入同样类型的表所需的时间，作为
+SQLite 写入本身的下限。旧的逐行写入同样只在一个事务中提交，因此相对旧方式
+能达到的最大加速比约为 逐行写入耗时 / 写入下限。
+
+用法：
+    python benchmarks/bench_save_sheet_data.py --rows 300000 --cols 20
+"""
+import argparse
+import os
+import random
+import sqlite3
+import string
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_processor import ExcelProcessor
+from models.column_types import TYPE_SAMPLE_SIZE, infer_column_types
+
+def generate_rows(row_count: int, col_count: int, seed: int = 0):
+    """生成数字与字符串混合的测试数据"""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(row_count):
+        row = []
+        for col in range(col_count):
+            if col % 2:
+                row.append(rng.random() * 10000)
+            else:
+                row.append("".join(rng.choices(string.ascii_letters, k=8)))
+        rows.append(row)
+    return rows
+
+def legacy_save(db_path: str, table_name: str, headers, data):
+    """旧的写入方式：每行构建一次值列表并单独执行 INSERT"""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS [{table_name}]")
+        conn.execute(f"CREATE TABLE [{table_name}] ({', '.join(f'[{h}] TEXT' for h in headers)})")
+        insert_sql = f"INSERT INTO [{table_name}] ({','.join(f'[{h}]' for h in headers)}) VALUES ({','.join('?' for _ in headers)})"
+        for row in data:
+            values = []
+            for header in headers:
+                value = row.get(header, "")
+                if isinstance(value, str):
+                    value = value.replace('\x00', '').strip()
+                values.append(value)
+            conn.execute(insert_sql, values)
+        conn.commit()
+    finally:
+        conn.close()
+
+def raw_insert(db_path: str, table_name: str, headers, column_types, rows):
+    """写入下限：预先构建好的行直接交给 executemany，不做任何转换"""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"CREATE TABLE [{table_name}] ({', '.join(f'[{h}] {t}' for h, t in zip(headers, column_types))})")
+        insert_sql = f"INSERT INTO [{table_name}] VALUES ({','.join('?' for _ in headers)})"
+        conn.execute("BEGIN")
+        conn.executemany(insert_sql, rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--cols", type=int, default=20)
+    args = parser.parse_args()
+
+    headers = [f"col_{i}" for i in range(args.cols)]
+    rows = generate_rows(args.rows, args.cols)
+    dict_rows = [dict(zip(headers, row)) for row in rows]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_db = os.path.join(tmp_dir, "legacy.db")
+        start = perf_counter()
+        legacy_save(legacy_db, "bench_Sheet1", headers, dict_rows)
+        legacy_seconds = perf_counter() - start
+
+        processor = ExcelProcessor(db_path=os.path.join(tmp_dir, "bulk.db"))
+        result = processor.save_sheet_data("bench.xlsx", "Sheet1", headers, rows)
+
+        column_types = infer_column_types(rows[:TYPE_SAMPLE_SIZE], len(headers))
+        start = perf_counter()
+        raw_insert(os.path.join(tmp_dir, "raw.db"), "bench_Sheet1", headers, column_types, rows)
+        raw_seconds = perf_counter() - start
+
+    legacy_rate = args.rows / legacy_seconds
+    print(f"逐行写入: {legacy_seconds:.3f} 秒, {legacy_rate:.0f} 行/秒")
+    print(f"批量写入: {result.seconds:.3f} 秒, {result.rows_per_second:.0f} 行/秒")
+    print(f"写入下限: {raw_seconds:.3f} 秒, {args.rows / raw_seconds:.0f} 行/秒")
+    print(f"加速比: {legacy_seconds / result.seconds:.1f}x（上限约 {legacy_seconds / raw_seconds:.1f}x）")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Excel 打开、解码、显示和导入路径的基准测试
+
+在临时目录中用 openpyxl 生成合成工作簿（行数、列数、工作表数量、合并单元格
+密度和字符串/数字比例可调），分别计时以下路径：
+
+    read_excel_structure      读取工作簿结构
+    read_sheet_data           解码第一个工作表
+    TableModel.setData        行数据转换为列式存储并设置到模型
+    MergedTableView.setMergedCells  设置合并单元格（offscreen Qt 平台）
+    save_sheet_data           写入 SQLite
+    get_sheet_data_from_db    从 SQLite 读回
+
+结果保存为 JSON；指定基线文件时与基线比较，中位数耗时变慢超过阈值的项目
+标记为回归，并以退出码 1 结束，便于在 CI 中使用。被测路径没有返回数据时
+（ExcelProcessor 会捕获异常并返回空结果）立即以退出码 2 结束并指出失败的路径。
+
+用法：
+    python benchmarks/bench_suite.py --rows 1000,20000 --cols 10 --output bench.json
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json --save-baseline
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import sys
+import tempfile
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+# Qt 视图使用 offscreen 平台，无需显示器
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook
+from PyQt6.QtWidgets import QApplication
+from excel_processor import ExcelProcessor
+from models.table_model import TableModel
+from widgets.merged_table_view import MergedTableView
+
+# 默认的回归阈值：中位数耗时比基线慢 20% 以上
+DEFAULT_THRESHOLD = 0.2
+# 变慢的绝对值小于该值（毫秒）时视为测量噪声，不判定为回归
+DEFAULT_MIN_DELTA_MS = 1.0
+
+class BenchmarkError(RuntimeError):
+    """被测路径失败或返回了空结果，基准结果没有意义"""
+
+def generate_workbook(path: str, rows: int, cols: int, sheets: int, merge_density: float,
+                      string_ratio: float, seed: int = 0) -> int:
+    """生成合成工作簿，返回每个工作表的合并区域数量
+
+    第一行是列名；每列按 string_ratio 决定是字符串列还是数字列。合并区域为
+    互不重叠的 2x2 区域，数量为 数据行数 * merge_density。
+    """
+    rng = random.Random(seed)
+    string_columns = {col for col in range(cols) if rng.random() < string_ratio}
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    merge_count = 0
+    for sheet_index in range(sheets):
+        sheet = workbook.create_sheet(f"Sheet{sheet_index + 1}")
+        sheet.append([f"col_{col}" for col in range(cols)])
+        for _ in range(rows):
+            sheet.append([
+                "".join(rng.choices(string.ascii_letters, k=8)) if col in string_columns
+                else round(rng.random() * 10000, 3)
+                for col in range(cols)
+            ])
+
+        # 在 2x2 网格上随机挑选不重复的位置，保证合并区域互不重叠
+        grid_rows, grid_cols = rows // 2, cols // 2
+        merge_count = min(int(rows * merge_density), grid_rows * grid_cols)
+        for cell in rng.sample(range(grid_rows * grid_cols), merge_count):
+            row = cell // grid_cols * 2 + 2  # 跳过列名行，openpyxl 行号从 1 开始
+            col = cell % grid_cols * 2 + 1
+            sheet.merge_cells(start_row=row, start_column=col, end_row=row + 1, end_column=col + 1)
+    workbook.save(path)
+    return merge_count
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """重复执行 func 并统计耗时"""
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        samples.append(perf_counter() - start)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "max": max(samples),
+        "repeat": repeat,
+    }
+
+def run_case(tmp_dir: str, rows: int, args) -> Dict[str, Dict[str, float]]:
+    """对一种数据规模运行全部基准，返回 {基准名称: 统计结果}"""
+    path = os.path.join(tmp_dir, f"bench_{rows}x{args.cols}.xlsx")
+    merge_count = generate_workbook(path, rows, args.cols, args.sheets, args.merge_density,
+                                    args.string_ratio, args.seed)
+    results = {}
+
+    def read_structure():
+        processor = ExcelProcessor(db_path=os.path.join(tmp_dir, "bench.db"))
+        processor.read_excel_structure(path)
+        processor.close()
+    results["read_excel_structure"] = measure(read_structure, args.repeat)
+
+    processor = ExcelProcessor(db_path=os.path.join(tmp_dir, "bench.db"))
+    if not processor.read_excel_structure(path):
+        raise BenchmarkError(f"read_excel_structure 没有读到工作表: {path}")
+    loaded = {}
+
+    def read_sheet():
+        loaded["data"], loaded["merged_cells"] = processor.read_sheet_data(0)
+        # 解码失败时 read_sheet_data 记录日志后返回 ([], [])
+        if not loaded["data"]:
+            raise BenchmarkError(f"read_sheet_data 没有返回数据: {path} 的第一个工作表，失败原因见日志")
+    results["read_sheet_data"] = measure(read_sheet, args.repeat)
+    data, merged_cells = loaded["data"], loaded["merged_cells"]
+
+    model = TableModel()
+    results["TableModel.setData"] = measure(lambda: model.setData(data, merged_cells), args.repeat)
+
+    view = MergedTableView()
+    view.resize(1200, 800)
+    view.setModel(model)
+    results["MergedTableView.setMergedCells"] = measure(lambda: view.setMergedCells(merged_cells), args.repeat)
+
+    headers, body = [str(value) for value in data[0]], data[1:]
+
+    def save_sheet():
+        if processor.save_sheet_data(path, "Sheet1", headers, body) is None:
+            raise BenchmarkError(f"save_sheet_data 没有写入数据: {path} - Sheet1")
+    results["save_sheet_data"] = measure(save_sheet, args.repeat)
+
+    def read_from_db():
+        _, rows = processor.get_sheet_data_from_db(path, "Sheet1")
+        if len(rows) != len(body):
+            raise BenchmarkError(f"get_sheet_data_from_db 读回 {len(rows)} 行，应为 {len(body)} 行: {path} - Sheet1")
+    results["get_sheet_data_from_db"] = measure(read_from_db, args.repeat)
+    processor.close()
+    view.deleteLater()
+
+    for stats in results.values():
+        stats["rows"] = rows
+        stats["merged_cells"] = merge_count
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float, min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[str]:
+    """与基线比较中位数耗时，返回回归的基准名称"""
+    regressions = []
+    print(f"\n{'基准':<60}{'基线(ms)':>12}{'当前(ms)':>12}{'变化':>10}")
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<60}{'-':>12}{stats['median'] * 1000:>12.2f}{'新增':>10}")
+            continue
+        ratio = stats["median"] / base["median"] if base["median"] else float("inf")
+        delta_ms = (stats["median"] - base["median"]) * 1000
+        flag = "  回归" if ratio > 1 + threshold and delta_ms >= min_delta_ms else ""
+        print(f"{key:<60}{base['median'] * 1000:>12.2f}{stats['median'] * 1000:>12.2f}{ratio - 1:>+10.1%}{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000,20000", help="逗号分隔的数据行数列表")
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--sheets", type=int, default=3)
+    parser.add_argument("--merge-density", type=float, default=0.01, help="每行数据对应的合并区域数量")
+    parser.add_argument("--string-ratio", type=float, default=0.5, help="字符串列所占比例")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="结果 JSON 文件路径")
+    parser.add_argument("--baseline", help="基线 JSON 文件路径")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果写入基线文件")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="判定回归的相对变慢比例")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="判定回归的最小变慢绝对值（毫秒）")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in (int(value) for value in args.rows.split(",")):
+            try:
+                case_results = run_case(tmp_dir, rows, args)
+            except BenchmarkError as e:
+                print(f"\n基准测试失败 [rows={rows},cols={args.cols}]: {e}", file=sys.stderr)
+                app.quit()
+                sys.exit(2)
+            for name, stats in case_results.items():
+                key = f"{name}[rows={rows},cols={args.cols}]"
+                results[key] = stats
+                print(f"{key:<60}{stats['median'] * 1000:>12.2f} ms")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存到 {args.output}")
+
+    regressions = []
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n基线已保存到 {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} 项基准比基线慢 {args.threshold:.0%} 以上")
+        else:
+            print("\n没有发现性能回归")
+
+    app.quit()
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,52 @@
 import sqlite3
-from typing import Optional, List, Dict, Tuple, Union, Any
+from typing import Optional, List, Dict, Tuple, Union, Any, Callable, Iterator, Iterable, Sequence
+from itertools import islice, chain
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from collections import Counter
+from time import perf_counter
+import multiprocessing
 import os
+import json
+import hashlib
 import logging
+import threading
 import polars as pl
 from dataclasses import dataclass
 from models.timer import PerformanceTimer
 from models.decorators import ExceptionHandler
-from fastexcel import read_excel
+from models.row_source import DbRowSource
+from models.column_store import ColumnStore
+from models.sheet_cache import SheetCache
+from models.sheet_memory_cache import SheetMemoryCache, DEFAULT_MEMORY_CACHE_BYTES
+from models.column_types import SQL_TEXT, SQL_INTEGER, TYPE_SAMPLE_SIZE, sample_rows, infer_column_types, convert_row_chunks
+from models.fingerprint import ROW_HASH_COLUMN, FingerprintBuilder, row_hash
+from models import search_index
 from python_calamine import CalamineWorkbook
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('excel_processor.log')
-    ]
-)
+from models.logging_setup import CELL_LOGGER_NAME
+
+logger = logging.getLogger(__name__)
+# 合并单元格列表等单元格级别的数据，默认级别下不输出
+cell_logger = logging.getLogger(CELL_LOGGER_NAME)
+
+# 批量导入时每次 executemany 写入的行数
+BULK_INSERT_CHUNK_SIZE = 5000
+# 批量导入时 SQLite 页缓存大小（KB）
+BULK_LOAD_CACHE_SIZE_KB = 64 * 1024
+# 从数据库流式读取时每批的行数
+DB_FETCH_BATCH_SIZE = 5000
+# 导入整个工作簿时，工作进程每批转换为列式数据的行数
+IMPORT_BATCH_SIZE = 50000
+# 记录已导入工作表的检查点表
+IMPORT_CHECKPOINT_TABLE = "_import_checkpoint"
+# 记录每个数据表来源和内容指纹的元数据表
+SHEET_CATALOG_TABLE = "_sheet_catalog"
+# 搜索单元格时每执行多少条 SQLite 虚拟机指令检查一次是否取消
+SEARCH_PROGRESS_INTERVAL = 1000
+
+# 保存方式
+SAVE_MODE_FULL = "full"  # 重建整张表
+SAVE_MODE_DIFF = "diff"  # 按行哈希只更新变化的行
+SAVE_MODE_SKIPPED = "skipped"  # 内容未变化，跳过
 
 @dataclass
 class SheetInfo:
@@ -24,17 +54,190 @@ class SheetInfo:
     sheet_name: str
     sheet_id:int
 
+@dataclass
+class SaveResult:
+    """工作表保存到数据库的结果"""
+    table_name: str
+    row_count: int
+    seconds: float
+    mode: str = SAVE_MODE_FULL
+    changed_rows: int = 0  # 实际写入（插入、更新或删除）的行数
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.row_count / self.seconds if self.seconds > 0 else 0.0
+
+@dataclass
+class CatalogEntry:
+    """_sheet_catalog 中记录的已导入工作表"""
+    table_name: str
+    file_path: str
+    sheet_name: str
+    row_count: int
+    column_count: int
+    column_types: List[str]
+    imported_at: str
+    fingerprint: Optional[str]
+    data_row: int = 0  # 第一行数据在源工作表中的行号（从 0 开始）
+    data_col: int = 0  # 第一列数据在源工作表中的列号（从 0 开始）
+
+@dataclass
+class CellMatch:
+    """全文搜索命中的单元格，行列为源工作表中的位置（从 0 开始）"""
+    file_path: str
+    sheet_name: str
+    table_name: str
+    column_name: str
+    row: int
+    column: int
+    value: str
+
+@dataclass
+class SheetImportResult:
+    """导入整个工作簿时单个工作表的结果"""
+    sheet_name: str
+    table_name: Optional[str]
+    row_count: int
+    decode_seconds: float  # 工作进程中解码和转换为列式数据的耗时
+    write_seconds: float  # 写入 SQLite 的耗时
+    error: Optional[str] = None
+    mode: Optional[str] = None  # 保存方式，见 SAVE_MODE_*
+
+@dataclass
+class WorkbookImportResult:
+    """导入整个工作簿的结果"""
+    file_path: str
+    sheets: List[SheetImportResult]
+    seconds: float
+    workers: int
+
+    @property
+    def row_count(self) -> int:
+        return sum(sheet.row_count for sheet in self.sheets)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.row_count / self.seconds if self.seconds > 0 else 0.0
+
+def get_merged_ranges(sheet_data: Any) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """读取 calamine 工作表对象的合并单元格区域
+
+    python-calamine 0.8 起使用 merged_cell_ranges 属性，早期版本使用 ranges。
+
+    Returns:
+        [((start_row, start_col), (end_row, end_col)), ...]
+    """
+    raw_ranges = getattr(sheet_data, "merged_cell_ranges", None) or getattr(sheet_data, "ranges", None) or []
+    return [
+        ((int(start_row), int(start_col)), (int(end_row), int(end_col)))
+        for (start_row, start_col), (end_row, end_col) in raw_ranges
+    ]
+
+def decode_sheet_for_import(file_path: str, sheet_name: str,
+                             batch_size: int = IMPORT_BATCH_SIZE) -> Tuple[str, Optional[List[Any]], List[pl.DataFrame], list, Tuple[int, int], float]:
+    """在工作进程中解码工作表，第一行作为列名，其余行按批转换为列式数据
+
+    Categorical 列转换为普通字符串列，避免跨进程传递依赖本进程的全局字符串缓存。
+
+    Returns:
+        (工作表名称, 第一行, 数据批次列表, 合并单元格信息, 第一个数据单元格的位置, 耗时秒数)
+    """
+    start = perf_counter()
+    with CalamineWorkbook.from_path(file_path) as workbook:
+        sheet_data = workbook.get_sheet_by_name(sheet_name)
+    start_row, start_col = sheet_data.start or (0, 0)
+    rows = sheet_data.iter_rows()
+    # iter_rows 从第 1 行开始返回，已用区域之前的空行不是列名
+    next(islice(rows, start_row, start_row), None)
+    header = next(rows, None)
+
+    def to_frame(batch):
+        frame = ColumnStore.from_rows(batch).to_frame()
+        return frame.with_columns(pl.col(pl.Categorical).cast(pl.String))
+
+    frames = []
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        frames.append(to_frame(batch))
+    merged_cells = get_merged_ranges(sheet_data)
+    # 数据从已用区域第一行（列名）的下一行开始，iter_rows 不包含前导空列
+    return sheet_name, header, frames, merged_cells, (start_row + 1, start_col), perf_counter() - start
+
+def create_decode_pool(max_workers: int) -> ProcessPoolExecutor:
+    """创建解码工作表的进程池
+
+    当前进程是多线程的 Qt 进程（线程池、日志监听线程、Polars 线程池），fork 出的
+    子进程可能继承其它线程持有的锁而死锁，因此使用 spawn 方式启动工作进程。
+    提交的任务函数必须定义在模块级别，以便在子进程中按名称导入。
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+def _pausable(rows: Iterator[Any], resume_event: threading.Event,
+              check_every: int = BULK_INSERT_CHUNK_SIZE) -> Iterator[Any]:
+    """每产生 check_every 行检查一次暂停状态，暂停时阻塞直到恢复"""
+    for count, row in enumerate(rows):
+        if count % check_every == 0:
+            resume_event.wait()
+        yield row
+
 class ExcelProcessor:
-    def __init__(self, db_path: str = "data.db"):
+    def __init__(self, db_path: str = "data.db", sheet_cache: Optional[SheetCache] = None,
+                 memory_cache_bytes: int = DEFAULT_MEMORY_CACHE_BYTES):
         """初始化Excel处理器
         
         Args:
             db_path: SQLite数据库路径
+            sheet_cache: 工作表解析结果的磁盘缓存，不指定时不使用缓存
+            memory_cache_bytes: 当前工作簿已解码工作表的内存缓存上限（字节）
         """
         self.db_path = db_path
+        self.sheet_cache = sheet_cache
+        self.memory_cache = SheetMemoryCache(memory_cache_bytes)  # 预取和已加载的工作表
         self.file_path = None
-        self.sheet_info = [] # 缓存工作表信息
-        self.excel_reader = None
+        self.sheets_info = [] # 缓存工作表信息
+        self.workbook = None  # 当前打开的工作簿句柄，在多次读取工作表之间复用
+        self._file_signature = None  # 打开工作簿时文件的 (mtime, size)，用于检测文件变化
+        self._lock = threading.RLock()  # 保护工作簿句柄，允许在后台线程中读取工作表
+        self._loading_sheets = Counter()  # 前台正在加载的工作表索引及任务数，预取时跳过这些工作表
+
+    def _get_file_signature(self, file_path: str) -> Tuple[int, int]:
+        """获取文件签名（修改时间和大小），用于判断文件是否被修改"""
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _open_workbook(self):
+        """打开工作簿并缓存句柄和工作表信息"""
+        with self._lock:
+            self.close()
+            # 文件变化后内存中的工作表全部失效
+            self.memory_cache.clear()
+            self._file_signature = self._get_file_signature(self.file_path)
+            self.workbook = CalamineWorkbook.from_path(self.file_path)
+            self.sheets_info = [
+                SheetInfo(sheet_id=idx, sheet_name=name)
+                for idx, name in enumerate(self.workbook.sheet_names)
+            ]
+
+    def _ensure_workbook(self):
+        """确保工作簿句柄可用，文件在打开后被修改时重新打开"""
+        if self.workbook is None:
+            raise ValueError("请先调用 read_excel_structure 方法读取工作表信息")
+
+        if self._get_file_signature(self.file_path) != self._file_signature:
+            logger.info(f"检测到文件已修改，重新打开工作簿: {self.file_path}")
+            self._open_workbook()
+        return self.workbook
+
+    def close(self):
+        """关闭当前工作簿句柄"""
+        with self._lock:
+            if self.workbook is not None:
+                if hasattr(self.workbook, "close"):
+                    self.workbook.close()
+                self.workbook = None
+                self._file_signature = None
     
     def _handle_duplicate_headers(self, headers: List[str]) -> List[str]:
         """处理重复的列名
@@ -83,7 +286,9 @@ class ExcelProcessor:
         file_name = os.path.splitext(os.path.basename(file_path))[0]
         # 将非法字符替换为下划线
         file_name = ''.join(c if c.isalnum() else '_' for c in file_name)
-        return f"{file_name}_{sheet_name}"
+        # 不同目录下的同名文件用绝对路径的短哈希区分，避免导入时互相覆盖
+        path_hash = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:8]
+        return f"{file_name}_{path_hash}_{sheet_name}"
 
     @ExceptionHandler(error_message="打开Excel文件失败", return_value=[])
     def read_excel_structure(self, file_path: str) -> List[SheetInfo]:
@@ -96,29 +301,14 @@ class ExcelProcessor:
             
         # 只测量实际读取 Excel 的时间
         with PerformanceTimer("Excel读取操作"):
-            self.excel_reader = read_excel(self.file_path)
-            sheets:List[str] = self.excel_reader.sheet_names
-
-            self.sheets_info = [
-                SheetInfo(sheet_id=idx, sheet_name=name)
-                for idx, name in enumerate(sheets)
-            ]
-            print(self.sheets_info)
-            logging.info(f"成功读取 {len(self.sheets_info)} 个工作表")
+            # 打开一次工作簿，后续切换工作表时复用该句柄
+            self._open_workbook()
+            logger.debug("工作表信息: %s", self.sheets_info)
+            logger.info(f"成功读取 {len(self.sheets_info)} 个工作表")
         return self.sheets_info    
   
-    @ExceptionHandler(error_message="读取工作表数据失败", return_value=([], []))
-    def read_sheet_data(self, sheet: Union[SheetInfo, int, str]) -> Tuple[List[List[Any]], List[Tuple[Tuple[int, int], Tuple[int, int]]]]:
-        """读取指定工作表的数据和合并单元格信息
-        
-        Returns:
-            Tuple[List[List[Any]], List[Tuple[Tuple[int, int], Tuple[int, int]]]]:
-            - 第一个元素是工作表数据
-            - 第二个元素是合并单元格信息，格式为 [((start_row, start_col), (end_row, end_col)), ...]
-        """
-        if not self.excel_reader:
-            raise ValueError("请先调用 read_excel_structure 方法读取工作表信息")
-        
+    def _resolve_sheet(self, sheet: Union[SheetInfo, int, str]) -> SheetInfo:
+        """将工作表索引、名称或 SheetInfo 统一解析为 SheetInfo"""
         target_sheet = None
         if isinstance(sheet,SheetInfo):
             target_sheet = sheet
@@ -134,43 +324,136 @@ class ExcelProcessor:
 
             if not target_sheet:
                 raise ValueError(f"未找到Sheet名为: {sheet} 的工作表")
+        return target_sheet
+
+    def open_sheet(self, sheet: Union[SheetInfo, int, str],
+                   dedicated_handle: bool = False) -> Tuple[SheetInfo, Any, List[Tuple[Tuple[int, int], Tuple[int, int]]]]:
+        """解码指定工作表，返回工作表信息、calamine 工作表对象和合并单元格信息
+
+        可在后台线程中调用，对共享工作簿句柄的访问由锁保护
+
+        Args:
+            sheet: 工作表索引、名称或 SheetInfo
+            dedicated_handle: 为本次解码单独打开工作簿并在锁外解码，
+                预取等低优先级任务使用，解码期间不会阻塞前台加载
+        """
+        with self._lock:
+            workbook = self._ensure_workbook()
+            target_sheet = self._resolve_sheet(sheet)
+            file_path = self.file_path
+            if not dedicated_handle:
+                # 使用已打开的工作簿句柄读取数据，只解码当前工作表
+                sheet_data = workbook.get_sheet_by_name(target_sheet.sheet_name)
+        if dedicated_handle:
+            with CalamineWorkbook.from_path(file_path) as workbook:
+                sheet_data = workbook.get_sheet_by_name(target_sheet.sheet_name)
+
+        # 获取并转换合并单元格信息
+        merged_cells = get_merged_ranges(sheet_data)
+        cell_logger.debug("工作表 %s 的合并单元格信息: %s", target_sheet.sheet_name, merged_cells)
+        return target_sheet, sheet_data, merged_cells
+
+    def iter_sheet_rows(self, sheet_data: Any, batch_size: int = 5000, first_batch_size: Optional[int] = None) -> Iterator[List[List[Any]]]:
+        """按批次迭代工作表行数据
+
+        与 to_python(skip_empty_area=False) 一致，数据从 A1 开始。iter_rows 已经包含
+        数据区域之前的空行，只需用空字符串补齐前导的空列。
+
+        Args:
+            sheet_data: open_sheet 返回的 calamine 工作表对象
+            batch_size: 每批的行数
+            first_batch_size: 第一批的行数，用于尽快显示首屏数据，默认与 batch_size 相同
+
+        Yields:
+            行数据列表
+        """
+        start = sheet_data.start
+        if start is None:
+            return
+        start_col = start[1]
+        col_padding = [""] * start_col
+
+        batch = []
+        limit = first_batch_size or batch_size
+        for row in sheet_data.iter_rows():
+            batch.append(col_padding + row if start_col else row)
+            if len(batch) >= limit:
+                yield batch
+                batch = []
+                limit = batch_size
+        if batch:
+            yield batch
+
+    def load_cached_sheet(self, sheet: Union[SheetInfo, int, str]) -> Optional[Tuple[ColumnStore, List[Tuple[Tuple[int, int], Tuple[int, int]]]]]:
+        """从缓存读取工作表，先查内存缓存，再查磁盘缓存，文件未变化时无需重新解析
+
+        Returns:
+            (列式数据, 合并单元格信息)，未命中时返回 None
+        """
+        with self._lock:
+            self._ensure_workbook()
+            target_sheet = self._resolve_sheet(sheet)
+        cached = self.memory_cache.get(target_sheet.sheet_name)
+        if cached is not None or self.sheet_cache is None:
+            return cached
+        cached = self.sheet_cache.get(self.file_path, target_sheet.sheet_name)
+        if cached is not None:
+            self.memory_cache.put(target_sheet.sheet_name, *cached)
+        return cached
+
+    def is_sheet_cached(self, sheet: Union[SheetInfo, int, str]) -> bool:
+        """工作表是否已在内存缓存中"""
+        return self._resolve_sheet(sheet).sheet_name in self.memory_cache
+
+    def begin_sheet_load(self, sheet_index: int):
+        """登记前台正在加载的工作表，加载结束后需调用 end_sheet_load"""
+        with self._lock:
+            self._loading_sheets[sheet_index] += 1
+
+    def end_sheet_load(self, sheet_index: int):
+        """注销 begin_sheet_load 登记的工作表"""
+        with self._lock:
+            self._loading_sheets[sheet_index] -= 1
+            if self._loading_sheets[sheet_index] <= 0:
+                del self._loading_sheets[sheet_index]
+
+    def is_sheet_loading(self, sheet_index: int) -> bool:
+        """工作表是否正由前台任务加载"""
+        with self._lock:
+            return sheet_index in self._loading_sheets
+
+    def store_cached_sheet(self, sheet: Union[SheetInfo, int, str], store: ColumnStore,
+                           merged_cells: List[Tuple[Tuple[int, int], Tuple[int, int]]]):
+        """把解析后的工作表写入内存缓存和磁盘缓存"""
+        target_sheet = self._resolve_sheet(sheet)
+        self.memory_cache.put(target_sheet.sheet_name, store, merged_cells)
+        if self.sheet_cache is not None:
+            self.sheet_cache.put(self.file_path, target_sheet.sheet_name, store, merged_cells)
+
+    @ExceptionHandler(error_message="读取工作表数据失败", return_value=([], []))
+    def read_sheet_data(self, sheet: Union[SheetInfo, int, str]) -> Tuple[List[List[Any]], List[Tuple[Tuple[int, int], Tuple[int, int]]]]:
+        """读取指定工作表的数据和合并单元格信息
         
-        with PerformanceTimer("读取工作表数据"):
-            # 使用 python-calamine 读取数据
-            workbook = CalamineWorkbook.from_path(self.file_path)
-            sheet_data = workbook.get_sheet_by_name(target_sheet.sheet_name)
+        Returns:
+            Tuple[List[List[Any]], List[Tuple[Tuple[int, int], Tuple[int, int]]]]:
+            - 第一个元素是工作表数据
+            - 第二个元素是合并单元格信息，格式为 [((start_row, start_col), (end_row, end_col)), ...]
+        """
+        with PerformanceTimer("读取工作表数据") as timer:
+            target_sheet, sheet_data, merged_cells = self.open_sheet(sheet)
             
             # 获取数据
             data = sheet_data.to_python(skip_empty_area=False)
-            
-            # 获取并转换合并单元格信息
-            raw_merged_cells = sheet_data.ranges
-            merged_cells = []
-            
-            # 详细的调试信息
-            logging.info(f"工作表 {target_sheet.sheet_name} 的原始合并单元格信息: {raw_merged_cells}")
-            
-            if raw_merged_cells:
-                for cell_range in raw_merged_cells:
-                    # 获取起始和结束位置
-                    start_row, start_col = cell_range[0]
-                    end_row, end_col = cell_range[1]
-                        
-                    # 确保坐标是整数
-                    start_row, start_col = int(start_row), int(start_col)
-                    end_row, end_col = int(end_row), int(end_col)
-                        
-                    # 添加到合并单元格列表
-                    merged_cells.append(((start_row, start_col), (end_row, end_col)))
-                        
-
-            logging.info(f"成功读取工作表 {target_sheet.sheet_name} 的数据：{len(data)} 行")
-            logging.info(f"处理后的合并单元格信息: {merged_cells}")
+            timer.add("rows", len(data))
+            timer.add("cells", sum(len(row) for row in data))
+
+            logger.info("成功读取工作表 %s 的数据：%d 行", target_sheet.sheet_name, len(data))
             
             return data, merged_cells
         
             
-    def create_table_for_sheet(self, conn: sqlite3.Connection, file_path: str, sheet_name: str, columns: List[str]) -> str:
+    def create_table_for_sheet(self, conn: sqlite3.Connection, file_path: str, sheet_name: str, columns: List[str],
+                               column_types: Optional[List[str]] = None) -> str:
         """为工作表创建数据表
         
         Args:
@@ -178,6 +461,7 @@ class ExcelProcessor:
             file_path: Excel文件路径
             sheet_name: 工作表名称
             columns: 列名列表
+            column_types: 每列的 SQLite 类型，不指定时全部使用 TEXT
             
         Returns:
             表名
@@ -190,11 +474,12 @@ class ExcelProcessor:
             conn.execute(f"DROP TABLE IF EXISTS [{table_name}]")
             
             # 构建CREATE TABLE语句
+            column_types = column_types or [SQL_TEXT] * len(columns)
             columns_def = []
-            for col in columns:
+            for col, col_type in zip(columns, column_types):
                 # SQLite中列名使用方括号包裹，可以处理特殊字符
                 col_name = f"[{col}]"
-                columns_def.append(f"{col_name} TEXT")
+                columns_def.append(f"{col_name} {col_type}")
             
             create_table_sql = f"""
             CREATE TABLE [{table_name}] (
@@ -202,66 +487,632 @@ class ExcelProcessor:
             )
             """
             
-            logging.info(f"创建表SQL: {create_table_sql}")
+            logger.info("创建表SQL: %s", create_table_sql)
             conn.execute(create_table_sql)
             return table_name
             
         except Exception as e:
-            logging.error(f"创建表失败: {str(e)}\nSQL: {create_table_sql}")
+            logger.error(f"创建表失败: {str(e)}\nSQL: {create_table_sql}")
             raise
     
-    def save_sheet_data(self, file_path: str, sheet_name: str, headers: List[str], data: List[Dict]):
+    def _connect(self) -> sqlite3.Connection:
+        """创建数据库连接，使用 WAL 日志模式以便读写并发"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _apply_bulk_load_pragmas(self, conn: sqlite3.Connection):
+        """批量导入期间使用的 PRAGMA 设置
+
+        WAL 模式下 synchronous=NORMAL 只在检查点时同步磁盘，
+        配合更大的页缓存减少批量写入时的 I/O 次数。
+        """
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{BULK_LOAD_CACHE_SIZE_KB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+    def _iter_row_values(self, headers: List[str], data: Iterable[Union[Dict, Sequence[Any]]]) -> Iterator[Sequence[Any]]:
+        """将数据行统一整理为与列名顺序一致、长度相同的序列
+
+        Args:
+            headers: 列名列表
+            data: 数据行，可以是以列名为键的字典，也可以是按列顺序排列的序列
+        """
+        column_count = len(headers)
+        for row in data:
+            if isinstance(row, dict):
+                yield [row.get(header, "") for header in headers]
+            elif len(row) != column_count:
+                yield list(row[:column_count]) + [""] * (column_count - len(row))
+            else:
+                yield row
+
+    def save_sheet_data(self, file_path: str, sheet_name: str, headers: List[str], data: Iterable[Union[Dict, Sequence[Any]]],
+                        column_types: Optional[List[str]] = None,
+                        merged_cells: Optional[List[Tuple[Tuple[int, int], Tuple[int, int]]]] = None,
+                        incremental: bool = False, index_text: bool = False,
+                        data_origin: Tuple[int, int] = (0, 0)) -> Optional[SaveResult]:
         """保存工作表数据到数据库
+
+        数据以元组形式分块写入 executemany，整个导入在同一个事务中完成。
+        未指定列类型时根据样本行推断，数字以 INTEGER/REAL 原生保存，
+        日期时间以 ISO 8601 文本保存。
+
+        增量模式下会计算每行的哈希和整个工作表的内容指纹（保存在 _sheet_catalog 中）：
+        指纹未变化时直接跳过；表结构未变化时按位置比较行哈希，只更新、追加或删除
+        变化的行，rowid 保持从 1 开始连续；其它情况重建整张表。行哈希按块与数据库中
+        的旧哈希比较，不需要把全部行保存在内存中。
+
+        index_text 为 True 时把非空单元格写入 FTS5 全文搜索索引，增量保存时只重新索引
+        变化的行；为 False 时删除该表已有的索引记录，避免搜索到过期的内容。
         
         Args:
             file_path: Excel文件路径
             sheet_name: 工作表名称
             headers: 列名列表
-            data: 数据行列表
+            data: 数据行，可以是字典列表、行序列列表或按行产生数据的迭代器
+            column_types: 每列的 SQLite 类型，不指定时自动推断
+            merged_cells: 合并单元格信息，增量模式下参与内容指纹的计算
+            incremental: 是否增量保存
+            index_text: 是否写入全文搜索索引
+            data_origin: 第一个数据单元格在源工作表中的位置 (行, 列)，搜索结果据此定位单元格
+
+        Returns:
+            保存结果，数据无效时返回 None
         """
-        if not headers or not data:
-            logging.error("无效的数据：headers或data为空")
-            return
+        if not headers or data is None or (isinstance(data, list) and not data):
+            logger.error("无效的数据：headers或data为空")
+            return None
 
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
-            # 创建表
-            table_name = self.create_table_for_sheet(conn, file_path, sheet_name, headers)
-            
-            # 构建INSERT语句，使用方括号包裹列名
-            columns = [f"[{h}]" for h in headers]
-            placeholders = ','.join(['?' for _ in headers])
-            insert_sql = f"""INSERT INTO [{table_name}] 
-                ({','.join(columns)}) 
-                VALUES ({placeholders})"""
-            
-            # 插入数据
-            for row in data:
-                try:
-                    values = []
-                    for header in headers:
-                        value = row.get(header, "")
-                        # 处理特殊字符和换行符
-                        if isinstance(value, str):
-                            value = value.replace('\x00', '').strip()
-                        values.append(value)
-                    conn.execute(insert_sql, values)
-                except Exception as e:
-                    logging.error(f"插入数据失败: {str(e)}\nSQL: {insert_sql}\n数据: {values}")
-                    raise
-            
-            conn.commit()
-            logging.info(f"成功保存 {len(data)} 行数据到表 {table_name}")
+            self._apply_bulk_load_pragmas(conn)
+            with PerformanceTimer("保存工作表数据") as timer:
+                rows = self._iter_row_values(headers, data)
+                if column_types is None:
+                    if isinstance(data, Sequence):
+                        sample = list(self._iter_row_values(headers, sample_rows(data)))
+                    else:
+                        # 迭代器只能读取开头的行作为样本，读取后再拼接回去
+                        sample = list(islice(rows, TYPE_SAMPLE_SIZE))
+                        rows = chain(sample, rows)
+                    column_types = infer_column_types(sample, len(headers))
+                row_chunks = convert_row_chunks(rows, column_types, BULK_INSERT_CHUNK_SIZE)
+                table_name = self._get_table_name(file_path, sheet_name)
+
+                conn.execute("BEGIN")
+                self._ensure_catalog_table(conn)
+                if incremental:
+                    mode, row_count, changed_rows, changed_row_ids = self._save_incremental(
+                        conn, file_path, sheet_name, table_name, headers, column_types,
+                        row_chunks, merged_cells, data_origin
+                    )
+                else:
+                    # 创建表
+                    self.create_table_for_sheet(conn, file_path, sheet_name, headers, column_types)
+                    row_count = changed_rows = self._insert_rows(conn, table_name, headers, row_chunks)
+                    mode, changed_row_ids = SAVE_MODE_FULL, None
+                    self._update_catalog(conn, table_name, file_path, sheet_name, None, row_count, column_types,
+                                         data_origin)
+                self._update_search_index(conn, table_name, headers, mode, changed_row_ids, index_text)
+                
+                conn.commit()
+                timer.add("rows", row_count)
+                timer.add("changed_rows", changed_rows)
+
+            result = SaveResult(table_name=table_name, row_count=row_count, seconds=timer.duration,
+                                mode=mode, changed_rows=changed_rows)
+            if mode == SAVE_MODE_SKIPPED:
+                logger.info("工作表 %s 内容未变化，跳过表 %s", sheet_name, table_name)
+            else:
+                logger.info(
+                    f"成功保存 {row_count} 行数据到表 {table_name}（{mode}，写入 {changed_rows} 行），"
+                    f"耗时 {result.seconds:.3f} 秒，{result.rows_per_second:.0f} 行/秒"
+                )
+            return result
             
         except Exception as e:
-            logging.error(f"保存数据失败: {str(e)}")
+            logger.error(f"保存数据失败: {str(e)}")
             conn.rollback()
             raise
         finally:
             conn.close()
-    
+
+    def _insert_rows(self, conn: sqlite3.Connection, table_name: str, headers: List[str],
+                     row_chunks: Iterable[Sequence[Sequence[Any]]]) -> int:
+        """按块批量插入数据，每块执行一次 executemany，返回插入的行数"""
+        # 构建INSERT语句，使用方括号包裹列名
+        columns = [f"[{h}]" for h in headers]
+        placeholders = ','.join(['?' for _ in headers])
+        insert_sql = f"""INSERT INTO [{table_name}] 
+            ({','.join(columns)}) 
+            VALUES ({placeholders})"""
+
+        row_count = 0
+        for chunk in row_chunks:
+            try:
+                conn.executemany(insert_sql, chunk)
+            except Exception as e:
+                logger.error(f"插入数据失败: {str(e)}\nSQL: {insert_sql}\n起始行: {row_count}")
+                raise
+            row_count += len(chunk)
+        return row_count
+
+    def _hash_row_chunks(self, row_chunks: Iterable[Sequence[Sequence[Any]]],
+                         fingerprint: FingerprintBuilder) -> Iterator[List[Tuple[Any, ...]]]:
+        """为每行追加行哈希，同时把哈希累积到内容指纹中"""
+        for chunk in row_chunks:
+            hashed = [row + (row_hash(row),) for row in map(tuple, chunk)]
+            fingerprint.update(row[-1] for row in hashed)
+            yield hashed
+
+    def _save_incremental(self, conn: sqlite3.Connection, file_path: str, sheet_name: str, table_name: str,
+                          headers: List[str], column_types: List[str], row_chunks: Iterable[Sequence[Sequence[Any]]],
+                          merged_cells: Optional[List[Tuple[Tuple[int, int], Tuple[int, int]]]],
+                          data_origin: Tuple[int, int] = (0, 0)) -> Tuple[str, int, int, Optional[List[int]]]:
+        """增量保存已转换的行数据
+
+        行数据按块流式处理：每块计算行哈希后，只读取同一 rowid 范围内的旧哈希进行比较，
+        内存占用与块大小相关，与工作表行数无关。内容指纹在处理完所有行后才能确定，
+        指纹未变化时所有行哈希都相同，不会产生写入。
+
+        Returns:
+            (保存方式, 总行数, 写入的行数, 变化的 rowid 列表（重建整张表时为 None）)
+        """
+        fingerprint = FingerprintBuilder(headers, column_types)
+        hashed_chunks = self._hash_row_chunks(row_chunks, fingerprint)
+        all_headers = headers + [ROW_HASH_COLUMN]
+
+        expected_schema = [(h, t.upper()) for h, t in zip(all_headers, column_types + [SQL_INTEGER])]
+        existing_schema = [
+            (row[1], (row[2] or "").upper())
+            for row in conn.execute(f"PRAGMA table_info([{table_name}])")
+        ]
+        old_count, max_rowid = 0, 0
+        if existing_schema == expected_schema:
+            old_count, max_rowid = conn.execute(f"SELECT COUNT(*), MAX(rowid) FROM [{table_name}]").fetchone()
+        if existing_schema != expected_schema or (max_rowid or 0) != old_count:
+            if existing_schema != expected_schema:
+                # 表不存在或结构变化，重建整张表
+                self.create_table_for_sheet(conn, file_path, sheet_name, all_headers, column_types + [SQL_INTEGER])
+            else:
+                # rowid 不连续时无法按位置比较
+                conn.execute(f"DELETE FROM [{table_name}]")
+            row_count = self._insert_rows(conn, table_name, all_headers, hashed_chunks)
+            self._update_catalog(conn, table_name, file_path, sheet_name, fingerprint.hexdigest(merged_cells),
+                                 row_count, column_types, data_origin)
+            return SAVE_MODE_FULL, row_count, row_count, None
+
+        old_fingerprint = self._get_catalog_fingerprint(conn, table_name)
+        select_sql = f"SELECT [{ROW_HASH_COLUMN}] FROM [{table_name}] WHERE rowid BETWEEN ? AND ? ORDER BY rowid"
+        set_sql = ','.join(f"[{h}]=?" for h in all_headers)
+        update_sql = f"UPDATE [{table_name}] SET {set_sql} WHERE rowid=?"
+        updated_ids = []
+        row_count = inserted = 0
+        for chunk in hashed_chunks:
+            first_id = row_count + 1
+            # 按位置比较，哈希不同的行原地更新
+            common = max(0, min(len(chunk), old_count - row_count))
+            if common:
+                old_hashes = [value for (value,) in conn.execute(select_sql, (first_id, first_id + common - 1))]
+                updates = [
+                    chunk[idx] + (first_id + idx,)
+                    for idx in range(common) if chunk[idx][-1] != old_hashes[idx]
+                ]
+                if updates:
+                    conn.executemany(update_sql, updates)
+                    updated_ids.extend(row[-1] for row in updates)
+            # 新增的行追加到末尾，rowid 保持连续
+            if common < len(chunk):
+                inserted += self._insert_rows(conn, table_name, all_headers, [chunk[common:]])
+            row_count += len(chunk)
+
+        # 多出的旧行从末尾删除
+        deleted = conn.execute(f"DELETE FROM [{table_name}] WHERE rowid > ?", (row_count,)).rowcount
+        new_fingerprint = fingerprint.hexdigest(merged_cells)
+        # 内容未变化时也更新目录，记录本次导入的时间和数据起始位置
+        self._update_catalog(conn, table_name, file_path, sheet_name, new_fingerprint, row_count, column_types,
+                             data_origin)
+        if new_fingerprint == old_fingerprint:
+            return SAVE_MODE_SKIPPED, row_count, 0, []
+
+        updated = len(updated_ids)
+        logger.info("表 %s 增量更新：更新 %d 行，新增 %d 行，删除 %d 行", table_name, updated, inserted, deleted)
+        changed_ids = updated_ids + list(range(min(old_count, row_count) + 1, max(old_count, row_count) + 1))
+        return SAVE_MODE_DIFF, row_count, updated + inserted + deleted, changed_ids
+
+    def _update_search_index(self, conn: sqlite3.Connection, table_name: str, headers: List[str], mode: str,
+                             changed_row_ids: Optional[List[int]], index_text: bool):
+        """保存数据后同步全文搜索索引"""
+        if not index_text:
+            search_index.remove_table(conn, table_name)
+            return
+        if mode == SAVE_MODE_SKIPPED:
+            # 内容未变化，但之前可能没有建立索引
+            search_index.ensure_search_index(conn)
+            indexed = conn.execute(
+                f"SELECT 1 FROM [{search_index.SEARCH_CONTENT_TABLE}] WHERE table_name=? LIMIT 1", (table_name,)
+            ).fetchone()
+            if indexed:
+                return
+            changed_row_ids = None
+        search_index.index_table(conn, table_name, headers, changed_row_ids)
+
+    def _ensure_catalog_table(self, conn: sqlite3.Connection):
+        """创建导入目录表及索引，旧版本创建的目录表补齐缺少的列"""
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS [{SHEET_CATALOG_TABLE}] (
+                table_name TEXT PRIMARY KEY,
+                file_path TEXT NOT NULL,
+                sheet_name TEXT NOT NULL,
+                fingerprint TEXT,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                column_count INTEGER NOT NULL DEFAULT 0,
+                column_types TEXT NOT NULL DEFAULT '[]',
+                data_row INTEGER NOT NULL DEFAULT 0,
+                data_col INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info([{SHEET_CATALOG_TABLE}])")}
+        for column_def in ("row_count INTEGER NOT NULL DEFAULT 0",
+                           "column_count INTEGER NOT NULL DEFAULT 0",
+                           "column_types TEXT NOT NULL DEFAULT '[]'",
+                           "data_row INTEGER NOT NULL DEFAULT 0",
+                           "data_col INTEGER NOT NULL DEFAULT 0"):
+            if column_def.split()[0] not in existing:
+                conn.execute(f"ALTER TABLE [{SHEET_CATALOG_TABLE}] ADD COLUMN {column_def}")
+        conn.execute(f"""CREATE INDEX IF NOT EXISTS [idx{SHEET_CATALOG_TABLE}_file_sheet]
+                         ON [{SHEET_CATALOG_TABLE}] (file_path, sheet_name)""")
+        conn.execute(f"""CREATE INDEX IF NOT EXISTS [idx{SHEET_CATALOG_TABLE}_sheet]
+                         ON [{SHEET_CATALOG_TABLE}] (sheet_name)""")
+
+    def _get_catalog_fingerprint(self, conn: sqlite3.Connection, table_name: str) -> Optional[str]:
+        row = conn.execute(
+            f"SELECT fingerprint FROM [{SHEET_CATALOG_TABLE}] WHERE table_name=?", (table_name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _update_catalog(self, conn: sqlite3.Connection, table_name: str, file_path: str, sheet_name: str,
+                        fingerprint: Optional[str], row_count: int, column_types: List[str],
+                        data_origin: Tuple[int, int] = (0, 0)):
+        """记录数据表的来源、规模、列类型和内容指纹
+
+        非增量保存的表指纹为空，下次增量导入时会重建。updated_at 为最后一次导入的时间。
+        """
+        conn.execute(
+            f"""INSERT OR REPLACE INTO [{SHEET_CATALOG_TABLE}]
+                (table_name, file_path, sheet_name, fingerprint, updated_at, row_count, column_count, column_types,
+                 data_row, data_col)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?)""",
+            (table_name, os.path.abspath(file_path), sheet_name, fingerprint,
+             row_count, len(column_types), json.dumps(column_types), data_origin[0], data_origin[1])
+        )
+
+    def _query_catalog(self, where: str = "", params: Sequence[Any] = ()) -> List[CatalogEntry]:
+        conn = self._connect()
+        try:
+            self._ensure_catalog_table(conn)
+            cursor = conn.execute(
+                f"""SELECT table_name, file_path, sheet_name, row_count, column_count, column_types,
+                           updated_at, fingerprint, data_row, data_col
+                    FROM [{SHEET_CATALOG_TABLE}] {where}""",
+                params
+            )
+            return [
+                CatalogEntry(table_name=row[0], file_path=row[1], sheet_name=row[2], row_count=row[3],
+                             column_count=row[4], column_types=json.loads(row[5]),
+                             imported_at=row[6], fingerprint=row[7], data_row=row[8], data_col=row[9])
+                for row in cursor
+            ]
+        finally:
+            conn.close()
+
+    def list_imported_sheets(self, file_path: Optional[str] = None) -> List[CatalogEntry]:
+        """列出已导入的工作表，可按源文件过滤，通过目录表的索引查询
+
+        Args:
+            file_path: 源 Excel 文件路径，不指定时返回全部
+
+        Returns:
+            目录表中的记录，按源文件和工作表名称排序
+        """
+        if file_path is None:
+            return self._query_catalog("ORDER BY file_path, sheet_name")
+        return self._query_catalog("WHERE file_path=? ORDER BY sheet_name", (os.path.abspath(file_path),))
+
+    def find_imported_sheet(self, file_path: str, sheet_name: str) -> Optional[CatalogEntry]:
+        """查找某个源文件中的工作表导入到了哪张表，未导入时返回 None"""
+        entries = self._query_catalog("WHERE file_path=? AND sheet_name=?",
+                                      (os.path.abspath(file_path), sheet_name))
+        return entries[0] if entries else None
+
+    def search_cells(self, query: str, limit: int = 200,
+                     is_cancelled: Optional[Callable[[], bool]] = None) -> List[CellMatch]:
+        """在所有已建立搜索索引的工作表中查找包含指定文本的单元格
+
+        Args:
+            query: 需要查找的文本，按子串匹配
+            limit: 最多返回的结果数
+            is_cancelled: 返回 True 时中断正在执行的查询，中断后抛出 sqlite3.OperationalError
+
+        Returns:
+            命中的单元格，位置已换算为源工作表中的行列
+        """
+        conn = self._connect()
+        if is_cancelled is not None:
+            conn.set_progress_handler(lambda: 1 if is_cancelled() else 0, SEARCH_PROGRESS_INTERVAL)
+        try:
+            hits = search_index.search(conn, query, limit)
+            if not hits:
+                return []
+            self._ensure_catalog_table(conn)
+            catalog = {}
+            matches = []
+            for hit in hits:
+                if hit.table_name not in catalog:
+                    entries = self._query_catalog("WHERE table_name=?", (hit.table_name,))
+                    columns = self._get_table_columns(conn, hit.table_name) if entries else []
+                    catalog[hit.table_name] = (entries[0] if entries else None, columns)
+                entry, columns = catalog[hit.table_name]
+                if entry is None:
+                    continue
+                matches.append(CellMatch(
+                    file_path=entry.file_path,
+                    sheet_name=entry.sheet_name,
+                    table_name=hit.table_name,
+                    column_name=columns[hit.column_index] if hit.column_index < len(columns) else "",
+                    row=entry.data_row + hit.row_id - 1,
+                    column=entry.data_col + hit.column_index,
+                    value=hit.value,
+                ))
+            return matches
+        finally:
+            conn.close()
+
+    def import_workbook(self, file_path: str, max_workers: Optional[int] = None,
+                        incremental: bool = True, index_text: bool = False) -> WorkbookImportResult:
+        """把工作簿的所有工作表导入数据库
+
+        解压和解析 XML 是 CPU 密集型工作，由多个工作进程并行完成；工作进程把
+        列式数据批次交回当前进程，由当前进程依次调用 save_sheet_data 写入，
+        SQLite 始终只有一个写入者。每个工作表的第一行作为列名。
+
+        Args:
+            file_path: Excel文件路径
+            max_workers: 工作进程数，默认为 CPU 核数（不超过工作表数量）
+            incremental: 是否增量导入，见 save_sheet_data
+            index_text: 是否同时写入全文搜索索引
+
+        Returns:
+            导入结果，包含每个工作表的解码、写入耗时和总吞吐量
+        """
+        with CalamineWorkbook.from_path(file_path) as workbook:
+            sheet_names = workbook.sheet_names
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(sheet_names)))
+        results = []
+        start = perf_counter()
+
+        with create_decode_pool(workers) as executor:
+            # 限制同时提交的任务数，已解码但未写入的数据不会无限堆积
+            pending_names = iter(sheet_names)
+            futures = {}
+
+            def submit_next():
+                sheet_name = next(pending_names, None)
+                if sheet_name is not None:
+                    future = executor.submit(decode_sheet_for_import, file_path, sheet_name)
+                    futures[future] = sheet_name
+
+            for _ in range(workers * 2):
+                submit_next()
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sheet_name = futures.pop(future)
+                    submit_next()
+                    results.append(self.write_imported_sheet(file_path, sheet_name, future,
+                                                             incremental=incremental, index_text=index_text))
+
+        result = WorkbookImportResult(file_path=file_path, sheets=results,
+                                      seconds=perf_counter() - start, workers=workers)
+        for sheet in results:
+            logger.info(
+                f"工作表 {sheet.sheet_name}: {sheet.row_count} 行，解码 {sheet.decode_seconds:.3f} 秒，"
+                f"写入 {sheet.write_seconds:.3f} 秒（{sheet.mode}）" + (f"，失败: {sheet.error}" if sheet.error else "")
+            )
+        logger.info(
+            f"导入工作簿 {file_path} 完成：{len(results)} 个工作表，{result.row_count} 行，"
+            f"{workers} 个工作进程，耗时 {result.seconds:.3f} 秒，{result.rows_per_second:.0f} 行/秒"
+        )
+        return result
+
+    def write_imported_sheet(self, file_path: str, sheet_name: str, future,
+                             resume_event: Optional[threading.Event] = None,
+                             incremental: bool = True, index_text: bool = False) -> SheetImportResult:
+        """把工作进程解码的工作表写入数据库，单个工作表失败不影响其它工作表
+
+        Args:
+            file_path: Excel文件路径
+            sheet_name: 工作表名称
+            future: decode_sheet_for_import 任务
+            resume_event: 暂停控制，事件未设置时每写完一块数据就等待，不指定时不暂停
+            incremental: 是否增量导入，内容未变化的工作表跳过，变化的工作表只更新变化的行
+            index_text: 是否同时写入全文搜索索引
+        """
+        try:
+            _, header, frames, merged_cells, data_origin, decode_seconds = future.result()
+        except Exception as e:
+            logger.error(f"解码工作表 {sheet_name} 失败: {str(e)}")
+            return SheetImportResult(sheet_name, None, 0, 0.0, 0.0, str(e))
+
+        if not header:
+            logger.info("工作表 %s 为空，跳过导入", sheet_name)
+            return SheetImportResult(sheet_name, None, 0, decode_seconds, 0.0)
+
+        headers = self._handle_duplicate_headers(header)
+        rows = chain.from_iterable(frame.iter_rows() for frame in frames)
+        if resume_event is not None:
+            rows = _pausable(rows, resume_event)
+        try:
+            saved = self.save_sheet_data(file_path, sheet_name, headers, rows,
+                                         merged_cells=merged_cells, incremental=incremental,
+                                         index_text=index_text, data_origin=data_origin)
+        except Exception as e:
+            return SheetImportResult(sheet_name, None, 0, decode_seconds, 0.0, str(e))
+        return SheetImportResult(sheet_name, saved.table_name, saved.row_count, decode_seconds, saved.seconds,
+                                 mode=saved.mode)
+
+    def _ensure_checkpoint_table(self, conn: sqlite3.Connection):
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS [{IMPORT_CHECKPOINT_TABLE}] (
+                file_path TEXT NOT NULL,
+                sheet_name TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                file_mtime_ns INTEGER NOT NULL,
+                table_name TEXT,
+                row_count INTEGER,
+                imported_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (file_path, sheet_name)
+            )
+        """)
+
+    def load_import_checkpoints(self) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        """读取已导入工作表的检查点
+
+        Returns:
+            {(文件绝对路径, 工作表名称): (文件大小, 修改时间)}
+        """
+        conn = self._connect()
+        try:
+            self._ensure_checkpoint_table(conn)
+            cursor = conn.execute(
+                f"SELECT file_path, sheet_name, file_size, file_mtime_ns FROM [{IMPORT_CHECKPOINT_TABLE}]"
+            )
+            return {(row[0], row[1]): (row[2], row[3]) for row in cursor}
+        finally:
+            conn.close()
+
+    def save_import_checkpoint(self, file_path: str, sheet_name: str, file_size: int, file_mtime_ns: int,
+                               table_name: Optional[str], row_count: int):
+        """记录工作表已导入，文件大小和修改时间不变时再次导入可以跳过"""
+        conn = self._connect()
+        try:
+            self._ensure_checkpoint_table(conn)
+            conn.execute(
+                f"""INSERT OR REPLACE INTO [{IMPORT_CHECKPOINT_TABLE}]
+                    (file_path, sheet_name, file_size, file_mtime_ns, table_name, row_count)
+                    VALUES (?, ?, ?, ?, ?, ?)""",
+                (os.path.abspath(file_path), sheet_name, file_size, file_mtime_ns, table_name, row_count)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get_table_columns(self, conn: sqlite3.Connection, table_name: str) -> List[str]:
+        """检查表是否存在并返回列名列表"""
+        cursor = conn.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name=?
+        """, (table_name,))
+        if not cursor.fetchone():
+            raise Exception(f"表 {table_name} 不存在")
+        
+        # 获取列名
+        cursor = conn.execute(f"PRAGMA table_info([{table_name}])")
+        headers = []
+        for row in cursor:
+            col_name = row[1].strip('[]')  # 移除列名中的方括号
+            # 增量导入使用的行哈希列不对外显示
+            if col_name != ROW_HASH_COLUMN:
+                headers.append(col_name)
+        
+        if not headers:
+            raise Exception(f"表 {table_name} 没有列")
+        return headers
+
+    def get_sheet_columns(self, file_path: str, sheet_name: str) -> List[str]:
+        """获取已导入工作表的列名列表"""
+        conn = self._connect()
+        try:
+            return self._get_table_columns(conn, self._get_table_name(file_path, sheet_name))
+        finally:
+            conn.close()
+
+    def iter_sheet_data_from_db(self, file_path: str, sheet_name: str, columns: Optional[List[str]] = None,
+                                where: Optional[str] = None, params: Sequence[Any] = (),
+                                limit: Optional[int] = None, offset: Optional[int] = None,
+                                batch_size: int = DB_FETCH_BATCH_SIZE,
+                                as_frame: bool = False) -> Iterator[Union[List[tuple], pl.DataFrame]]:
+        """按批次流式读取已导入的工作表数据
+
+        数据库连接在迭代结束或迭代器被关闭时释放，读取时内存中最多只保留一个批次。
+
+        Args:
+            file_path: Excel文件路径
+            sheet_name: 工作表名称
+            columns: 需要读取的列，默认读取全部列
+            where: WHERE 条件（不含 WHERE 关键字），参数使用 ? 占位
+            params: WHERE 条件的参数
+            limit: 最多读取的行数
+            offset: 跳过的行数
+            batch_size: 每批的行数
+            as_frame: 为 True 时每批以 Polars DataFrame 返回，否则返回元组列表
+
+        Yields:
+            每批数据
+        """
+        conn = self._connect()
+        try:
+            table_name = self._get_table_name(file_path, sheet_name)
+            headers = self._get_table_columns(conn, table_name)
+
+            # 列投影
+            if columns:
+                missing = [col for col in columns if col not in headers]
+                if missing:
+                    raise ValueError(f"表 {table_name} 中不存在列: {missing}")
+                headers = list(columns)
+
+            # 构建查询语句，使用方括号包裹列名，按导入顺序返回
+            select_sql = f"SELECT {','.join(f'[{h}]' for h in headers)} FROM [{table_name}]"
+            query_params = list(params)
+            if where:
+                select_sql += f" WHERE {where}"
+            select_sql += " ORDER BY rowid"
+            if limit is not None or offset is not None:
+                select_sql += " LIMIT ? OFFSET ?"
+                query_params += [-1 if limit is None else limit, offset or 0]
+
+            try:
+                cursor = conn.execute(select_sql, query_params)
+            except Exception as e:
+                logger.error(f"查询数据失败: {str(e)}\nSQL: {select_sql}")
+                raise
+
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                if as_frame:
+                    yield pl.DataFrame(batch, schema=headers, orient="row")
+                else:
+                    yield batch
+        finally:
+            conn.close()
+
+    def open_db_row_source(self, file_path: str, sheet_name: str, columns: Optional[List[str]] = None) -> DbRowSource:
+        """以分页数据源的方式打开已导入的工作表，可直接交给 TableModel.setSource"""
+        table_name = self._get_table_name(file_path, sheet_name)
+        if columns is None:
+            columns = self.get_sheet_columns(file_path, sheet_name)
+        return DbRowSource(self.db_path, table_name, columns)
+
     def get_sheet_data_from_db(self, file_path: str, sheet_name: str) -> Tuple[List[str], List[Dict]]:
         """从数据库获取工作表数据
+
+        会把整张表读入内存，大表请使用 iter_sheet_data_from_db。
         
         Args:
             file_path: Excel文件路径
@@ -270,63 +1121,27 @@ class ExcelProcessor:
         Returns:
             (列名列表, 数据行列表)
         """
-        conn = sqlite3.connect(self.db_path)
         try:
-            table_name = self._get_table_name(file_path, sheet_name)
-            
-            # 检查表是否存在
-            cursor = conn.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name=?
-            """, (table_name,))
-            if not cursor.fetchone():
-                raise Exception(f"表 {table_name} 不存在")
-            
-            # 获取列名
-            cursor = conn.execute(f"PRAGMA table_info([{table_name}])")
-            headers = []
-            for row in cursor:
-                col_name = row[1].strip('[]')  # 移除列名中的方括号
-                headers.append(col_name)
-            
-            if not headers:
-                raise Exception(f"表 {table_name} 没有列")
-            
-            # 构建查询语句，使用方括号包裹列名
-            columns = [f"[{h}]" for h in headers]
-            select_sql = f"""
-                SELECT {','.join(columns)}
-                FROM [{table_name}]
-            """
-            
-            # 获取数据
-            try:
-                cursor = conn.execute(select_sql)
-                data = []
-                for row in cursor:
+            headers = self.get_sheet_columns(file_path, sheet_name)
+            data = []
+            for batch in self.iter_sheet_data_from_db(file_path, sheet_name, headers):
+                for row in batch:
                     row_data = {}
                     for header, value in zip(headers, row):
                         row_data[header] = value if value is not None else ""
                     data.append(row_data)
-                
-                logging.info(f"成功从表 {table_name} 读取 {len(data)} 行数据")
-                return headers, data
-            except Exception as e:
-                logging.error(f"查询数据失败: {str(e)}\nSQL: {select_sql}")
-                raise
+
+            logger.info("成功从表 %s 读取 %d 行数据", self._get_table_name(file_path, sheet_name), len(data))
+            return headers, data
                 
         except Exception as e:
-            logging.error(f"获取数据失败: {str(e)}")
+            logger.error(f"获取数据失败: {str(e)}")
             raise
-        finally:
-            conn.close()
 
-    def get_sheet_names(self) -> List[str]:
-        """获取所有工作表名称"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'sheet_%'")
-            tables = cursor.fetchall()
-            return [table[0].replace('sheet_', '').replace('_', ' ') for table in tables]
-        finally:
-            conn.close()
\ No newline at end of file
+    def get_sheet_names(self, file_path: Optional[str] = None) -> List[str]:
+        """获取已导入的工作表名称
+
+        Args:
+            file_path: 源 Excel 文件路径，不指定时返回所有文件的工作表
+        """
+        return [entry.sheet_name for entry in self.list_imported_sheets(file_path)]
\ No newline at end of file
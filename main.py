@@ -2,20 +2,17 @@ import sys
 import logging
 from PyQt6.QtWidgets import QApplication
 from main_window import MainWindow
+from models.logging_setup import configure_logging
 
 def main():
-    # 配置日志
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    # 配置日志：记录日志时只入队，由后台线程写入文件、控制台和日志面板
+    configure_logging()
     logger = logging.getLogger(__name__)
     logger.debug("Starting application...")
     
     app = QApplication(sys.argv)
+    # 缓存目录等系统路径按应用名称区分
+    app.setApplicationName("TimeFileTool")
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
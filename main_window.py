@@ -3,8 +3,8 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget,QTreeWidget, QVBoxLayout, QPus
                              QMessageBox, QHBoxLayout, QLabel, QProgressBar, 
                              QSplitter,QMenu, QFrame, QStatusBar, QSpacerItem, QSizePolicy,
                              QListWidget, QStackedWidget, QTextEdit, QTreeWidgetItem, QApplication,
-                             QTableView)
-from PyQt6.QtCore import Qt, QSize
+                             QTableView, QDockWidget)
+from PyQt6.QtCore import Qt, QSize, QThreadPool
 from PyQt6.QtGui import QIcon, QFont
 from excel_processor import ExcelProcessor
 from models.table_model import TableModel
@@ -17,6 +17,11 @@ from models.file_history import FileHistory
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from widgets.document_area import DocumentArea
+from widgets.search_panel import SearchPanel
+from widgets.performance_panel import PerformancePanel
+from models.folder_import import FolderImportSignals, FolderImportTask
+
+logger = logging.getLogger(__name__)
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -40,6 +45,19 @@ class MainWindow(QMainWindow):
         Session = sessionmaker(bind=self.engine)
         self.db_session = Session()
 
+        # 列名显示方式：Excel风格列名或首行的值
+        self.use_excel_style = True
+
+        # 文件夹导入任务
+        self.import_task = None
+        self.import_workers = None  # 导入时的解码进程数，None 表示使用 CPU 核数
+        self.import_index_text = True  # 导入时是否建立全文搜索索引
+        self.import_signals = FolderImportSignals()
+        self.import_signals.progress.connect(self.update_progress)
+        self.import_signals.sheet_imported.connect(self.on_sheet_imported)
+        self.import_signals.sheet_failed.connect(self.on_sheet_import_failed)
+        self.import_signals.finished.connect(self.on_import_finished)
+        self.import_signals.failed.connect(self.handle_error)
         
         # 设置中心部件
         self.setup_ui()
@@ -154,6 +172,11 @@ class MainWindow(QMainWindow):
         self.left_panel_tab.addTab(self.file_tree, "文件") 
         self.left_panel_tab.addTab(self.script_tree, "脚本")
 
+        # 在已导入的数据中全文搜索
+        self.search_panel = SearchPanel()
+        self.search_panel.cell_activated.connect(self.go_to_search_result)
+        self.left_panel_tab.addTab(self.search_panel, "搜索")
+
         left_panel_layout.addWidget(self.left_panel_tab)
         self.main_splitter.addWidget(left_panel)
 
@@ -220,11 +243,31 @@ class MainWindow(QMainWindow):
             }
         """)
 
+        # 底部状态栏，显示导入进度
+        self.status_bar = QStatusBar()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.setVisible(False)
+        self.status_bar.addPermanentWidget(self.progress_bar)
+        self.main_layout.addWidget(self.status_bar)
+
+        # 可停靠的性能面板，默认隐藏
+        self.performance_panel = PerformancePanel()
+        self.performance_dock = QDockWidget("性能", self)
+        self.performance_dock.setWidget(self.performance_panel)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.performance_dock)
+        self.performance_dock.hide()
+
 
     def closeEvent(self,event):
         """关闭事件"""
         if hasattr(self, 'log_panel'):
             self.log_panel.cleanup()
+        self.cancel_import()
+        if hasattr(self, 'document_area'):
+            # 保存命中缓存时只在内存中更新的访问时间
+            self.document_area.sheet_cache.flush()
         event.accept()
 
     def hide_bottom_panel(self):
@@ -313,6 +356,9 @@ class MainWindow(QMainWindow):
             "视图":[
                 ("显示日志面板","Ctrl+J"),
                 ("显示属性面板","Ctrl+P"),
+                ("显示性能面板","Ctrl+Shift+P"),
+                ("SQL查询","Ctrl+Shift+Q"),
+                ("切换列名显示","Ctrl+Shift+H"),
                 None,
                 ("放大","Ctrl++"),
                 ("缩小","Ctrl+-"),
@@ -353,6 +399,23 @@ class MainWindow(QMainWindow):
         # 添加弹簧
         title_layout.addStretch()
         
+        # 添加运行按钮，用于开始、暂停和继续文件夹导入
+        self.run_button = RunButton()
+        self.run_button.setFixedSize(30, 30)
+        # 初始为未运行状态
+        self.run_button.set_state(False)
+        self.run_button.setToolTip("导入文件夹")
+        self.run_button.state_changed.connect(self.on_run_button_state_changed)
+        title_layout.addWidget(self.run_button)
+
+        # 添加停止按钮，用于取消文件夹导入
+        self.stop_button = QPushButton("■")
+        self.stop_button.setFixedSize(30, 30)
+        self.stop_button.setToolTip("停止导入")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.cancel_import)
+        title_layout.addWidget(self.stop_button)
+
         # 添加设置按钮
         settings_btn = QPushButton("⚙")
         settings_btn.setFixedSize(45, 30)
@@ -393,6 +456,13 @@ class MainWindow(QMainWindow):
             pass
         elif action_name == "显示日志面板":
             self.show_bottom_panel()
+        elif action_name == "显示性能面板":
+            self.performance_dock.show()
+            self.performance_dock.raise_()
+        elif action_name == "SQL查询":
+            self.document_area.open_query_console()
+        elif action_name == "切换列名显示":
+            self.toggle_header_style()
         elif action_name == "显示属性面板":
             # self.show_property_panel()
             pass
@@ -444,22 +514,71 @@ class MainWindow(QMainWindow):
 
 
     def toggle_header_style(self):
-        """切换列名显示方式"""
+        """切换列名显示方式：Excel风格列名或首行的值"""
         self.use_excel_style = not self.use_excel_style
-        self.header_style_button.setText("使用Excel列名" if not self.use_excel_style else "使用文档列名")
-        
-        # 如果当前有数据，更新表头显示
-        if self.sheet_selector.currentText():
-            self.load_sheet_data(self.sheet_selector.currentText())
+        self.document_area.set_first_row_header(not self.use_excel_style)
+        logger.info("使用Excel列名" if self.use_excel_style else "使用首行作为列名")
 
     def on_run_button_state_changed(self, is_running: bool):
-        """处理运行按钮状态改变"""
+        """处理运行按钮状态改变：没有导入任务时选择目录并开始导入，否则暂停或继续"""
+        if self.import_task is not None:
+            if is_running:
+                self.import_task.resume()
+                self.status_bar.showMessage("正在导入...")
+            else:
+                self.import_task.pause()
+                self.status_bar.showMessage("导入已暂停")
+            return
+
         if is_running:
-            print("开始运行")
-            # 在这里添加运行时的逻辑
-        else:
-            print("暂停运行")
-            # 在这里添加暂停时的逻辑
+            self.start_import()
+
+    def start_import(self):
+        """选择目录并在后台导入其中所有的 Excel 文件"""
+        folder = QFileDialog.getExistingDirectory(self, "选择要导入的目录")
+        if not folder:
+            # 未选择目录，恢复为未运行状态
+            self.run_button.blockSignals(True)
+            self.run_button.set_state(False)
+            self.run_button.blockSignals(False)
+            return
+
+        self.import_task = FolderImportTask(folder, self.import_signals, max_workers=self.import_workers,
+                                            index_text=self.import_index_text)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.stop_button.setEnabled(True)
+        self.status_bar.showMessage(f"正在导入 {folder}")
+        QThreadPool.globalInstance().start(self.import_task)
+
+    def cancel_import(self):
+        """取消文件夹导入"""
+        if self.import_task is not None:
+            self.import_task.cancel()
+            self.stop_button.setEnabled(False)
+            self.status_bar.showMessage("正在取消导入...")
+
+    def on_sheet_imported(self, file_path: str, sheet_name: str, row_count: int):
+        """单个工作表导入完成"""
+        self.status_bar.showMessage(f"已导入 {os.path.basename(file_path)} - {sheet_name}：{row_count} 行")
+
+    def on_sheet_import_failed(self, file_path: str, sheet_name: str, error_msg: str):
+        """单个工作表导入失败，记录日志后继续导入其它工作表"""
+        logger.error(f"导入 {file_path} - {sheet_name} 失败: {error_msg}")
+
+    def on_import_finished(self, imported: int, failed: int, cancelled: bool):
+        """文件夹导入结束"""
+        self._reset_import_state()
+        state = "已取消" if cancelled else "完成"
+        self.status_bar.showMessage(f"导入{state}：成功 {imported} 个工作表，失败 {failed} 个")
+
+    def _reset_import_state(self):
+        self.import_task = None
+        self.stop_button.setEnabled(False)
+        self.progress_bar.setVisible(False)
+        self.run_button.blockSignals(True)
+        self.run_button.set_state(False)
+        self.run_button.blockSignals(False)
 
     def on_log_panel_closed(self):
         """处理日志面板关闭事件"""
@@ -487,6 +606,8 @@ class MainWindow(QMainWindow):
 
     def handle_error(self, error_msg: str):
         """处理错误"""
+        if self.import_task is not None:
+            self._reset_import_state()
         self.progress_bar.setVisible(False)
         QMessageBox.critical(self, "错误", error_msg)
 
@@ -502,7 +623,7 @@ class MainWindow(QMainWindow):
             if hasattr(self,'table'):
                 self.table.resizeColumnsToContents()
         else:
-            logging.error("表格数据更新失败，没有当前工作表")
+            logger.error("表格数据更新失败，没有当前工作表")
 
     def save_file_history(self, file_path: str):
         """保存文件历史到数据库"""
@@ -520,7 +641,7 @@ class MainWindow(QMainWindow):
                 existing_record.file_type = file_type
                 existing_record.file_size = file_info.st_size
                 existing_record.modified_date = datetime.fromtimestamp(file_info.st_mtime)
-                logging.info(f"更新文件历史记录: {file_path}")
+                logger.info(f"更新文件历史记录: {file_path}")
             else:
                 # 创建新的文件历史记录
                 file_history = FileHistory(
@@ -531,7 +652,7 @@ class MainWindow(QMainWindow):
                     modified_date=datetime.fromtimestamp(file_info.st_mtime)
                 )
                 self.db_session.add(file_history)
-                logging.info(f"添加新的文件历史记录: {file_path}")
+                logger.info(f"添加新的文件历史记录: {file_path}")
             
             # 保存到数据库
             self.db_session.commit()
@@ -540,7 +661,7 @@ class MainWindow(QMainWindow):
             self.update_file_tree()
             
         except Exception as e:
-            logging.error(f"保存文件历史时出错: {str(e)}")
+            logger.error(f"保存文件历史时出错: {str(e)}")
             self.db_session.rollback()
     
     def open_file_from_tree(self, item):
@@ -574,7 +695,7 @@ class MainWindow(QMainWindow):
             
         except Exception as e:
             error_msg = f"打开文件时出错: {str(e)}"
-            logging.error(error_msg)
+            logger.error(error_msg)
             QMessageBox.critical(self, "错误", error_msg)
 
     def update_file_tree(self):
@@ -597,7 +718,7 @@ class MainWindow(QMainWindow):
                 item.setToolTip(0, history.file_path)  # 设置悬浮提示显示完整路径
                 
         except Exception as e:
-            logging.error(f"更新文件树时出错: {str(e)}")
+            logger.error(f"更新文件树时出错: {str(e)}")
 
     def open_file(self):
         """打开文件对话框"""
@@ -624,7 +745,7 @@ class MainWindow(QMainWindow):
     
         except Exception as e:
             error_msg = f"打开文件对话框时出错: {str(e)}"
-            logging.error(error_msg)
+            logger.error(error_msg)
             QMessageBox.critical(self, "错误", error_msg)
 
 
@@ -642,7 +763,7 @@ class MainWindow(QMainWindow):
                 try:
                     with open(file_path, 'r', encoding=encoding) as f:
                         content = f.read()
-                    logging.info(f"成功使用 {encoding} 编码打开文件")
+                    logger.info(f"成功使用 {encoding} 编码打开文件")
                     break
                 except UnicodeDecodeError:
                     continue
@@ -656,11 +777,11 @@ class MainWindow(QMainWindow):
             if update_history:
                 self.update_file_history(file_path)
                 
-            logging.info(f"成功打开文本文件: {file_path}")
+            logger.info(f"成功打开文本文件: {file_path}")
             
         except Exception as e:
             error_msg = f"打开文本文件时出错: {str(e)}"
-            logging.error(error_msg)
+            logger.error(error_msg)
             QMessageBox.critical(self, "错误", error_msg)
             
             # 如果已经创建了标签页，需要关闭它
@@ -682,9 +803,19 @@ class MainWindow(QMainWindow):
                 
         except Exception as e:
             QMessageBox.critical(self, "错误", f"打开Excel文件失败：{str(e)}")
-            logging.error(f"打开Excel文件失败：{str(e)}")
+            logger.error(f"打开Excel文件失败：{str(e)}")
 
 
+    def go_to_search_result(self, file_path: str, sheet_name: str, row: int, col: int):
+        """打开搜索结果所在的文件并定位到单元格"""
+        if not os.path.exists(file_path):
+            QMessageBox.warning(self, "提示", f"文件不存在：{file_path}")
+            return
+        self.open_excel_file(file_path)
+        doc_tab = self.document_area.documents.get(file_path)
+        if doc_tab is not None:
+            doc_tab.go_to_cell(sheet_name, row, col)
+
     def show_file_path_tooltip(self, item: QTreeWidgetItem, column: int):
         """显示文件路径工具提示"""
         file_path = item.data(0, Qt.ItemDataRole.UserRole)  # 获取路径列的文本
@@ -709,7 +840,7 @@ class MainWindow(QMainWindow):
             file_path = item.data(0, Qt.ItemDataRole.UserRole)  # 获取路径列的文本
             clipboard = QApplication.clipboard()
             clipboard.setText(file_path)
-            logging.info(f"已复制文件路径: {file_path}")
+            logger.info(f"已复制文件路径: {file_path}")
 
     def load_file_history(self):
         """初始化时加载文件历史记录"""
@@ -741,10 +872,10 @@ class MainWindow(QMainWindow):
                 item.setData(0, Qt.ItemDataRole.UserRole, history.file_path)  # 将路径存储在数据中
                 item.setToolTip(0, history.file_path)  # 设置悬浮提示显示完整路径
                 
-            logging.info("文件历史记录加载完成")
+            logger.info("文件历史记录加载完成")
                 
         except Exception as e:
-            logging.error(f"加载文件历史记录时出错: {str(e)}")
+            logger.error(f"加载文件历史记录时出错: {str(e)}")
 
     def update_file_history(self, file_path: str):
         """更新文件历史记录"""
@@ -770,9 +901,9 @@ class MainWindow(QMainWindow):
             # 更新文件树显示
             self.update_file_tree()
             
-            logging.info(f"添加新的文件历史记录: {file_path}")
+            logger.info(f"添加新的文件历史记录: {file_path}")
             
         except Exception as e:
-            logging.error(f"更新文件历史记录失败: {str(e)}")
+            logger.error(f"更新文件历史记录失败: {str(e)}")
             # 回滚事务
             self.db_session.rollback()
@@ -0,0 +1,158 @@
+from datetime import datetime, date, timedelta
+from itertools import zip_longest
+from typing import List, Any, Optional, Sequence
+import polars as pl
+
+# 所有 Categorical 列共享全局字符串缓存，分批追加数据时无需重新编码字典
+pl.enable_string_cache()
+
+class ColumnStore:
+    """列式表格存储
+
+    每列保存为一个 Polars Series：整数、浮点、布尔和日期列使用原生类型，
+    其余列转换为字符串并以 Categorical（字典编码）存储，空单元格保存为 null。
+    """
+
+    def __init__(self, columns: Optional[List[pl.Series]] = None):
+        self._columns: List[pl.Series] = columns or []
+        self._row_count = len(self._columns[0]) if self._columns else 0
+        self._max_text_lengths: Optional[List[int]] = None  # 每列最长文本长度的缓存
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> "ColumnStore":
+        """从行数据（二维列表）创建列式存储"""
+        if not rows:
+            return cls()
+        columns = [
+            _build_series(_column_name(idx), values)
+            for idx, values in enumerate(zip_longest(*rows, fillvalue=""))
+        ]
+        return cls(columns)
+
+    @classmethod
+    def from_frame(cls, frame: pl.DataFrame) -> "ColumnStore":
+        """从 Polars DataFrame 创建列式存储，列名统一重命名为内部列名"""
+        return cls([
+            series.rename(_column_name(idx))
+            for idx, series in enumerate(frame.get_columns())
+        ])
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    @property
+    def column_count(self) -> int:
+        return len(self._columns)
+
+    def value(self, row: int, col: int) -> Any:
+        """获取单元格的值，空单元格返回 None"""
+        return self._columns[col][row]
+
+    def column(self, col: int) -> pl.Series:
+        """获取指定列"""
+        return self._columns[col]
+
+    def row(self, row: int) -> List[Any]:
+        """获取一整行的值"""
+        return [series[row] for series in self._columns]
+
+    def append(self, other: "ColumnStore"):
+        """在末尾追加另一个列式存储的数据
+
+        列类型不一致时会提升为兼容类型：整数与浮点合并为浮点，其它情况合并为字符串。
+        """
+        if other.row_count == 0:
+            return
+        if self.column_count == 0:
+            # 浅拷贝列，避免后续原地追加时修改 other 的数据
+            self._columns = [series.clone() for series in other._columns]
+            self._row_count = other.row_count
+            self._max_text_lengths = None
+            return
+
+        self.widen(other.column_count)
+        for idx, current in enumerate(self._columns):
+            if idx < other.column_count:
+                incoming = other._columns[idx]
+            else:
+                incoming = _null_series(idx, other.row_count)
+            current, incoming = _unify_dtypes(current, incoming)
+            self._columns[idx] = current.append(incoming)
+        self._row_count += other.row_count
+        self._max_text_lengths = None
+
+    def widen(self, width: int):
+        """用空值列把存储扩展到指定列数"""
+        for idx in range(self.column_count, width):
+            self._columns.append(_null_series(idx, self._row_count))
+            self._max_text_lengths = None
+
+    def max_text_lengths(self) -> List[int]:
+        """每列显示文本的最大字符数，向量化计算后缓存，数据变化时失效"""
+        if self._max_text_lengths is None:
+            self._max_text_lengths = [
+                series.cast(pl.String).str.len_chars().max() or 0
+                for series in self._columns
+            ]
+        return self._max_text_lengths
+
+    def rechunk(self):
+        """合并多次追加产生的内存块，提升随机访问速度"""
+        self._columns = [series.rechunk() for series in self._columns]
+
+    def to_frame(self) -> pl.DataFrame:
+        """转换为 Polars DataFrame（不复制数据）"""
+        return pl.DataFrame(self._columns)
+
+    def estimated_size(self) -> int:
+        """估算占用的内存字节数"""
+        return sum(series.estimated_size() for series in self._columns)
+
+def _column_name(idx: int) -> str:
+    return f"column_{idx}"
+
+def _null_series(idx: int, length: int) -> pl.Series:
+    return pl.Series(_column_name(idx), [None] * length, dtype=pl.Categorical)
+
+def _build_series(name: str, values: Sequence[Any]) -> pl.Series:
+    """根据一列的值推断类型并构建 Series"""
+    cleaned = [None if value is None or value == "" else value for value in values]
+    types = {type(value) for value in cleaned if value is not None}
+
+    if not types:
+        return pl.Series(name, cleaned, dtype=pl.Categorical)
+    if types == {bool}:
+        return pl.Series(name, cleaned, dtype=pl.Boolean)
+    if types == {int}:
+        return pl.Series(name, cleaned, dtype=pl.Int64)
+    if types <= {int, float}:
+        return pl.Series(name, cleaned, dtype=pl.Float64)
+    if types == {datetime}:
+        return pl.Series(name, cleaned, dtype=pl.Datetime("us"))
+    if types == {date}:
+        return pl.Series(name, cleaned, dtype=pl.Date)
+    if types == {timedelta}:
+        return pl.Series(name, cleaned, dtype=pl.Duration("us"))
+
+    # 字符串或混合类型的列统一转换为字符串后字典编码
+    return pl.Series(
+        name,
+        [None if value is None else str(value) for value in cleaned],
+        dtype=pl.Categorical,
+    )
+
+def _unify_dtypes(left: pl.Series, right: pl.Series):
+    """将两列转换为可以拼接的相同类型"""
+    if left.dtype == right.dtype:
+        return left, right
+    if left.null_count() == len(left):
+        return left.cast(right.dtype), right
+    if right.null_count() == len(right):
+        return left, right.cast(left.dtype)
+    if left.dtype.is_numeric() and right.dtype.is_numeric():
+        return left.cast(pl.Float64), right.cast(pl.Float64)
+    return (
+        left.cast(pl.String).cast(pl.Categorical),
+        right.cast(pl.String).cast(pl.Categorical),
+    )
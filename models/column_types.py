@@ -0,0 +1,192 @@
+from datetime import datetime, date, time, timedelta
+from itertools import islice
+from typing import List, Any, Sequence, Callable, Iterable, Iterator, Tuple
+
+# 导入表使用的列类型，日期时间以 ISO 8601 文本保存，可直接用于 SQLite 的日期函数和排序
+SQL_INTEGER = "INTEGER"
+SQL_REAL = "REAL"
+SQL_TEXT = "TEXT"
+SQL_DATETIME = "DATETIME"
+SQL_DATE = "DATE"
+SQL_TIME = "TIME"
+
+# 推断类型时默认采样的行数
+TYPE_SAMPLE_SIZE = 2000
+
+def sample_rows(rows: Sequence[Any], sample_size: int = TYPE_SAMPLE_SIZE) -> List[Any]:
+    """从行序列中采样：前半部分取开头的行，其余按固定步长覆盖整个序列"""
+    if len(rows) <= sample_size:
+        return list(rows)
+    head_size = sample_size // 2
+    step = max(1, (len(rows) - head_size) // (sample_size - head_size))
+    return list(rows[:head_size]) + list(rows[head_size::step])
+
+def _value_type(value: Any) -> str:
+    """单个值对应的列类型，空值返回空字符串"""
+    if value is None or value == "":
+        return ""
+    if isinstance(value, bool) or isinstance(value, int):
+        return SQL_INTEGER
+    if isinstance(value, float):
+        return SQL_INTEGER if value.is_integer() else SQL_REAL
+    if isinstance(value, datetime):
+        return SQL_DATETIME
+    if isinstance(value, date):
+        return SQL_DATE
+    if isinstance(value, time):
+        return SQL_TIME
+    return SQL_TEXT
+
+def _merge_types(types: set) -> str:
+    """合并一列中出现的所有值类型"""
+    types.discard("")
+    if not types:
+        return SQL_TEXT
+    if len(types) == 1:
+        return types.pop()
+    if types == {SQL_INTEGER, SQL_REAL}:
+        return SQL_REAL
+    if types == {SQL_DATETIME, SQL_DATE}:
+        return SQL_DATETIME
+    return SQL_TEXT
+
+def infer_column_types(rows: Sequence[Sequence[Any]], column_count: int) -> List[str]:
+    """根据样本行推断每列的 SQLite 类型
+
+    样本之外出现的不兼容值不会导致写入失败：SQLite 按列亲和性保存，
+    无法转换的值会以原始类型存储。
+
+    Args:
+        rows: 样本行
+        column_count: 列数
+
+    Returns:
+        每列的类型名称
+    """
+    column_types = []
+    for col in range(column_count):
+        types = set()
+        for row in rows:
+            if col < len(row):
+                types.add(_value_type(row[col]))
+                # 出现文本后该列只能是 TEXT，无需继续检查
+                if SQL_TEXT in types:
+                    break
+        column_types.append(_merge_types(types))
+    return column_types
+
+def _clean_text(value: str) -> str:
+    # 处理特殊字符和换行符
+    return value.replace('\x00', '').strip()
+
+def _to_text(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is str:
+        return _clean_text(value)
+    if value_type is float or value_type is int:
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return str(value)
+    return value
+
+def _to_integer(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is float:
+        return int(value) if value.is_integer() else value
+    if value_type is int:
+        return value
+    if value == "" or value is None:
+        return None
+    if value_type is bool:
+        return int(value)
+    return _to_text(value)
+
+def _to_real(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is float or value_type is int:
+        return value
+    if value == "" or value is None:
+        return None
+    if value_type is bool:
+        return int(value)
+    return _to_text(value)
+
+def _to_temporal(value: Any) -> Any:
+    if value == "" or value is None:
+        return None
+    return _to_text(value)
+
+# 以下按列批量转换：常见类型的值在列表推导式中内联处理，不逐个调用转换函数，
+# 只有类型与列不符的少数值才交给上面的单值转换函数
+
+_NUMBER_TYPES = {int, float}
+
+def _convert_text_column(values: Sequence[Any]) -> Sequence[Any]:
+    if set(map(type, values)) == {str}:
+        # 整列都是字符串时由 map 在 C 层完成，没有需要清理的值时返回原序列
+        # 先去掉 NUL 再去首尾空白，"abc \x00" 这样 NUL 前有空格的值才能清理干净
+        if '\x00' in ''.join(values):
+            values = tuple(value.replace('\x00', '') for value in values)
+        cleaned = tuple(map(str.strip, values))
+        return values if cleaned == values else cleaned
+    return [value.replace('\x00', '').strip() if value.__class__ is str else _to_text(value) for value in values]
+
+def _convert_number_column(convert: Callable[[Any], Any]) -> Callable[[Sequence[Any]], Sequence[Any]]:
+    def convert_column(values: Sequence[Any]) -> Sequence[Any]:
+        # 整列都是数字时原样写入，整数值的浮点数由 INTEGER 列亲和性转换为整数
+        if set(map(type, values)) <= _NUMBER_TYPES:
+            return values
+        return [value if value.__class__ is float or value.__class__ is int else convert(value) for value in values]
+    return convert_column
+
+def _convert_temporal_column(values: Sequence[Any]) -> List[Any]:
+    return [_to_temporal(value) for value in values]
+
+_COLUMN_CONVERTERS = {
+    SQL_INTEGER: _convert_number_column(_to_integer),
+    SQL_REAL: _convert_number_column(_to_real),
+    SQL_DATETIME: _convert_temporal_column,
+    SQL_DATE: _convert_temporal_column,
+    SQL_TIME: _convert_temporal_column,
+    SQL_TEXT: _convert_text_column,
+}
+
+def get_column_converters(column_types: Sequence[str]) -> List[Callable[[Sequence[Any]], Sequence[Any]]]:
+    """获取每列写入数据库前使用的批量转换函数，输入一列的值，返回转换后的值列表
+
+    数字列的空单元格保存为 NULL，文本列保持原来的空字符串。
+    """
+    return [_COLUMN_CONVERTERS.get(column_type, _convert_text_column) for column_type in column_types]
+
+def convert_row_chunks(rows: Iterable[Sequence[Any]], column_types: Sequence[str],
+                       chunk_size: int = 5000) -> Iterator[List[Tuple[Any, ...]]]:
+    """按块把行转置为列，逐列批量转换后再组合为元组
+
+    行的长度必须与列数一致。转置和组合都由 zip 完成，热点路径上没有逐个单元格的
+    Python 函数调用；整块都无需转换时直接返回原始行。每块可以直接交给 executemany。
+
+    Args:
+        rows: 数据行
+        column_types: 每列的 SQLite 类型
+        chunk_size: 每块的行数
+
+    Yields:
+        转换后的行元组列表
+    """
+    converters = get_column_converters(column_types)
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        columns = list(zip(*chunk))
+        converted = [convert(values) for convert, values in zip(converters, columns)]
+        if all(new is old for new, old in zip(converted, columns)):
+            # 所有列都无需转换时直接写入原始行，不再重新组合元组
+            yield chunk
+        else:
+            yield list(zip(*converted))
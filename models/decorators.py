@@ -4,6 +4,8 @@ from typing import Type, Union, Tuple, Callable
 import sqlite3
 import traceback
 
+logger = logging.getLogger(__name__)
+
 class ExceptionHandler:
     """异常处理装饰器类"""
     
@@ -59,7 +61,7 @@ class DBExceptionHandler(ExceptionHandler):
             except ValueError as e:
                 # ValueError 使用指定的错误消息前缀
                 error_msg = f"{self.error_message}：{str(e)}"
-                logging.error(error_msg)
+                logger.error(error_msg)
                 if self.auto_rollback and args and hasattr(args[0], 'conn'):
                     try:
                         args[0].conn.rollback()
@@ -68,7 +70,7 @@ class DBExceptionHandler(ExceptionHandler):
                 return self.return_value
             except (sqlite3.Error, Exception) as e:
                 # 其他异常显示原始错误信息和堆栈
-                logging.error(f"数据库异常：{str(e)}\n{traceback.format_exc()}")
+                logger.error(f"数据库异常：{str(e)}\n{traceback.format_exc()}")
                 if self.auto_rollback and args and hasattr(args[0], 'conn'):
                     try:
                         args[0].conn.rollback()
@@ -0,0 +1,38 @@
+from typing import List, Any, Iterable, Sequence, Tuple, Optional
+import hashlib
+
+# 增量导入时保存每行哈希的隐藏列
+ROW_HASH_COLUMN = "__row_hash"
+
+def row_hash(values: Sequence[Any]) -> int:
+    """计算一行转换后的值的哈希，返回可以存入 SQLite INTEGER 的有符号 64 位整数
+
+    使用 repr 区分值的类型（1 与 "1"），结果与进程无关，可以跨次导入比较。
+    """
+    digest = hashlib.blake2b(repr(tuple(values)).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+class FingerprintBuilder:
+    """按批次累积行哈希计算工作表的内容指纹，结果与 sheet_fingerprint 相同"""
+
+    def __init__(self, headers: Sequence[str], column_types: Sequence[str]):
+        self._hasher = hashlib.blake2b(digest_size=16)
+        self._hasher.update(repr((list(headers), list(column_types))).encode("utf-8"))
+
+    def update(self, row_hashes: Iterable[int]):
+        """按行顺序追加一批行哈希"""
+        for value in row_hashes:
+            self._hasher.update(value.to_bytes(8, "big", signed=True))
+
+    def hexdigest(self, merged_cells: Optional[List[Tuple[Tuple[int, int], Tuple[int, int]]]] = None) -> str:
+        """加入合并单元格后返回指纹"""
+        hasher = self._hasher.copy()
+        hasher.update(repr(sorted(merged_cells or [])).encode("utf-8"))
+        return hasher.hexdigest()
+
+def sheet_fingerprint(headers: Sequence[str], column_types: Sequence[str], row_hashes: Sequence[int],
+                      merged_cells: Optional[List[Tuple[Tuple[int, int], Tuple[int, int]]]] = None) -> str:
+    """根据列名、列类型、每行哈希和合并单元格计算工作表的内容指纹"""
+    builder = FingerprintBuilder(headers, column_types)
+    builder.update(row_hashes)
+    return builder.hexdigest(merged_cells)
@@ -0,0 +1,167 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from concurrent.futures import FIRST_COMPLETED, wait
+from collections import deque
+from typing import List, Optional, Tuple
+import logging
+import os
+import threading
+import traceback
+from python_calamine import CalamineWorkbook
+from excel_processor import ExcelProcessor, create_decode_pool, decode_sheet_for_import
+from models.timer import PerformanceTimer
+
+logger = logging.getLogger(__name__)
+
+# 需要导入的文件扩展名
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+class FolderImportSignals(QObject):
+    """文件夹导入任务的信号"""
+    progress = pyqtSignal(int)  # 进度百分比
+    sheet_imported = pyqtSignal(str, str, int)  # 文件路径, 工作表名称, 行数
+    sheet_failed = pyqtSignal(str, str, str)  # 文件路径, 工作表名称, 错误信息
+    finished = pyqtSignal(int, int, bool)  # 成功数量, 失败数量, 是否被取消
+    failed = pyqtSignal(str)  # 错误信息
+
+class FolderImportTask(QRunnable):
+    """把目录树中的所有 Excel 文件导入 SQLite
+
+    - 扫描目录并读取每个文件的工作表列表，跳过检查点中文件未变化的工作表
+    - 工作表由进程池并行解码，同时在途的工作表数量受队列大小限制
+    - 当前线程是唯一的写入者，每个工作表写入成功后记录检查点，
+      中断后重新运行同一目录时从未完成的工作表继续
+    - 暂停时不再提交新的解码任务，正在写入的工作表在当前数据块写完后阻塞
+    """
+
+    def __init__(self, folder: str, signals: FolderImportSignals, db_path: str = "data.db",
+                 max_workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 index_text: bool = False):
+        """
+        Args:
+            folder: 需要导入的目录
+            signals: 用于发送进度的信号对象（需在 GUI 线程中创建）
+            db_path: SQLite数据库路径
+            max_workers: 解码工作进程数，默认为 CPU 核数
+            queue_size: 同时在途（解码中或等待写入）的工作表数量上限，默认为工作进程数的两倍
+            index_text: 是否同时写入全文搜索索引
+        """
+        super().__init__()
+        self.folder = folder
+        self.signals = signals
+        self.db_path = db_path
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.queue_size = queue_size or self.max_workers * 2
+        self.index_text = index_text
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._cancelled = False
+
+    def pause(self):
+        """暂停导入"""
+        self._resume_event.clear()
+        logger.info("文件夹导入已暂停")
+
+    def resume(self):
+        """继续导入"""
+        self._resume_event.set()
+        logger.info("文件夹导入已继续")
+
+    def cancel(self):
+        """取消导入，已完成的工作表保留在检查点中"""
+        self._cancelled = True
+        # 唤醒处于暂停状态的线程，使其尽快退出
+        self._resume_event.set()
+
+    def is_paused(self) -> bool:
+        return not self._resume_event.is_set()
+
+    def _collect_tasks(self, processor: ExcelProcessor) -> List[Tuple[str, str, int, int]]:
+        """扫描目录，返回未导入的 (文件路径, 工作表名称, 文件大小, 修改时间)"""
+        checkpoints = processor.load_import_checkpoints()
+        tasks = []
+        skipped = 0
+        for root, _, files in os.walk(self.folder):
+            for file_name in sorted(files):
+                if self._cancelled:
+                    return []
+                # 跳过 Excel 打开文件时产生的临时文件
+                if not file_name.lower().endswith(EXCEL_EXTENSIONS) or file_name.startswith('~$'):
+                    continue
+                file_path = os.path.abspath(os.path.join(root, file_name))
+                try:
+                    stat = os.stat(file_path)
+                    # 及时关闭句柄，避免扫描大量文件时句柄累积（Windows 下还会锁住文件）
+                    with CalamineWorkbook.from_path(file_path) as workbook:
+                        sheet_names = workbook.sheet_names
+                except Exception as e:
+                    logger.error(f"无法读取文件 {file_path}: {str(e)}")
+                    self.signals.sheet_failed.emit(file_path, "", str(e))
+                    continue
+                for sheet_name in sheet_names:
+                    if checkpoints.get((file_path, sheet_name)) == (stat.st_size, stat.st_mtime_ns):
+                        skipped += 1
+                        continue
+                    tasks.append((file_path, sheet_name, stat.st_size, stat.st_mtime_ns))
+        logger.info(f"扫描目录 {self.folder} 完成：待导入 {len(tasks)} 个工作表，跳过已导入的 {skipped} 个")
+        return tasks
+
+    def run(self):
+        imported = failed = 0
+        try:
+            with PerformanceTimer("导入文件夹", self.folder) as timer:
+                processor = ExcelProcessor(self.db_path)
+                tasks = self._collect_tasks(processor)
+                total = len(tasks)
+                self.signals.progress.emit(0)
+                if total:
+                    imported, failed = self._import_tasks(processor, tasks)
+                timer.add("sheets", imported)
+            self.signals.progress.emit(100 if not self._cancelled else int((imported + failed) * 100 / max(total, 1)))
+            self.signals.finished.emit(imported, failed, self._cancelled)
+        except Exception as e:
+            logger.error(f"文件夹导入失败：{str(e)}\n{traceback.format_exc()}")
+            self.signals.failed.emit(str(e))
+
+    def _import_tasks(self, processor: ExcelProcessor, tasks: List[Tuple[str, str, int, int]]) -> Tuple[int, int]:
+        pending = deque(tasks)
+        in_flight = {}
+        imported = failed = 0
+
+        executor = create_decode_pool(min(self.max_workers, len(tasks)))
+        try:
+            while (pending or in_flight) and not self._cancelled:
+                # 暂停时不再提交新的解码任务
+                if self._resume_event.is_set():
+                    while pending and len(in_flight) < self.queue_size:
+                        task = pending.popleft()
+                        future = executor.submit(decode_sheet_for_import, task[0], task[1])
+                        in_flight[future] = task
+                if not in_flight:
+                    self._resume_event.wait(0.2)
+                    continue
+
+                done, _ = wait(in_flight, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path, sheet_name, file_size, file_mtime_ns = in_flight.pop(future)
+                    self._resume_event.wait()
+                    if self._cancelled:
+                        break
+                    result = processor.write_imported_sheet(file_path, sheet_name, future, self._resume_event,
+                                                           index_text=self.index_text)
+                    if result.error:
+                        failed += 1
+                        self.signals.sheet_failed.emit(file_path, sheet_name, result.error)
+                    else:
+                        imported += 1
+                        processor.save_import_checkpoint(file_path, sheet_name, file_size, file_mtime_ns,
+                                                         result.table_name, result.row_count)
+                        self.signals.sheet_imported.emit(file_path, sheet_name, result.row_count)
+                    self.signals.progress.emit(int((imported + failed) * 100 / len(tasks)))
+        finally:
+            executor.shutdown(wait=not self._cancelled, cancel_futures=True)
+
+        if self._cancelled:
+            logger.info(f"文件夹导入已取消：已导入 {imported} 个工作表")
+        else:
+            logger.info(f"文件夹导入完成：成功 {imported} 个工作表，失败 {failed} 个")
+        return imported, failed
@@ -0,0 +1,82 @@
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+class LogSearch:
+    """日志搜索的增量匹配索引
+
+    记录包含查询文本（不区分大小写）的日志行序号。设置查询时扫描一次
+    环形缓冲区中的全部行，之后新增的日志只扫描新增部分，被缓冲区丢弃的
+    行从索引中移除，不需要在每次刷新时重新搜索整个文档。
+    """
+
+    def __init__(self):
+        self.query = ""
+        self._needle = ""
+        self._matches: List[int] = []  # 匹配行的序号，升序
+
+    def set_query(self, query: str, first_seq: int, lines: List[str]):
+        """设置查询文本并扫描现有的行
+
+        Args:
+            query: 查询文本，为空时清空索引
+            first_seq: lines 中第一行的序号
+            lines: 缓冲区中的全部行
+        """
+        self.query = query
+        self._needle = query.lower()
+        self._matches = []
+        if self._needle:
+            self.add_lines(first_seq, lines)
+
+    def add_lines(self, first_seq: int, lines: List[str]):
+        """扫描新增的行"""
+        if not self._needle:
+            return
+        needle = self._needle
+        self._matches.extend(
+            first_seq + offset for offset, line in enumerate(lines) if needle in line.lower()
+        )
+
+    def discard_before(self, seq: int):
+        """移除序号小于 seq 的匹配（对应的行已被缓冲区丢弃）"""
+        count = bisect_left(self._matches, seq)
+        if count:
+            del self._matches[:count]
+
+    def __len__(self) -> int:
+        return len(self._matches)
+
+    def __contains__(self, seq: int) -> bool:
+        index = bisect_left(self._matches, seq)
+        return index < len(self._matches) and self._matches[index] == seq
+
+    def position(self, seq: int) -> int:
+        """匹配行在全部匹配中的位置（从0开始），不是匹配行时返回 -1"""
+        index = bisect_left(self._matches, seq)
+        return index if index < len(self._matches) and self._matches[index] == seq else -1
+
+    def next_match(self, seq: Optional[int]) -> Optional[int]:
+        """seq 之后的下一个匹配行，到末尾时回到第一个"""
+        if not self._matches:
+            return None
+        index = 0 if seq is None else bisect_left(self._matches, seq + 1)
+        return self._matches[index % len(self._matches)]
+
+    def previous_match(self, seq: Optional[int]) -> Optional[int]:
+        """seq 之前的上一个匹配行，到开头时回到最后一个"""
+        if not self._matches:
+            return None
+        index = len(self._matches) if seq is None else bisect_left(self._matches, seq)
+        return self._matches[(index - 1) % len(self._matches)]
+
+    def find_spans(self, line: str) -> List[Tuple[int, int]]:
+        """一行中所有匹配的 (起始位置, 长度)"""
+        spans = []
+        if not self._needle:
+            return spans
+        lowered = line.lower()
+        start = lowered.find(self._needle)
+        while start >= 0:
+            spans.append((start, len(self._needle)))
+            start = lowered.find(self._needle, start + len(self._needle))
+        return spans
@@ -0,0 +1,75 @@
+from collections import deque
+from typing import List, Tuple
+import threading
+
+# 日志面板默认保留的行数
+DEFAULT_MAX_LOG_LINES = 10000
+# 单行日志的最大长度，超出部分截断，避免整段数据被写入日志面板
+MAX_LOG_LINE_LENGTH = 2000
+
+class LogStore:
+    """容量固定的日志环形缓冲区
+
+    任意线程都可以追加日志，追加只在锁内入队；GUI 线程定时取走新增的行
+    批量显示。缓冲区和待显示队列都有容量上限，超出后丢弃最旧的行，
+    因此日志量再大占用的内存也是固定的。
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LOG_LINES):
+        """
+        Args:
+            max_lines: 保留的最大行数
+        """
+        self.max_lines = max_lines
+        self._lock = threading.Lock()
+        self._lines = deque(maxlen=max_lines)
+        self._pending = deque(maxlen=max_lines)  # 尚未显示的行
+        self._total = 0  # 累计追加的行数，用于换算行在缓冲区中的位置
+
+    def append(self, text: str):
+        """追加一条日志，多行文本按行拆分"""
+        lines = [
+            line if len(line) <= MAX_LOG_LINE_LENGTH else line[:MAX_LOG_LINE_LENGTH] + "..."
+            for line in text.splitlines()
+        ]
+        with self._lock:
+            self._lines.extend(lines)
+            self._pending.extend(lines)
+            self._total += len(lines)
+
+    def take_pending(self) -> Tuple[int, List[str]]:
+        """取出自上次调用以来新增的行
+
+        Returns:
+            (第一行的序号, 新增的行)，序号从0开始按追加顺序递增
+        """
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+            return self._total - len(pending), pending
+
+    def lines(self) -> List[str]:
+        """缓冲区中全部行的快照，从旧到新排列"""
+        with self._lock:
+            return list(self._lines)
+
+    def snapshot(self) -> Tuple[int, List[str]]:
+        """缓冲区中全部行的快照及第一行的序号"""
+        with self._lock:
+            return self._total - len(self._lines), list(self._lines)
+
+    @property
+    def total(self) -> int:
+        """累计追加的行数（包括已被丢弃的行）"""
+        with self._lock:
+            return self._total
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._lines)
+
+    def clear(self):
+        """清空缓冲区"""
+        with self._lock:
+            self._lines.clear()
+            self._pending.clear()
@@ -0,0 +1,96 @@
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+import atexit
+import logging
+import queue
+import sys
+
+LOG_FILE = "excel_processor.log"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+# 日志文件轮转的大小和保留的备份数量
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+# 单元格级别的详细数据（合并单元格列表等）使用的日志记录器
+CELL_LOGGER_NAME = "cells"
+
+# 各子系统的默认日志级别，单元格数据默认不输出。各模块使用 logging.getLogger(__name__)，
+# 可以按包（如 "models"）或单个模块（如 "models.sheet_loader"）调整级别
+SUBSYSTEM_LEVELS: Dict[str, int] = {
+    "": logging.INFO,
+    "excel_processor": logging.INFO,
+    "main_window": logging.INFO,
+    "models": logging.INFO,
+    "widgets": logging.INFO,
+    CELL_LOGGER_NAME: logging.WARNING,
+}
+
+_listener: Optional[QueueListener] = None
+
+def configure_logging(log_file: str = LOG_FILE, levels: Optional[Dict[str, int]] = None,
+                      console: bool = True) -> QueueListener:
+    """配置异步日志管道
+
+    根日志记录器只挂一个 QueueHandler，记录日志时只需入队；由一个后台监听线程
+    把日志分发到轮转的日志文件、控制台和日志面板。级别按子系统（日志记录器名称）
+    设置，被过滤的日志在调用处就直接返回；以 %s 形式传入的参数此时不会格式化，
+    f-string 则在调用前就已拼接，频繁调用的日志应使用 %s 形式。重复调用时返回已有的监听器。
+
+    Args:
+        log_file: 日志文件路径
+        levels: 覆盖默认值的 {日志记录器名称: 级别}，根记录器使用空字符串
+        console: 是否同时输出到控制台
+
+    Returns:
+        日志监听器
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES,
+                                       backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    handlers = [file_handler]
+    if console:
+        # 绑定原始的标准输出，日志面板重定向 sys.stdout 后不会形成循环
+        console_handler = logging.StreamHandler(sys.__stdout__)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    for name, level in {**SUBSYSTEM_LEVELS, **(levels or {})}.items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+def shutdown_logging():
+    """停止监听线程，处理完队列中剩余的日志"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+def add_log_handler(handler: logging.Handler):
+    """添加日志输出目标：已配置异步管道时由监听线程调用，否则直接挂到根日志记录器"""
+    if _listener is not None:
+        _listener.handlers = _listener.handlers + (handler,)
+    else:
+        logging.getLogger().addHandler(handler)
+
+def remove_log_handler(handler: logging.Handler):
+    """移除通过 add_log_handler 添加的输出目标"""
+    if _listener is not None and handler in _listener.handlers:
+        _listener.handlers = tuple(h for h in _listener.handlers if h is not handler)
+    else:
+        logging.getLogger().removeHandler(handler)
@@ -0,0 +1,97 @@
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+# (start_row, start_col, end_row, end_col)
+MergedRange = Tuple[int, int, int, int]
+
+class MergedRangeIndex:
+    """合并单元格区域的网格桶索引
+
+    按行把表格划分为固定高度的桶，每个合并区域只登记到它覆盖的桶中，
+    桶内按起始列排序。一个 1000x50 的合并区域只占用十几个桶条目，
+    而不是为区域内的每个单元格各保存一条记录。
+
+    - find(row, col)：定位到单个桶后二分查找，再借助桶内结束列的前缀最大值
+      只回溯可能覆盖该列的条目，个别很宽的区域不会拖慢其他桶的查找
+    - query(...)：只遍历与视口相交的桶，复杂度与结果数量相关
+    """
+
+    def __init__(self, bucket_rows: int = 64):
+        """
+        Args:
+            bucket_rows: 每个桶覆盖的行数
+        """
+        self.bucket_rows = bucket_rows
+        self._ranges: List[MergedRange] = []
+        # {桶序号: ([起始列], [区域编号], [结束列前缀最大值])}，三个列表按起始列同步排序，
+        # 第三个列表的第 i 项是前 i + 1 个区域中最大的结束列，二分查找后回溯到它小于目标列为止
+        self._buckets: Dict[int, Tuple[List[int], List[int], List[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def add(self, start_pos: Tuple[int, int], end_pos: Tuple[int, int]) -> int:
+        """登记一个合并区域，返回区域编号"""
+        start_row, start_col = start_pos
+        end_row, end_col = end_pos
+        range_id = len(self._ranges)
+        self._ranges.append((start_row, start_col, end_row, end_col))
+
+        for bucket in range(start_row // self.bucket_rows, end_row // self.bucket_rows + 1):
+            cols, ids, reach = self._buckets.setdefault(bucket, ([], [], []))
+            pos = bisect_right(cols, start_col)
+            cols.insert(pos, start_col)
+            ids.insert(pos, range_id)
+            reach.insert(pos, max(reach[pos - 1], end_col) if pos else end_col)
+            # 前缀最大值单调不减，遇到不小于 end_col 的项即可停止
+            pos += 1
+            while pos < len(reach) and reach[pos] < end_col:
+                reach[pos] = end_col
+                pos += 1
+        return range_id
+
+    def clear(self):
+        """清除所有合并区域"""
+        self._ranges.clear()
+        self._buckets.clear()
+
+    def ranges(self) -> List[MergedRange]:
+        """所有已登记的合并区域"""
+        return list(self._ranges)
+
+    def find(self, row: int, col: int) -> Optional[MergedRange]:
+        """查找包含指定单元格的合并区域，不在任何合并区域内时返回 None"""
+        entry = self._buckets.get(row // self.bucket_rows)
+        if entry is None:
+            return None
+        cols, ids, reach = entry
+        # 起始列不大于 col 的区域中，前缀最大结束列小于 col 之后的区域都不可能覆盖该列
+        pos = bisect_right(cols, col) - 1
+        while pos >= 0 and reach[pos] >= col:
+            merged = self._ranges[ids[pos]]
+            start_row, start_col, end_row, end_col = merged
+            if start_row <= row <= end_row and start_col <= col <= end_col:
+                return merged
+            pos -= 1
+        return None
+
+    def query(self, first_row: int, last_row: int,
+              first_col: int = 0, last_col: Optional[int] = None) -> List[MergedRange]:
+        """查询与指定矩形范围相交的所有合并区域"""
+        result = []
+        seen = set()
+        for bucket in range(first_row // self.bucket_rows, last_row // self.bucket_rows + 1):
+            entry = self._buckets.get(bucket)
+            if entry is None:
+                continue
+            for range_id in entry[1]:
+                if range_id in seen:
+                    continue
+                start_row, start_col, end_row, end_col = self._ranges[range_id]
+                if end_row < first_row or start_row > last_row:
+                    continue
+                if end_col < first_col or (last_col is not None and start_col > last_col):
+                    continue
+                seen.add(range_id)
+                result.append(self._ranges[range_id])
+        return result
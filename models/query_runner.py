@@ -0,0 +1,166 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from time import perf_counter
+from typing import List
+from urllib.parse import quote
+from models.column_store import ColumnStore
+import logging
+import os
+import sqlite3
+import traceback
+
+logger = logging.getLogger(__name__)
+
+# 每执行多少条 SQLite 虚拟机指令回调一次进度处理函数
+PROGRESS_INTERVAL = 1000
+# 每批发送给模型的结果行数
+QUERY_PAGE_SIZE = 5000
+# 结果集最多读取的行数，超过后停止读取并提示结果被截断
+MAX_QUERY_ROWS = 1000000
+
+class QuerySignals(QObject):
+    """查询任务的信号，所有信号都携带查询代号用于丢弃过期结果"""
+    columns_ready = pyqtSignal(int, object)  # 代号, 列名列表
+    rows_ready = pyqtSignal(int, object)  # 代号, 一页结果（ColumnStore）
+    finished = pyqtSignal(int, int, float, int, bool)  # 代号, 行数, 耗时（秒）, 虚拟机指令数, 是否被截断
+    failed = pyqtSignal(int, str)  # 代号, 错误信息
+
+class QueryTask(QRunnable):
+    """在线程池中执行一条 SQL，并按页把结果发送回 GUI 线程
+
+    查询使用独立的只读连接，不会修改已导入的数据，也不会与导入任务争用写锁。
+    通过 SQLite 的进度处理函数响应取消：执行中的语句会在下一次回调时中断，
+    即使聚合查询在返回第一行之前需要扫描整张表也能及时停止。
+    """
+
+    def __init__(self, db_path: str, sql: str, generation: int, signals: QuerySignals,
+                 page_size: int = QUERY_PAGE_SIZE, max_rows: int = MAX_QUERY_ROWS):
+        """
+        Args:
+            db_path: SQLite数据库路径
+            sql: 需要执行的 SQL 语句（只支持单条语句）
+            generation: 查询代号
+            signals: 用于发送结果的信号对象（需在 GUI 线程中创建）
+            page_size: 每页的行数
+            max_rows: 最多读取的行数
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.sql = sql
+        self.generation = generation
+        self.signals = signals
+        self.page_size = page_size
+        self.max_rows = max_rows
+        self._cancelled = False
+        self._progress_calls = 0
+
+    def cancel(self):
+        """取消查询，正在执行的语句会在下一次进度回调时中断"""
+        self._cancelled = True
+
+    def _on_progress(self) -> int:
+        """进度处理函数，返回非零值时 SQLite 中断当前语句"""
+        self._progress_calls += 1
+        return 1 if self._cancelled else 0
+
+    def run(self):
+        start = perf_counter()
+        conn = None
+        try:
+            conn = sqlite3.connect(f"file:{quote(os.path.abspath(self.db_path))}?mode=ro", uri=True)
+            conn.set_progress_handler(self._on_progress, PROGRESS_INTERVAL)
+            cursor = conn.execute(self.sql)
+
+            columns = [description[0] for description in cursor.description or []]
+            self.signals.columns_ready.emit(self.generation, columns)
+
+            total_rows = 0
+            truncated = False
+            while columns:
+                rows = cursor.fetchmany(min(self.page_size, self.max_rows - total_rows))
+                if not rows:
+                    break
+                self.signals.rows_ready.emit(self.generation, ColumnStore.from_rows(
+                    [["" if value is None else value for value in row] for row in rows]
+                ))
+                total_rows += len(rows)
+                if total_rows >= self.max_rows:
+                    truncated = cursor.fetchone() is not None
+                    break
+
+            seconds = perf_counter() - start
+            logger.info(f"SQL 查询完成：{total_rows} 行，耗时 {seconds:.4f} 秒")
+            self.signals.finished.emit(self.generation, total_rows, seconds,
+                                       self._progress_calls * PROGRESS_INTERVAL, truncated)
+        except sqlite3.OperationalError as e:
+            if self._cancelled:
+                logger.info("SQL 查询已取消")
+                return
+            logger.error(f"SQL 查询失败：{str(e)}")
+            self.signals.failed.emit(self.generation, str(e))
+        except Exception as e:
+            logger.error(f"SQL 查询失败：{str(e)}\n{traceback.format_exc()}")
+            self.signals.failed.emit(self.generation, str(e))
+        finally:
+            if conn is not None:
+                conn.close()
+
+class QueryRunner(QObject):
+    """SQL 查询的后台执行器
+
+    与 SheetLoader 相同，每次执行都会取消仍在进行中的查询，过期查询发出的
+    结果会被丢弃。
+    """
+    columns_ready = pyqtSignal(object)  # 列名列表
+    rows_ready = pyqtSignal(object)  # 一页结果（ColumnStore）
+    query_finished = pyqtSignal(int, float, int, bool)  # 行数, 耗时（秒）, 虚拟机指令数, 是否被截断
+    query_failed = pyqtSignal(str)  # 错误信息
+
+    def __init__(self, db_path: str = "data.db", parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.thread_pool = QThreadPool.globalInstance()
+        self._generation = 0
+        self._current_task = None
+
+        self._signals = QuerySignals()
+        self._signals.columns_ready.connect(self._on_columns_ready)
+        self._signals.rows_ready.connect(self._on_rows_ready)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def run(self, sql: str):
+        """开始在后台执行 SQL"""
+        self.cancel()
+        self._generation += 1
+        self._current_task = QueryTask(self.db_path, sql, self._generation, self._signals)
+        self.thread_pool.start(self._current_task)
+
+    def cancel(self):
+        """取消当前查询"""
+        if self._current_task:
+            self._current_task.cancel()
+            self._current_task = None
+        # 让已经排队的过期信号全部失效
+        self._generation += 1
+
+    def is_running(self) -> bool:
+        """是否有正在执行的查询"""
+        return self._current_task is not None
+
+    def _on_columns_ready(self, generation: int, columns: List[str]):
+        if generation == self._generation:
+            self.columns_ready.emit(columns)
+
+    def _on_rows_ready(self, generation: int, store: ColumnStore):
+        if generation == self._generation:
+            self.rows_ready.emit(store)
+
+    def _on_finished(self, generation: int, row_count: int, seconds: float, steps: int, truncated: bool):
+        if generation == self._generation:
+            self._current_task = None
+            self.query_finished.emit(row_count, seconds, steps, truncated)
+
+    def _on_failed(self, generation: int, error_msg: str):
+        if generation == self._generation:
+            self._current_task = None
+            self.query_failed.emit(error_msg)
@@ -0,0 +1,127 @@
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import List, Any
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+class RowSource(ABC):
+    """按需读取行数据的数据源基类
+
+    TableModel 的虚拟化模式通过 read_rows 按块拉取数据，子类只需提供
+    总行数、总列数和按范围读取行的方法。read_rows 在模型的块读取线程中
+    依次调用，不会并发执行，但不一定在创建数据源的线程中调用。
+    """
+    row_count: int = 0
+    column_count: int = 0
+
+    @abstractmethod
+    def read_rows(self, start: int, count: int) -> List[List[Any]]:
+        """读取从 start 开始的 count 行数据"""
+
+    def close(self):
+        """释放数据源占用的资源"""
+        pass
+
+class SheetRowSource(RowSource):
+    """基于 calamine 工作表的行数据源
+
+    calamine 解码后的单元格保存在 Rust 侧的紧凑结构中，这里只在需要时把
+    请求范围内的行转换为 Python 对象。顺序向下读取时复用同一个迭代器，
+    向回跳转时才重新创建迭代器并从头跳过前面的行，这一步与目标行号成正比，
+    因此由模型在后台线程中调用。与 to_python(skip_empty_area=False) 一致，
+    行列都从 A1 开始计算。iter_rows 从第 1 行开始返回（包括已用区域之前的空行），
+    只需用空字符串补齐前导的空列。
+    """
+
+    def __init__(self, sheet_data: Any):
+        """
+        Args:
+            sheet_data: ExcelProcessor.open_sheet 返回的 calamine 工作表对象
+        """
+        self.sheet_data = sheet_data
+        start = sheet_data.start
+        if start is None:
+            self._start_row, self._start_col = 0, 0
+            self.row_count = 0
+            self.column_count = 0
+        else:
+            self._start_row, self._start_col = start
+            self.row_count = self._start_row + sheet_data.height
+            self.column_count = self._start_col + sheet_data.width
+        self._col_padding = [""] * self._start_col
+        self._iterator = None
+        self._next_index = 0  # 迭代器下一次返回的行号
+
+    def read_rows(self, start: int, count: int) -> List[List[Any]]:
+        end = min(start + count, self.row_count)
+        rows = []
+        if start >= end:
+            return rows
+
+        if self._iterator is None or start < self._next_index:
+            logger.debug("重新创建工作表行迭代器，目标行: %d", start)
+            self._iterator = self.sheet_data.iter_rows()
+            self._next_index = 0
+
+        # 跳过目标行之前的行
+        skip = start - self._next_index
+        if skip:
+            next(islice(self._iterator, skip, skip), None)
+            self._next_index += skip
+
+        for row in islice(self._iterator, end - start):
+            rows.append(self._col_padding + row if self._start_col else row)
+            self._next_index += 1
+        return rows
+
+    def close(self):
+        self._iterator = None
+        self.sheet_data = None
+
+class DbRowSource(RowSource):
+    """基于 SQLite 导入表的行数据源
+
+    导入表按行写入，rowid 从 1 开始连续，此时按 rowid 范围读取，任意位置的
+    分页都能走主键索引；rowid 不连续时退回 LIMIT/OFFSET。
+    """
+
+    def __init__(self, db_path: str, table_name: str, columns: List[str]):
+        """
+        Args:
+            db_path: SQLite数据库路径
+            table_name: 表名
+            columns: 需要读取的列
+        """
+        self.table_name = table_name
+        self.columns = columns
+        self.column_count = len(columns)
+        # 在 GUI 线程中创建，由模型的块读取线程使用
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+
+        self.row_count, max_rowid = self._conn.execute(
+            f"SELECT COUNT(*), MAX(rowid) FROM [{table_name}]"
+        ).fetchone()
+        self._contiguous = (max_rowid or 0) == self.row_count
+
+        column_sql = ','.join(f"[{col}]" for col in columns)
+        if self._contiguous:
+            self._select_sql = f"SELECT {column_sql} FROM [{table_name}] WHERE rowid > ? AND rowid <= ? ORDER BY rowid"
+        else:
+            self._select_sql = f"SELECT {column_sql} FROM [{table_name}] ORDER BY rowid LIMIT ? OFFSET ?"
+
+    def read_rows(self, start: int, count: int) -> List[List[Any]]:
+        if self._contiguous:
+            params = (start, start + count)
+        else:
+            params = (count, start)
+        return [
+            ["" if value is None else value for value in row]
+            for row in self._conn.execute(self._select_sql, params)
+        ]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
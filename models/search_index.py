@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+import sqlite3
+
+# 单元格内容表和对应的 FTS5 索引
+SEARCH_CONTENT_TABLE = "_cell_search_content"
+SEARCH_INDEX_TABLE = "_cell_search"
+# trigram 分词器要求查询至少包含 3 个字符，更短的查询退回 LIKE 扫描
+MIN_FTS_QUERY_LENGTH = 3
+
+@dataclass
+class SearchHit:
+    """一个匹配的单元格"""
+    table_name: str
+    row_id: int  # 数据表中的 rowid，从 1 开始
+    column_index: int  # 数据表中的列序号，从 0 开始
+    value: str
+
+def ensure_search_index(conn: sqlite3.Connection):
+    """创建单元格内容表和 FTS5 索引
+
+    内容表按 (table_name, row_id) 建立索引，重新导入时可以按表或按行删除；
+    FTS5 索引使用外部内容表，通过触发器与内容表保持同步。trigram 分词器
+    支持任意位置的子串匹配，中文等没有空格分隔的文本也能检索。
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS [{SEARCH_CONTENT_TABLE}] (
+            id INTEGER PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            column_index INTEGER NOT NULL,
+            value TEXT NOT NULL
+        )
+    """)
+    conn.execute(f"""CREATE INDEX IF NOT EXISTS [idx{SEARCH_CONTENT_TABLE}_row]
+                     ON [{SEARCH_CONTENT_TABLE}] (table_name, row_id)""")
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS [{SEARCH_INDEX_TABLE}] USING fts5(
+            value, content='{SEARCH_CONTENT_TABLE}', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS [{SEARCH_CONTENT_TABLE}_ai] AFTER INSERT ON [{SEARCH_CONTENT_TABLE}] BEGIN
+            INSERT INTO [{SEARCH_INDEX_TABLE}] (rowid, value) VALUES (new.id, new.value);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS [{SEARCH_CONTENT_TABLE}_ad] AFTER DELETE ON [{SEARCH_CONTENT_TABLE}] BEGIN
+            INSERT INTO [{SEARCH_INDEX_TABLE}] ([{SEARCH_INDEX_TABLE}], rowid, value) VALUES ('delete', old.id, old.value);
+        END
+    """)
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    """数据库中是否已经创建过搜索索引"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (SEARCH_CONTENT_TABLE,)
+    ).fetchone() is not None
+
+def remove_table(conn: sqlite3.Connection, table_name: str, row_ids: Optional[Sequence[int]] = None):
+    """从索引中删除数据表的全部行或指定行"""
+    if not has_search_index(conn):
+        return
+    if row_ids is None:
+        conn.execute(f"DELETE FROM [{SEARCH_CONTENT_TABLE}] WHERE table_name=?", (table_name,))
+    else:
+        conn.executemany(
+            f"DELETE FROM [{SEARCH_CONTENT_TABLE}] WHERE table_name=? AND row_id=?",
+            ((table_name, row_id) for row_id in row_ids)
+        )
+
+def index_table(conn: sqlite3.Connection, table_name: str, columns: List[str],
+                row_ids: Optional[Sequence[int]] = None):
+    """把数据表的单元格写入索引，每个非空单元格一条记录
+
+    数据直接在 SQLite 内部通过 INSERT ... SELECT 复制，不经过 Python。
+
+    Args:
+        conn: 数据库连接
+        table_name: 数据表名
+        columns: 需要索引的列
+        row_ids: 只重新索引这些行，默认重新索引整张表
+    """
+    ensure_search_index(conn)
+    remove_table(conn, table_name, row_ids)
+
+    row_filter = ""
+    if row_ids is not None:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _search_row_ids (row_id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM temp._search_row_ids")
+        conn.executemany("INSERT OR IGNORE INTO temp._search_row_ids VALUES (?)", ((row_id,) for row_id in row_ids))
+        row_filter = "AND rowid IN (SELECT row_id FROM temp._search_row_ids)"
+
+    for column_index, column in enumerate(columns):
+        conn.execute(f"""
+            INSERT INTO [{SEARCH_CONTENT_TABLE}] (table_name, row_id, column_index, value)
+            SELECT ?, rowid, ?, CAST([{column}] AS TEXT) FROM [{table_name}]
+            WHERE [{column}] IS NOT NULL AND [{column}] != '' {row_filter}
+        """, (table_name, column_index))
+
+def search(conn: sqlite3.Connection, query: str, limit: int = 200) -> List[SearchHit]:
+    """搜索包含指定文本的单元格
+
+    Args:
+        conn: 数据库连接
+        query: 需要查找的文本，按子串匹配，不区分大小写
+        limit: 最多返回的结果数
+
+    Returns:
+        匹配的单元格
+    """
+    query = query.strip()
+    if not query or not has_search_index(conn):
+        return []
+
+    if len(query) >= MIN_FTS_QUERY_LENGTH:
+        # 整个查询作为一个短语，避免用户输入被解析为 FTS5 语法
+        phrase = '"' + query.replace('"', '""') + '"'
+        cursor = conn.execute(f"""
+            SELECT c.table_name, c.row_id, c.column_index, c.value
+            FROM [{SEARCH_INDEX_TABLE}] f JOIN [{SEARCH_CONTENT_TABLE}] c ON c.id = f.rowid
+            WHERE f.value MATCH ?
+            LIMIT ?
+        """, (phrase, limit))
+    else:
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        cursor = conn.execute(f"""
+            SELECT table_name, row_id, column_index, value FROM [{SEARCH_CONTENT_TABLE}]
+            WHERE value LIKE ? ESCAPE '\\'
+            LIMIT ?
+        """, (f"%{escaped}%", limit))
+    return [SearchHit(*row) for row in cursor]
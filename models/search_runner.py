@@ -0,0 +1,104 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from models.timer import PerformanceTimer
+import logging
+import sqlite3
+import traceback
+
+logger = logging.getLogger(__name__)
+
+class SearchSignals(QObject):
+    """搜索任务的信号，所有信号都携带搜索代号用于丢弃过期结果"""
+    finished = pyqtSignal(int, object, float)  # 代号, 命中的单元格列表, 耗时（秒）
+    failed = pyqtSignal(int, str)  # 代号, 错误信息
+
+class SearchTask(QRunnable):
+    """在线程池中搜索单元格，FTS 查询和 LIKE 回退扫描都不占用 GUI 线程
+
+    取消后正在执行的语句会在 SQLite 的下一次进度回调时中断。
+    """
+
+    def __init__(self, processor, query: str, limit: int, generation: int, signals: SearchSignals):
+        """
+        Args:
+            processor: ExcelProcessor 实例
+            query: 需要查找的文本
+            limit: 最多返回的结果数
+            generation: 搜索代号
+            signals: 用于发送结果的信号对象（需在 GUI 线程中创建）
+        """
+        super().__init__()
+        self.processor = processor
+        self.query = query
+        self.limit = limit
+        self.generation = generation
+        self.signals = signals
+        self._cancelled = False
+
+    def cancel(self):
+        """取消搜索"""
+        self._cancelled = True
+
+    def run(self):
+        if self._cancelled:
+            return
+        try:
+            with PerformanceTimer("全文搜索") as timer:
+                matches = self.processor.search_cells(self.query, self.limit, is_cancelled=lambda: self._cancelled)
+            self.signals.finished.emit(self.generation, matches, timer.duration)
+        except sqlite3.OperationalError as e:
+            if self._cancelled:
+                return
+            logger.error(f"搜索失败: {str(e)}")
+            self.signals.failed.emit(self.generation, str(e))
+        except Exception as e:
+            logger.error(f"搜索失败: {str(e)}\n{traceback.format_exc()}")
+            self.signals.failed.emit(self.generation, str(e))
+
+class SearchRunner(QObject):
+    """单元格搜索的后台执行器
+
+    与 SheetLoader 相同，每次搜索都会取消仍在进行中的搜索，过期搜索发出的
+    结果会被丢弃，连续输入时只有最后一次搜索的结果会显示。
+    """
+    search_finished = pyqtSignal(object, float)  # 命中的单元格列表, 耗时（秒）
+    search_failed = pyqtSignal(str)  # 错误信息
+
+    def __init__(self, processor, parent=None):
+        super().__init__(parent)
+        self.processor = processor
+        self.thread_pool = QThreadPool.globalInstance()
+        self._generation = 0
+        self._current_task = None
+
+        self._signals = SearchSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def search(self, query: str, limit: int):
+        """开始在后台搜索"""
+        self.cancel()
+        self._generation += 1
+        self._current_task = SearchTask(self.processor, query, limit, self._generation, self._signals)
+        self.thread_pool.start(self._current_task)
+
+    def cancel(self):
+        """取消当前搜索"""
+        if self._current_task:
+            self._current_task.cancel()
+            self._current_task = None
+        # 让已经排队的过期信号全部失效
+        self._generation += 1
+
+    def is_running(self) -> bool:
+        """是否有正在进行的搜索"""
+        return self._current_task is not None
+
+    def _on_finished(self, generation: int, matches, seconds: float):
+        if generation == self._generation:
+            self._current_task = None
+            self.search_finished.emit(matches, seconds)
+
+    def _on_failed(self, generation: int, error_msg: str):
+        if generation == self._generation:
+            self._current_task = None
+            self.search_failed.emit(error_msg)
@@ -0,0 +1,208 @@
+from PyQt6.QtCore import QStandardPaths
+from typing import Optional, List, Tuple, Dict
+from time import time
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import polars as pl
+from models.column_store import ColumnStore
+
+logger = logging.getLogger(__name__)
+
+# 缓存目录名称和默认容量上限
+CACHE_DIR_NAME = "sheet_cache"
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+def default_cache_dir() -> str:
+    """系统缓存目录（如 ~/.cache/<应用名>）下的工作表缓存目录"""
+    return os.path.join(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation),
+                        CACHE_DIR_NAME)
+
+def _write_atomic(path: str, write):
+    """先写入同目录下唯一命名的临时文件再替换，并发写入同一文件时互不干扰，
+    读取方也不会读到写了一半的文件"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _write_json(path: str, value):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False)
+
+class SheetCache:
+    """工作表解析结果的磁盘缓存
+
+    每个工作表的列式数据保存为一个未压缩的 Arrow IPC 文件，读取时直接内存映射；
+    合并单元格信息保存在同名的 JSON 旁路文件中。缓存键由文件绝对路径、大小、
+    修改时间以及可选的内容哈希组成，源文件变化后旧条目自然失效。
+    index.json 记录每个条目的大小和最后访问时间，总大小超过上限时按 LRU 淘汰。
+    命中缓存时只在内存中更新访问时间，写入、淘汰或调用 flush 时才保存 index.json。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 use_content_hash: bool = False):
+        """
+        Args:
+            cache_dir: 缓存目录，默认为系统缓存目录下的 sheet_cache
+            max_bytes: 缓存总大小上限（字节）
+            use_content_hash: 是否把文件内容哈希加入缓存键，可以识别修改时间未变但内容变化的文件
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.use_content_hash = use_content_hash
+        self._lock = threading.Lock()
+        self._hash_cache: Dict[Tuple[str, int, int], str] = {}  # {(路径, 大小, 修改时间): 内容哈希}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index_path = os.path.join(self.cache_dir, "index.json")
+        self._index = self._load_index()
+        self._index_dirty = False  # 内存中的访问时间是否尚未保存
+
+    def _load_index(self) -> Dict[str, dict]:
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        _write_atomic(self._index_path, lambda path: _write_json(path, self._index))
+        self._index_dirty = False
+
+    def flush(self):
+        """保存尚未写入磁盘的访问时间"""
+        with self._lock:
+            if self._index_dirty:
+                self._save_index()
+
+    def _content_hash(self, file_path: str, size: int, mtime_ns: int) -> str:
+        """计算文件内容哈希，同一版本的文件只计算一次"""
+        cache_key = (file_path, size, mtime_ns)
+        digest = self._hash_cache.get(cache_key)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            self._hash_cache[cache_key] = digest
+        return digest
+
+    def make_key(self, file_path: str, sheet_name: str) -> str:
+        """根据文件路径、大小、修改时间（和内容哈希）生成缓存键"""
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        parts = [file_path, str(stat.st_size), str(stat.st_mtime_ns), sheet_name]
+        if self.use_content_hash:
+            parts.append(self._content_hash(file_path, stat.st_size, stat.st_mtime_ns))
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _entry_paths(self, key: str) -> Tuple[str, str]:
+        return (
+            os.path.join(self.cache_dir, f"{key}.arrow"),
+            os.path.join(self.cache_dir, f"{key}.merged.json"),
+        )
+
+    def get(self, file_path: str, sheet_name: str) -> Optional[Tuple[ColumnStore, List[Tuple[Tuple[int, int], Tuple[int, int]]]]]:
+        """读取缓存的工作表
+
+        Returns:
+            (列式数据, 合并单元格信息)，未命中时返回 None
+        """
+        key = self.make_key(file_path, sheet_name)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            data_path, merged_path = self._entry_paths(key)
+            try:
+                frame = pl.read_ipc(data_path, memory_map=True)
+                with open(merged_path, "r", encoding="utf-8") as f:
+                    merged_cells = [
+                        ((start_row, start_col), (end_row, end_col))
+                        for (start_row, start_col), (end_row, end_col) in json.load(f)
+                    ]
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取工作表缓存失败，将重新解析: {str(e)}")
+                self._remove_entry(key)
+                self._save_index()
+                return None
+
+            # 访问时间只影响淘汰顺序，延迟到下次写入索引时保存
+            entry["last_access"] = time()
+            self._index_dirty = True
+
+        logger.info("命中工作表缓存: %s - %s", file_path, sheet_name)
+        return ColumnStore.from_frame(frame), merged_cells
+
+    def put(self, file_path: str, sheet_name: str, store: ColumnStore,
+            merged_cells: List[Tuple[Tuple[int, int], Tuple[int, int]]]):
+        """写入工作表缓存，同一工作表的旧版本条目会被替换"""
+        key = self.make_key(file_path, sheet_name)
+        data_path, merged_path = self._entry_paths(key)
+        abs_path = os.path.abspath(file_path)
+
+        # 预取和前台加载可能同时写入同一工作表，各自写入唯一的临时文件再替换
+        frame = store.to_frame()
+        _write_atomic(data_path, lambda path: frame.write_ipc(path, compression="uncompressed"))
+        _write_atomic(merged_path, lambda path: _write_json(path, merged_cells))
+
+        with self._lock:
+            stale_keys = [
+                old_key for old_key, entry in self._index.items()
+                if old_key != key and entry["file_path"] == abs_path and entry["sheet_name"] == sheet_name
+            ]
+            for old_key in stale_keys:
+                self._remove_entry(old_key)
+
+            self._index[key] = {
+                "file_path": abs_path,
+                "sheet_name": sheet_name,
+                "size": os.path.getsize(data_path) + os.path.getsize(merged_path),
+                "last_access": time(),
+            }
+            self._evict()
+            self._save_index()
+        logger.info("已缓存工作表: %s - %s", file_path, sheet_name)
+
+    def _remove_entry(self, key: str):
+        self._index.pop(key, None)
+        for path in self._entry_paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        """总大小超过上限时，按最后访问时间从旧到新淘汰条目"""
+        total = sum(entry["size"] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= entry["size"]
+            self._remove_entry(key)
+            logger.info("淘汰工作表缓存: %s - %s", entry['file_path'], entry['sheet_name'])
+
+    def total_size(self) -> int:
+        """缓存当前占用的字节数"""
+        with self._lock:
+            return sum(entry["size"] for entry in self._index.values())
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            for key in list(self._index):
+                self._remove_entry(key)
+            self._save_index()
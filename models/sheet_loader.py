@@ -0,0 +1,314 @@
+from PyQt6.QtCore import QObject, QRunnable, QThread, QThreadPool, pyqtSignal
+from typing import List
+from models.timer import PerformanceTimer
+from models.column_store import ColumnStore
+from models.row_source import SheetRowSource
+from models.table_model import TableModel
+import logging
+import traceback
+
+logger = logging.getLogger(__name__)
+
+class SheetLoadSignals(QObject):
+    """后台加载任务的信号，所有信号都携带加载代号用于丢弃过期结果"""
+    first_batch_ready = pyqtSignal(int, object, object)  # 代号, 首批数据（ColumnStore）, 合并单元格信息
+    rows_ready = pyqtSignal(int, object)  # 代号, 后续数据（ColumnStore）
+    source_ready = pyqtSignal(int, object, object, object)  # 代号, 行数据源（虚拟化模式）, 合并单元格信息, 首个数据块
+    finished = pyqtSignal(int, int)  # 代号, 总行数
+    failed = pyqtSignal(int, str)  # 代号, 错误信息
+
+class SheetLoadTask(QRunnable):
+    """在线程池中解码工作表，并按批次把数据转换为列式存储后发送回 GUI 线程"""
+
+    def __init__(self, processor, sheet_index: int, generation: int, signals: SheetLoadSignals,
+                 first_batch_size: int = 200, batch_size: int = 5000, virtual_row_threshold: int = 200000):
+        """
+        Args:
+            processor: ExcelProcessor 实例
+            sheet_index: 工作表索引
+            generation: 加载代号
+            signals: 用于发送结果的信号对象（需在 GUI 线程中创建）
+            first_batch_size: 首批行数，足够填满首屏即可
+            batch_size: 后续每批的行数
+            virtual_row_threshold: 行数超过该值时不再整体加载，改为虚拟化模式按需读取
+        """
+        super().__init__()
+        self.processor = processor
+        self.sheet_index = sheet_index
+        self.generation = generation
+        self.signals = signals
+        self.first_batch_size = first_batch_size
+        self.batch_size = batch_size
+        self.virtual_row_threshold = virtual_row_threshold
+        self._cancelled = False
+
+    def cancel(self):
+        """取消任务，任务会在处理下一批数据前退出"""
+        self._cancelled = True
+
+    def run(self):
+        # 登记为前台加载，预取任务会跳过该工作表
+        self.processor.begin_sheet_load(self.sheet_index)
+        try:
+            self._load()
+        finally:
+            self.processor.end_sheet_load(self.sheet_index)
+
+    def _load(self):
+        try:
+            with PerformanceTimer("后台加载工作表", str(self.sheet_index)) as timer:
+                # 文件未变化时直接使用磁盘缓存，跳过解析
+                cached = self.processor.load_cached_sheet(self.sheet_index)
+                if cached is not None:
+                    store, merged_cells = cached
+                    timer.add("rows", store.row_count)
+                    timer.add("cache_hits")
+                    self.signals.first_batch_ready.emit(self.generation, store, merged_cells)
+                    self.signals.finished.emit(self.generation, store.row_count)
+                    return
+
+                with PerformanceTimer("解码工作表"):
+                    _, sheet_data, merged_cells = self.processor.open_sheet(self.sheet_index)
+                if self._cancelled:
+                    return
+
+                # 超大工作表交给模型按块读取，避免一次性物化全部行
+                source = SheetRowSource(sheet_data)
+                if source.row_count > self.virtual_row_threshold:
+                    logger.info("工作表 %s 共 %d 行，使用虚拟化模式", self.sheet_index, source.row_count)
+                    # 首个数据块在后台线程中读取，首屏和列宽估算不需要等待模型读取
+                    first_block = ColumnStore.from_rows(source.read_rows(0, TableModel.BLOCK_SIZE))
+                    self.signals.source_ready.emit(self.generation, source, merged_cells, first_block)
+                    self.signals.finished.emit(self.generation, source.row_count)
+                    return
+
+                total_rows = 0
+                full_store = ColumnStore()  # 与模型共享数据块，用于加载完成后写入缓存
+                batches = self.processor.iter_sheet_rows(
+                    sheet_data, self.batch_size, self.first_batch_size
+                )
+                for rows in batches:
+                    if self._cancelled:
+                        logger.info("工作表 %s 的加载已取消", self.sheet_index)
+                        return
+                    # 行转列在后台线程完成，GUI 线程只负责追加
+                    store = ColumnStore.from_rows(rows)
+                    full_store.append(store)
+                    if total_rows == 0:
+                        self.signals.first_batch_ready.emit(self.generation, store, merged_cells)
+                    else:
+                        self.signals.rows_ready.emit(self.generation, store)
+                    total_rows += len(rows)
+
+                if total_rows == 0:
+                    self.signals.first_batch_ready.emit(self.generation, ColumnStore(), merged_cells)
+                self.signals.finished.emit(self.generation, total_rows)
+                timer.add("rows", total_rows)
+                timer.add("cells", total_rows * full_store.column_count)
+
+                # 合并数据块后写入缓存，下次打开时可直接内存映射
+                if total_rows:
+                    try:
+                        full_store.rechunk()
+                        self.processor.store_cached_sheet(self.sheet_index, full_store, merged_cells)
+                    except Exception as e:
+                        logger.warning(f"写入工作表缓存失败：{str(e)}")
+        except Exception as e:
+            logger.error(f"后台加载工作表失败：{str(e)}\n{traceback.format_exc()}")
+            self.signals.failed.emit(self.generation, str(e))
+
+class SheetLoader(QObject):
+    """工作表后台加载器
+
+    每次调用 load 都会取消仍在进行中的加载，过期任务发出的结果会被丢弃，
+    因此快速切换工作表时只有最后一次请求的数据会进入模型。
+    """
+    first_batch_ready = pyqtSignal(object, object)  # 首批数据（ColumnStore）, 合并单元格信息
+    rows_ready = pyqtSignal(object)  # 后续数据（ColumnStore）
+    source_ready = pyqtSignal(object, object, object)  # 行数据源（虚拟化模式）, 合并单元格信息, 首个数据块
+    load_finished = pyqtSignal(int, int)  # 工作表索引, 总行数
+    load_failed = pyqtSignal(str)  # 错误信息
+
+    def __init__(self, processor, parent=None):
+        super().__init__(parent)
+        self.processor = processor
+        self.thread_pool = QThreadPool.globalInstance()
+        self._generation = 0
+        self._current_task = None
+        self._current_sheet = -1
+
+        self._signals = SheetLoadSignals()
+        self._signals.first_batch_ready.connect(self._on_first_batch_ready)
+        self._signals.rows_ready.connect(self._on_rows_ready)
+        self._signals.source_ready.connect(self._on_source_ready)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def load(self, sheet_index: int):
+        """开始在后台加载指定工作表"""
+        self.cancel()
+        self._generation += 1
+        self._current_sheet = sheet_index
+        self._current_task = SheetLoadTask(
+            self.processor, sheet_index, self._generation, self._signals
+        )
+        self.thread_pool.start(self._current_task)
+
+    def cancel(self):
+        """取消当前加载"""
+        if self._current_task:
+            self._current_task.cancel()
+            self._current_task = None
+        # 让已经排队的过期信号全部失效
+        self._generation += 1
+
+    def is_loading(self) -> bool:
+        """是否有正在进行的加载"""
+        return self._current_task is not None
+
+    def _on_first_batch_ready(self, generation, rows, merged_cells):
+        if generation == self._generation:
+            self.first_batch_ready.emit(rows, merged_cells)
+
+    def _on_rows_ready(self, generation, rows):
+        if generation == self._generation:
+            self.rows_ready.emit(rows)
+
+    def _on_source_ready(self, generation, source, merged_cells, first_block):
+        if generation == self._generation:
+            self.source_ready.emit(source, merged_cells, first_block)
+
+    def _on_finished(self, generation, total_rows):
+        if generation == self._generation:
+            self._current_task = None
+            self.load_finished.emit(self._current_sheet, total_rows)
+
+    def _on_failed(self, generation, error_msg):
+        if generation == self._generation:
+            self._current_task = None
+            self.load_failed.emit(error_msg)
+
+class SheetPrefetchTask(QRunnable):
+    """以低优先级依次解码多个工作表并放入处理器的缓存，不向界面发送数据
+
+    每个工作表使用单独打开的工作簿句柄在锁外解码，不会阻塞前台加载；
+    前台正在加载的工作表会被跳过，解码过程中前台开始加载同一工作表时放弃预取。
+    """
+
+    def __init__(self, processor, sheet_indexes: List[int], batch_size: int = 5000,
+                 virtual_row_threshold: int = 200000):
+        """
+        Args:
+            processor: ExcelProcessor 实例
+            sheet_indexes: 需要预取的工作表索引，按顺序处理
+            batch_size: 解码时每批的行数
+            virtual_row_threshold: 行数超过该值的工作表会以虚拟化模式显示，不预取
+        """
+        super().__init__()
+        self.processor = processor
+        self.sheet_indexes = sheet_indexes
+        self.batch_size = batch_size
+        self.virtual_row_threshold = virtual_row_threshold
+        self._cancelled = False
+
+    def cancel(self):
+        """取消预取，任务会在处理下一批数据前退出"""
+        self._cancelled = True
+
+    def run(self):
+        thread = QThread.currentThread()
+        thread.setPriority(QThread.Priority.LowPriority)
+        try:
+            for sheet_index in self.sheet_indexes:
+                if self._cancelled:
+                    return
+                self._prefetch(sheet_index)
+        except Exception as e:
+            # 预取失败不影响正常加载，切换到该工作表时会重新解析
+            if not self._cancelled:
+                logger.warning(f"预取工作表失败：{str(e)}")
+        finally:
+            # 线程池会复用线程，恢复默认优先级
+            thread.setPriority(QThread.Priority.NormalPriority)
+
+    def _should_stop(self, sheet_index: int) -> bool:
+        """预取被取消，或前台开始加载该工作表"""
+        if self._cancelled:
+            logger.info("工作表 %s 的预取已取消", sheet_index)
+            return True
+        if self.processor.is_sheet_loading(sheet_index):
+            logger.info("工作表 %s 正在前台加载，放弃预取", sheet_index)
+            return True
+        return False
+
+    def _prefetch(self, sheet_index: int):
+        if self.processor.is_sheet_loading(sheet_index) or self.processor.is_sheet_cached(sheet_index):
+            return
+        # 磁盘缓存命中时会同时放入内存缓存
+        if self.processor.load_cached_sheet(sheet_index) is not None:
+            return
+
+        with PerformanceTimer("预取工作表", str(sheet_index)) as timer:
+            _, sheet_data, merged_cells = self.processor.open_sheet(sheet_index, dedicated_handle=True)
+            if self._should_stop(sheet_index):
+                return
+            start = sheet_data.start
+            if start is not None and start[0] + sheet_data.height > self.virtual_row_threshold:
+                logger.info("工作表 %s 行数过多，跳过预取", sheet_index)
+                return
+
+            store = ColumnStore()
+            for rows in self.processor.iter_sheet_rows(sheet_data, self.batch_size):
+                if self._should_stop(sheet_index):
+                    return
+                store.append(ColumnStore.from_rows(rows))
+            store.rechunk()
+            if self._should_stop(sheet_index):
+                return
+            timer.add("rows", store.row_count)
+            timer.add("bytes", store.estimated_size())
+            self.processor.store_cached_sheet(sheet_index, store, merged_cells)
+            logger.info("已预取工作表 %s，共 %d 行", sheet_index, store.row_count)
+
+class SheetPrefetcher(QObject):
+    """相邻工作表预取器
+
+    当前工作表显示后，在后台以低优先级解码后面的若干个工作表，
+    用户切换到这些工作表时 SheetLoadTask 可以直接命中内存缓存。
+    """
+    # 线程池任务优先级，低于前台加载任务
+    PREFETCH_PRIORITY = -1
+
+    def __init__(self, processor, prefetch_count: int = 2, parent=None):
+        """
+        Args:
+            processor: ExcelProcessor 实例
+            prefetch_count: 每次预取的工作表数量
+        """
+        super().__init__(parent)
+        self.processor = processor
+        self.prefetch_count = prefetch_count
+        self.thread_pool = QThreadPool.globalInstance()
+        self._current_task = None
+
+    def prefetch_after(self, sheet_index: int):
+        """预取指定工作表之后的 prefetch_count 个工作表，取消之前未完成的预取
+
+        已缓存和前台正在加载的工作表不会预取
+        """
+        self.cancel()
+        sheet_count = len(self.processor.sheets_info)
+        indexes = [
+            idx for idx in range(sheet_index + 1, min(sheet_index + 1 + self.prefetch_count, sheet_count))
+            if not self.processor.is_sheet_cached(idx) and not self.processor.is_sheet_loading(idx)
+        ]
+        if not indexes:
+            return
+        self._current_task = SheetPrefetchTask(self.processor, indexes)
+        self.thread_pool.start(self._current_task, self.PREFETCH_PRIORITY)
+
+    def cancel(self):
+        """取消正在进行的预取，排队中的任务开始运行后立即退出"""
+        if self._current_task:
+            self._current_task.cancel()
+            self._current_task = None
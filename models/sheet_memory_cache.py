@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from typing import Optional, List, Tuple
+import logging
+import threading
+from models.column_store import ColumnStore
+
+logger = logging.getLogger(__name__)
+
+# 默认内存缓存容量上限
+DEFAULT_MEMORY_CACHE_BYTES = 512 * 1024 * 1024
+
+class SheetMemoryCache:
+    """已解码工作表的内存缓存
+
+    以工作表名称为键保存列式数据和合并单元格信息，按 ColumnStore.estimated_size
+    统计占用，总量超过上限时按 LRU 淘汰。可以在后台线程和 GUI 线程之间共享。
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES):
+        """
+        Args:
+            max_bytes: 缓存总大小上限（字节）
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # {工作表名称: (列式数据, 合并单元格信息, 大小)}
+        self._total_bytes = 0
+
+    def __contains__(self, sheet_name: str) -> bool:
+        with self._lock:
+            return sheet_name in self._entries
+
+    def get(self, sheet_name: str) -> Optional[Tuple[ColumnStore, List[Tuple[Tuple[int, int], Tuple[int, int]]]]]:
+        """读取缓存的工作表，未命中时返回 None"""
+        with self._lock:
+            entry = self._entries.get(sheet_name)
+            if entry is None:
+                return None
+            self._entries.move_to_end(sheet_name)
+        logger.info("命中工作表内存缓存: %s", sheet_name)
+        return entry[0], entry[1]
+
+    def put(self, sheet_name: str, store: ColumnStore,
+            merged_cells: List[Tuple[Tuple[int, int], Tuple[int, int]]]):
+        """写入工作表，单个工作表超过容量上限时不缓存"""
+        size = store.estimated_size()
+        if size > self.max_bytes:
+            logger.info("工作表 %s 占用 %d 字节，超过内存缓存上限，不缓存", sheet_name, size)
+            return
+        with self._lock:
+            self._remove(sheet_name)
+            self._entries[sheet_name] = (store, merged_cells, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                evicted_name, _ = next(iter(self._entries.items()))
+                self._remove(evicted_name)
+                logger.info("淘汰工作表内存缓存: %s", evicted_name)
+
+    def _remove(self, sheet_name: str):
+        entry = self._entries.pop(sheet_name, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def total_size(self) -> int:
+        """缓存当前占用的字节数"""
+        with self._lock:
+            return self._total_bytes
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
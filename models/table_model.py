@@ -1,36 +1,445 @@
-from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, pyqtSignal
 from string import ascii_uppercase
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional
+from models.column_store import ColumnStore
+from models.row_source import RowSource
+from models.merged_index import MergedRangeIndex
+from models.timer import PerformanceTimer
+from models.logging_setup import CELL_LOGGER_NAME
 import numpy as np
+import polars as pl
 import logging
 
+logger = logging.getLogger(__name__)
+cell_logger = logging.getLogger(CELL_LOGGER_NAME)
+
+# Excel 的最大列数（A..XFD）
+EXCEL_MAX_COLUMNS = 16384
+# 行号文本缓存的容量，覆盖滚动时反复绘制的可见行
+ROW_LABEL_CACHE_SIZE = 4096
+# 虚拟化模式下数据块尚未读取完成时单元格显示的内容
+BLOCK_PLACEHOLDER = "…"
+
+def _excel_column_name(column_number: int) -> str:
+    """生成Excel风格的列名（A, B, C, ..., Z, AA, AB, ...）"""
+    result = ""
+    while column_number >= 0:
+        result = ascii_uppercase[column_number % 26] + result
+        column_number = column_number // 26 - 1
+    return result
+
+# 表头每次绘制都会查询列名，预先生成全部Excel列名
+EXCEL_COLUMN_NAMES = tuple(_excel_column_name(col) for col in range(EXCEL_MAX_COLUMNS))
+
+@lru_cache(maxsize=ROW_LABEL_CACHE_SIZE)
+def _row_label(row: int) -> str:
+    """行号（从0开始）对应的表头文本"""
+    return str(row + 1)
+
+def _sort_key(series: pl.Series) -> pl.Series:
+    """排序键：Categorical 列换算为按文本排序的整数名次
+
+    只对去重后的少量文本排序，再把每行的编码映射为名次，比直接对文本排序快一个数量级。
+    空单元格（null 编码）不参与映射，名次保持为 null，排序时排在最后。
+    """
+    if series.dtype != pl.Categorical:
+        return series
+    codes = series.to_physical()
+    first = codes.arg_unique()
+    unique_codes = codes.gather(first)
+    present = unique_codes.is_not_null()
+    ranks = series.gather(first).filter(present).cast(pl.String).rank("dense").cast(pl.UInt32)
+    return codes.replace_strict(unique_codes.filter(present), ranks, default=None, return_dtype=pl.UInt32)
+
+def _contains_mask(series: pl.Series, text: str) -> pl.Series:
+    """不区分大小写的包含筛选，Categorical 列只对去重后的文本做匹配"""
+    def contains(values: pl.Series) -> pl.Series:
+        return values.cast(pl.String).str.to_lowercase().str.contains(text.lower(), literal=True).fill_null(False)
+
+    if series.dtype != pl.Categorical:
+        return contains(series)
+    codes = series.to_physical()
+    first = codes.arg_unique()
+    matched = codes.gather(first).filter(contains(series.gather(first)))
+    return codes.is_in(matched).fill_null(False)
+
+class BlockFetchSignals(QObject):
+    """块读取任务的信号，携带数据源代号用于丢弃过期结果"""
+    block_ready = pyqtSignal(int, int, object)  # 代号, 块序号, ColumnStore
+    block_failed = pyqtSignal(int, int, str)  # 代号, 块序号, 错误信息
+
+class BlockFetchTask(QRunnable):
+    """在后台线程中从数据源读取一个数据块并转换为列式存储"""
+
+    def __init__(self, source: RowSource, block_index: int, block_size: int, generation: int,
+                 signals: BlockFetchSignals):
+        super().__init__()
+        self.source = source
+        self.block_index = block_index
+        self.block_size = block_size
+        self.generation = generation
+        self.signals = signals
+        self._cancelled = False
+
+    def cancel(self):
+        """取消任务，尚未开始执行时直接跳过"""
+        self._cancelled = True
+
+    def run(self):
+        if self._cancelled:
+            return
+        try:
+            with PerformanceTimer("读取数据块", str(self.block_index)) as timer:
+                rows = self.source.read_rows(self.block_index * self.block_size, self.block_size)
+                block = ColumnStore.from_rows(rows)
+                timer.add("rows", block.row_count)
+        except Exception as e:
+            logger.error(f"读取数据块 {self.block_index} 失败：{str(e)}")
+            self.signals.block_failed.emit(self.generation, self.block_index, str(e))
+            return
+        self.signals.block_ready.emit(self.generation, self.block_index, block)
+
 class TableModel(QAbstractTableModel):
+    # 排序或筛选生效/取消时发出，视图据此移除或恢复合并单元格的跨度
+    permutationChanged = pyqtSignal(bool)
+
+    # 虚拟化模式下每个数据块的行数
+    BLOCK_SIZE = 10000
+    # 虚拟化模式下最多缓存的数据块数量，超出后按 LRU 淘汰
+    MAX_CACHED_BLOCKS = 8
 
     def __init__(self):
         super().__init__()
-        self._data = []  # 存储所有行数据
+        self._store = ColumnStore()  # 列式存储的表格数据
         self._merged_cells = []  # 存储合并单元格信息
+
+        # 虚拟化模式：数据按块从 RowSource 拉取，只保留最近使用的块。块在单线程的
+        # 线程池中读取，数据源不会被并发访问；读取完成前单元格显示占位符
+        self._source = None
+        self._blocks = OrderedDict()  # {块序号: ColumnStore}
+        self._pending_blocks = OrderedDict()  # {块序号: BlockFetchTask}，正在读取或排队的块
+        self._source_generation = 0  # 数据源代号，更换数据源后丢弃过期的块
+        self._fetched_rows = 0  # 已经暴露给视图的行数
+        self._block_pool = QThreadPool(self)
+        self._block_pool.setMaxThreadCount(1)
+        self._block_signals = BlockFetchSignals()
+        self._block_signals.block_ready.connect(self._on_block_ready)
+        self._block_signals.block_failed.connect(self._on_block_failed)
+
+        # 排序和筛选：在列式数据上整体计算出行号排列，视图的第 i 行对应源数据的 _row_map[i] 行
+        self._row_map: Optional[np.ndarray] = None
+        self._filters: Dict[int, str] = {}  # {列: 筛选文本}
+        self._sort_column = -1
+        self._sort_descending = False
+        self._merged_index: Optional[MergedRangeIndex] = None  # 排列生效时用于填充合并区域的值
+        self._filled_columns: Dict[int, pl.Series] = {}  # 合并区域填充后的列缓存
+
+        self._header_labels: Optional[List[str]] = None  # 自定义列名，未设置时使用Excel风格列名
+        self._first_row_header = False  # 是否使用首行的值作为列名
+        self._first_row_labels: Optional[List[str]] = None  # 首行列名缓存，数据变化时失效
     
     def rowCount(self, parent=QModelIndex()):
-        return len(self._data)
+        if self._source is not None:
+            return self._fetched_rows
+        if self._row_map is not None:
+            return len(self._row_map)
+        return self._store.row_count
     
     def columnCount(self, parent=QModelIndex()):
-        return len(self._data[0]) if self._data else 0
+        if self._source is not None:
+            return self._source.column_count
+        return self._store.column_count
     
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         if not index.isValid():
             return None
         
         if role == Qt.ItemDataRole.DisplayRole:
-            return self._data[index.row()][index.column()]  
+            if self._source is not None:
+                value = self._get_virtual_value(index.row(), index.column())
+            elif self._row_map is not None:
+                value = self._get_mapped_value(index.row(), index.column())
+            else:
+                value = self._store.value(index.row(), index.column())
+            return "" if value is None else value
         return None
 
+    def _get_mapped_value(self, row: int, col: int):
+        """排列生效时读取单元格的值，合并区域内的单元格显示区域左上角的值"""
+        source_row = int(self._row_map[row])
+        merged = self._merged_index.find(source_row, col) if self._merged_index else None
+        if merged is not None:
+            source_row, col = merged[0], merged[1]
+        return self._store.value(source_row, col)
+
+    def mapToSource(self, row: int) -> int:
+        """视图中的行号对应的源数据行号"""
+        return int(self._row_map[row]) if self._row_map is not None else row
+
+    def hasPermutation(self) -> bool:
+        """是否有排序或筛选生效"""
+        return self._row_map is not None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """按列排序，列号小于0时取消排序。由 QTableView 在点击表头时调用"""
+        if self._source is not None:
+            logger.warning("虚拟化模式下不支持排序")
+            return
+        self._sort_column = column if 0 <= column < self._store.column_count else -1
+        self._sort_descending = order == Qt.SortOrder.DescendingOrder
+        self._update_permutation()
+
+    def setFilter(self, column: int, text: str):
+        """按列筛选包含指定文本的行（不区分大小写），文本为空时取消该列的筛选"""
+        if self._source is not None:
+            logger.warning("虚拟化模式下不支持筛选")
+            return
+        if text:
+            self._filters[column] = text
+        else:
+            self._filters.pop(column, None)
+        self._update_permutation()
+
+    def filters(self) -> Dict[int, str]:
+        """当前生效的筛选条件"""
+        return dict(self._filters)
+
+    def clearFilters(self):
+        """取消所有筛选"""
+        self._filters.clear()
+        self._update_permutation()
+
+    def clearPermutation(self):
+        """取消排序和筛选，恢复源数据的行顺序"""
+        self._filters.clear()
+        self._sort_column = -1
+        self._update_permutation()
+
+    def _filled_column(self, col: int) -> pl.Series:
+        """合并区域内的单元格填充为左上角的值后的列，用于排序和筛选"""
+        series = self._filled_columns.get(col)
+        if series is None:
+            series = self._store.column(col)
+            row_count = self._store.row_count
+            ranges = self._merged_index.query(0, row_count - 1, col, col) if self._merged_index else []
+            if ranges:
+                # 每一行取值的来源单元格，合并区域内的行指向区域左上角
+                source_rows = np.arange(row_count)
+                source_cols = np.full(row_count, col)
+                for start_row, start_col, end_row, end_col in ranges:
+                    covered = slice(max(start_row, 0), min(end_row, row_count - 1) + 1)
+                    source_rows[covered] = start_row
+                    source_cols[covered] = start_col
+                # 同一列内的合并区域一次 gather 完成
+                series = series.gather(source_rows)
+                # 左上角在其他列的区域按来源列分组，每个来源列 scatter 一次
+                for source_col in np.unique(source_cols[source_cols != col]):
+                    rows = np.flatnonzero(source_cols == source_col)
+                    values = self._store.column(int(source_col)).gather(source_rows[rows])
+                    series = series.scatter(rows, values.cast(series.dtype, strict=False))
+            self._filled_columns[col] = series
+        return series
+
+    def _update_permutation(self):
+        """根据筛选条件和排序列重新计算行号排列
+
+        筛选和排序都在 Polars 列上整体完成，不逐行调用 data()。
+        """
+        was_active = self._row_map is not None
+        if not was_active and not self._filters and self._sort_column < 0:
+            # 没有排列需要取消（如 setSortingEnabled 触发的 sort(-1)），不重置视图
+            return
+        self.beginResetModel()
+        if not self._filters and self._sort_column < 0:
+            self._row_map = None
+            self._merged_index = None
+            self._filled_columns.clear()
+        else:
+            with PerformanceTimer("计算排序和筛选"):
+                if self._merged_index is None:
+                    self._merged_index = MergedRangeIndex()
+                    for start_pos, end_pos in self._merged_cells:
+                        self._merged_index.add(start_pos, end_pos)
+
+                first_row = 1 if self._first_row_header else 0
+                indices = pl.Series("index", np.arange(first_row, self._store.row_count, dtype=np.int64))
+                for col, text in self._filters.items():
+                    if col >= self._store.column_count:
+                        continue
+                    mask = _contains_mask(self._filled_column(col), text)
+                    indices = indices.filter(mask.gather(indices))
+
+                if self._sort_column >= 0:
+                    keys = _sort_key(self._filled_column(self._sort_column))
+                    order = keys.gather(indices).arg_sort(descending=self._sort_descending, nulls_last=True)
+                    indices = indices.gather(order)
+
+                self._row_map = indices.to_numpy()
+            logger.info("排序/筛选后显示 %d / %d 行", len(self._row_map), self._store.row_count)
+        self.endResetModel()
+        if was_active != (self._row_map is not None):
+            self.permutationChanged.emit(self._row_map is not None)
+
+    def _reset_permutation(self):
+        """数据变化时丢弃排列，调用方负责重置模型"""
+        was_active = self._row_map is not None
+        self._row_map = None
+        self._filters.clear()
+        self._sort_column = -1
+        self._merged_index = None
+        self._filled_columns.clear()
+        return was_active
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """虚拟化模式下，视图滚动到末尾时是否还有更多行"""
+        if parent.isValid() or self._source is None:
+            return False
+        return self._fetched_rows < self._source.row_count
+
+    def fetchMore(self, parent=QModelIndex()):
+        """向视图暴露下一块行数据，实际数据在绘制时才按块读取"""
+        if not self.canFetchMore(parent):
+            return
+        count = min(self.BLOCK_SIZE, self._source.row_count - self._fetched_rows)
+        self.beginInsertRows(QModelIndex(), self._fetched_rows, self._fetched_rows + count - 1)
+        self._fetched_rows += count
+        self.endInsertRows()
+
+    def _get_virtual_value(self, row: int, col: int):
+        """从块缓存中读取单元格的值，块尚未读取时返回占位符并在后台读取"""
+        block = self._get_block(row // self.BLOCK_SIZE)
+        if block is None:
+            return BLOCK_PLACEHOLDER
+        offset = row % self.BLOCK_SIZE
+        if offset >= block.row_count or col >= block.column_count:
+            return None
+        return block.value(offset, col)
+
+    def _get_block(self, block_index: int) -> Optional[ColumnStore]:
+        """读取缓存的数据块，未缓存时提交后台读取并返回 None"""
+        block = self._blocks.get(block_index)
+        if block is not None:
+            self._blocks.move_to_end(block_index)
+            return block
+        self._request_block(block_index)
+        return None
+
+    def _request_block(self, block_index: int):
+        """提交块读取任务，排队的任务超过缓存容量时取消最早的请求（已滚出视口）"""
+        if block_index in self._pending_blocks:
+            self._pending_blocks.move_to_end(block_index)
+            return
+        task = BlockFetchTask(self._source, block_index, self.BLOCK_SIZE, self._source_generation,
+                              self._block_signals)
+        self._pending_blocks[block_index] = task
+        self._block_pool.start(task)
+        while len(self._pending_blocks) > self.MAX_CACHED_BLOCKS:
+            _, stale = self._pending_blocks.popitem(last=False)
+            stale.cancel()
+
+    def _cache_block(self, block_index: int, block: ColumnStore):
+        self._blocks[block_index] = block
+        self._blocks.move_to_end(block_index)
+        while len(self._blocks) > self.MAX_CACHED_BLOCKS:
+            self._blocks.popitem(last=False)
+
+    def _on_block_ready(self, generation: int, block_index: int, block: ColumnStore):
+        """数据块读取完成，刷新该块中已经暴露给视图的行"""
+        if generation != self._source_generation:
+            return
+        self._pending_blocks.pop(block_index, None)
+        self._cache_block(block_index, block)
+        first = block_index * self.BLOCK_SIZE
+        last = min(first + self.BLOCK_SIZE, self._fetched_rows) - 1
+        if last >= first and self.columnCount():
+            self.dataChanged.emit(self.index(first, 0), self.index(last, self.columnCount() - 1))
+        if block_index == 0 and self._first_row_header:
+            self._first_row_labels = None
+            self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.columnCount() - 1)
+
+    def _on_block_failed(self, generation: int, block_index: int, error_msg: str):
+        if generation == self._source_generation:
+            # 不缓存失败结果，再次绘制时会重新读取
+            self._pending_blocks.pop(block_index, None)
+
+    def _release_source(self):
+        self._source_generation += 1
+        for task in self._pending_blocks.values():
+            task.cancel()
+        self._pending_blocks.clear()
+        if self._source is not None:
+            # 在块读取线程中关闭，等待正在进行的读取结束
+            self._block_pool.start(self._source.close)
+        self._source = None
+        self._blocks.clear()
+        self._fetched_rows = 0
+
+    def releaseSource(self):
+        """释放虚拟化模式的数据源（工作簿或数据库连接）并取消未完成的块读取
+
+        关闭文档时调用，数据源在块读取线程中关闭，调用后等待关闭完成。
+        """
+        if self._source is None and not self._pending_blocks:
+            return
+        self.beginResetModel()
+        self._release_source()
+        self.endResetModel()
+        self._block_pool.waitForDone()
+
+    def setSource(self, source: RowSource, merged_cells=None, first_block: Optional[ColumnStore] = None):
+        """以虚拟化模式显示数据源，行数据随滚动按块在后台读取
+
+        Args:
+            source: 行数据源
+            merged_cells: 合并单元格信息
+            first_block: 已经读取的第一个数据块，用于立即显示首屏和估算列宽
+        """
+        self.beginResetModel()
+        permutation_cleared = self._reset_permutation()
+        self._first_row_labels = None
+        self._release_source()
+        self._store = ColumnStore()
+        self._source = source
+        self._fetched_rows = min(self.BLOCK_SIZE, source.row_count)
+        if first_block is not None:
+            self._cache_block(0, first_block)
+        elif source.row_count:
+            self._request_block(0)
+        if merged_cells is not None:
+            self._merged_cells = merged_cells
+        self.endResetModel()
+        if permutation_cleared:
+            self.permutationChanged.emit(False)
+        return True
+
+    def isVirtual(self) -> bool:
+        """是否处于虚拟化模式"""
+        return self._source is not None
+
     def _get_excel_column_name(self, column_number: int) -> str:
-        """生成Excel风格的列名（A, B, C, ..., Z, AA, AB, ...）"""
-        result = ""
-        while column_number >= 0:
-            result = ascii_uppercase[column_number % 26] + result
-            column_number = column_number // 26 - 1
-        return result
+        """获取Excel风格的列名（A, B, C, ..., Z, AA, AB, ...）"""
+        if column_number < EXCEL_MAX_COLUMNS:
+            return EXCEL_COLUMN_NAMES[column_number]
+        return _excel_column_name(column_number)
+
+    def _get_first_row_labels(self) -> List[str]:
+        """首行的值转换成的列名，空单元格使用Excel风格列名"""
+        if self._first_row_labels is None:
+            if self._source is not None:
+                block = self._get_block(0) if self._source.row_count else None
+                if block is None:
+                    # 第一个数据块尚未读取，先使用Excel风格列名，读取完成后刷新表头
+                    return []
+                values = block.row(0)
+            else:
+                values = self._store.row(0) if self._store.row_count else []
+            self._first_row_labels = [
+                self._get_excel_column_name(col) if value is None or value == "" else str(value)
+                for col, value in enumerate(values)
+            ]
+        return self._first_row_labels
 
     def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
         """
@@ -41,12 +450,42 @@ class TableModel(QAbstractTableModel):
         """
         if role == Qt.ItemDataRole.DisplayRole:
             if orientation == Qt.Orientation.Horizontal:
+                if self._header_labels is not None and section < len(self._header_labels):
+                    return self._header_labels[section]
+                if self._first_row_header:
+                    labels = self._get_first_row_labels()
+                    if section < len(labels):
+                        return labels[section]
                 # 使用Excel风格的列名（A, B, C, ...）
                 return self._get_excel_column_name(section)
             else:
-                return str(section + 1)
+                # 排序或筛选后仍显示源数据的行号
+                return _row_label(self.mapToSource(section))
         return None
-        
+
+    def setFirstRowAsHeader(self, enabled: bool):
+        """切换使用首行的值或Excel风格列名作为列名
+
+        两种列名都有缓存，切换时只通知表头刷新。排序和筛选时首行不参与排列。
+        """
+        if enabled == self._first_row_header:
+            return
+        self._first_row_header = enabled
+        if self.columnCount():
+            self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.columnCount() - 1)
+        if self._row_map is not None:
+            self._update_permutation()
+
+    def firstRowAsHeader(self) -> bool:
+        """是否使用首行的值作为列名"""
+        return self._first_row_header
+
+    def setHeaderLabels(self, labels: Optional[List[str]]):
+        """设置列名，例如查询结果的字段名；传入 None 时恢复Excel风格列名"""
+        self._header_labels = list(labels) if labels is not None else None
+        if self.columnCount():
+            self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.columnCount() - 1)
+
     def flags(self, index):
         """
         获取单元格标志
@@ -58,11 +497,49 @@ class TableModel(QAbstractTableModel):
         return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
 
     def setData(self, data, merged_cells=None):
-        """设置表格数据和合并单元格信息"""
+        """设置表格数据和合并单元格信息
+
+        Args:
+            data: ColumnStore 或行数据列表
+            merged_cells: 合并单元格信息
+        """
         self.beginResetModel()
-        self._data = data
+        permutation_cleared = self._reset_permutation()
+        self._first_row_labels = None
+        self._release_source()
+        self._store = data if isinstance(data, ColumnStore) else ColumnStore.from_rows(data)
         if merged_cells is not None:
             self._merged_cells = merged_cells
-            logging.info(f"TableModel设置合并单元格: {merged_cells}")
+            cell_logger.debug("TableModel设置合并单元格: %s", merged_cells)
         self.endResetModel()
+        if permutation_cleared:
+            self.permutationChanged.emit(False)
         return True
+
+    def appendRows(self, rows):
+        """在表格末尾追加行数据，用于后台加载时逐批填充模型
+
+        Args:
+            rows: ColumnStore 或行数据列表
+        """
+        store = rows if isinstance(rows, ColumnStore) else ColumnStore.from_rows(rows)
+        if store.row_count == 0:
+            return
+        if self._row_map is not None:
+            # 加载过程中不维护排列，追加前恢复源数据顺序
+            self.clearPermutation()
+        if store.column_count > self._store.column_count:
+            # 新批次比现有数据更宽时先插入列
+            self.beginInsertColumns(QModelIndex(), self._store.column_count, store.column_count - 1)
+            self._store.widen(store.column_count)
+            self.endInsertColumns()
+        first = self._store.row_count
+        if first == 0:
+            self._first_row_labels = None
+        self.beginInsertRows(QModelIndex(), first, first + store.row_count - 1)
+        self._store.append(store)
+        self.endInsertRows()
+
+    def store(self) -> ColumnStore:
+        """获取模型的列式存储"""
+        return self._store
@@ -1,49 +1,214 @@
 from time import perf_counter
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, List, Any
+from collections import deque
+from itertools import count
+import json
+import math
 import logging
+import threading
 from functools import wraps
 
+logger = logging.getLogger(__name__)
+
+# 每个计时器保留的最近样本数，用于计算分位数
+MAX_SAMPLES = 2048
+# 保留的最近操作（顶层计时区间）数量
+MAX_TRACES = 50
+
+# 区间编号，进程内唯一，界面据此判断哪些操作是新增的
+_span_ids = count(1)
+
+class Span:
+    """一次计时区间，嵌套的计时器构成区间树"""
+
+    def __init__(self, name: str, detail: Optional[str] = None):
+        self.id = next(_span_ids)
+        self.name = name
+        self.detail = detail
+        self.start = perf_counter()
+        self.duration = 0.0
+        self.counters: Dict[str, float] = {}
+        self.children: List["Span"] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "detail": self.detail,
+            "duration": self.duration,
+            "counters": dict(self.counters),
+            "children": [child.to_dict() for child in self.children],
+        }
+
+class Histogram:
+    """计时器的耗时分布：总次数、总耗时和最大值精确统计，分位数按最近的样本计算"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples = deque(maxlen=MAX_SAMPLES)
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> float:
+        """最近样本的分位数（最近秩法）"""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+class MetricsRegistry:
+    """性能指标注册表
+
+    按计时器名称汇总耗时分布和计数器，并按线程维护当前的计时区间栈：
+    在一个计时器内部启动的计时器成为它的子区间，顶层区间结束时整棵树
+    保存到最近操作列表中。可以在任意线程中使用。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, float] = {}
+        self._traces = deque(maxlen=MAX_TRACES)
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin_span(self, name: str, detail: Optional[str] = None) -> Span:
+        span = Span(name, detail)
+        stack = self._stack()
+        if stack:
+            stack[-1].children.append(span)
+        stack.append(span)
+        return span
+
+    def end_span(self, span: Span, duration: float):
+        span.duration = duration
+        stack = self._stack()
+        if span in stack:
+            # 异常退出时可能有未结束的子区间，一并出栈
+            del stack[stack.index(span):]
+        with self._lock:
+            self._histograms.setdefault(span.name, Histogram()).record(duration)
+            if not stack:
+                self._traces.append(span)
+
+    def current_span(self) -> Optional[Span]:
+        """当前线程中正在计时的区间"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def add(self, counter: str, value: float = 1, span: Optional[Span] = None):
+        """累加计数器（如行数、单元格数、字节数），同时记录到指定区间，默认为当前区间"""
+        span = span or self.current_span()
+        if span is not None:
+            span.counters[counter] = span.counters.get(counter, 0) + value
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前指标的快照：耗时分布、计数器和最近操作的区间树"""
+        with self._lock:
+            return {
+                "timers": {name: histogram.to_dict() for name, histogram in self._histograms.items()},
+                "counters": dict(self._counters),
+                "traces": [span.to_dict() for span in self._traces],
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=indent)
+
+    def export_json(self, path: str):
+        """把指标快照导出为 JSON 文件"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def reset(self):
+        """清空已收集的指标"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._traces.clear()
+
+# 全局指标注册表
+metrics = MetricsRegistry()
+
 class PerformanceTimer:
-    """性能计时器类"""
-    
-    def __init__(self, name: Optional[str] = None):
+    """性能计时器类
+
+    作为上下文管理器使用时，耗时会记录到全局指标注册表中同名计时器的分布里，
+    嵌套使用时构成区间树。名称应当固定，变化的部分（工作表序号等）放在 detail 中。
+    """
+
+    def __init__(self, name: Optional[str] = None, detail: Optional[str] = None):
         self.name = name
+        self.detail = detail
         self.start_time: float = 0
         self.end_time: float = 0
-        
+        self._span: Optional[Span] = None
+
     def start(self) -> None:
         """开始计时"""
         self.start_time = perf_counter()
-        
+
     def stop(self) -> float:
         """停止计时并返回执行时间"""
         self.end_time = perf_counter()
         return self.duration
-        
+
     @property
     def duration(self) -> float:
         """获取执行时间（秒）"""
         return self.end_time - self.start_time
-    
+
+    def add(self, counter: str, value: float = 1):
+        """为这个计时区间累加计数器，如 rows、cells、bytes"""
+        metrics.add(counter, value, self._span)
+
     def __enter__(self):
         """上下文管理器入口"""
+        if self.name:
+            self._span = metrics.begin_span(self.name, self.detail)
         self.start()
         return self
-        
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """上下文管理器出口"""
         self.stop()
         if self.name:
+            metrics.end_span(self._span, self.duration)
             self._log_performance()
-            
+
     def _log_performance(self):
         """记录性能日志"""
-        logging.info(f"{self.name} - 执行耗时: {self.duration:.4f} 秒")
-    
+        name = f"{self.name} {self.detail}" if self.detail else self.name
+        logger.info(f"{name} - 执行耗时: {self.duration:.4f} 秒")
+
     @staticmethod
     def timer(name: Optional[str] = None) -> Callable:
         """计时器装饰器
-        
+
         Args:
             name: 自定义的方法名称，如果不提供则使用方法原名
         """
@@ -58,4 +223,4 @@ class PerformanceTimer:
         if callable(name):
             func, name = name, None
             return decorator(func)
-        return decorator
\ No newline at end of file
+        return decorator
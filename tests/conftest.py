@@ -0,0 +1,29 @@
+import os
+import sys
+import pytest
+from openpyxl import Workbook
+
+# Qt 使用 offscreen 平台，无需显示器
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 已用区域从 C3 开始：第 3 行为列名，C5:D5 合并
+OFFSET_SHEET_ROWS = [["h1", "h2"], [1, 2], [3, None], [5, "x"]]
+
+def write_offset_workbook(path: str, rows=OFFSET_SHEET_ROWS, sheet_name: str = "Sheet1") -> str:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = sheet_name
+    for row_offset, row in enumerate(rows):
+        for col_offset, value in enumerate(row):
+            if value is not None:
+                sheet.cell(row=3 + row_offset, column=3 + col_offset, value=value)
+    sheet.merge_cells("C5:D5")
+    workbook.save(path)
+    return path
+
+@pytest.fixture
+def offset_workbook(tmp_path):
+    """已用区域从 C3 开始的工作簿"""
+    return write_offset_workbook(str(tmp_path / "offset.xlsx"))
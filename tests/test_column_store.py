@@ -0,0 +1,76 @@
+from datetime import date, datetime
+import polars as pl
+from models.column_store import ColumnStore
+
+def test_from_rows_infers_native_dtypes():
+    store = ColumnStore.from_rows([
+        [1, 1.5, "a", True, datetime(2024, 1, 2), date(2024, 1, 2), ""],
+        [2, 2, "", False, None, None, ""],
+    ])
+    assert [store.column(col).dtype for col in range(store.column_count)] == [
+        pl.Int64, pl.Float64, pl.Categorical, pl.Boolean, pl.Datetime("us"), pl.Date, pl.Categorical,
+    ]
+    assert store.value(1, 1) == 2.0
+    # 空字符串保存为 null
+    assert store.value(1, 2) is None
+    assert store.row(0)[:3] == [1, 1.5, "a"]
+
+def test_from_rows_pads_short_rows():
+    store = ColumnStore.from_rows([[1], [2, "x", "y"]])
+    assert (store.row_count, store.column_count) == (2, 3)
+    assert store.row(0) == [1, None, None]
+
+def test_mixed_column_is_stored_as_text():
+    store = ColumnStore.from_rows([[1], ["a"], [2.5]])
+    assert store.column(0).dtype == pl.Categorical
+    assert store.column(0).to_list() == ["1", "a", "2.5"]
+
+def test_append_unifies_numeric_dtypes():
+    store = ColumnStore.from_rows([[1], [2]])
+    store.append(ColumnStore.from_rows([[2.5]]))
+    assert store.column(0).dtype == pl.Float64
+    assert store.column(0).to_list() == [1.0, 2.0, 2.5]
+
+def test_append_unifies_text_and_numbers():
+    store = ColumnStore.from_rows([[1]])
+    store.append(ColumnStore.from_rows([["x"]]))
+    assert store.column(0).dtype == pl.Categorical
+    assert store.column(0).to_list() == ["1", "x"]
+
+def test_append_to_all_null_column_takes_incoming_dtype():
+    store = ColumnStore.from_rows([[""], [""]])
+    store.append(ColumnStore.from_rows([[3]]))
+    assert store.column(0).dtype == pl.Int64
+    assert store.column(0).to_list() == [None, None, 3]
+
+def test_append_widens_and_pads():
+    store = ColumnStore.from_rows([[1]])
+    store.append(ColumnStore.from_rows([[2, "b"]]))
+    assert (store.row_count, store.column_count) == (2, 2)
+    assert store.row(0) == [1, None]
+    store.append(ColumnStore.from_rows([[3]]))
+    assert store.row(2) == [3, None]
+
+def test_append_to_empty_store_does_not_share_columns():
+    other = ColumnStore.from_rows([[1]])
+    store = ColumnStore()
+    store.append(other)
+    store.append(ColumnStore.from_rows([[2]]))
+    assert other.row_count == 1
+    assert other.column(0).to_list() == [1]
+
+def test_widen_and_max_text_lengths_cache():
+    store = ColumnStore.from_rows([["abc", 12345]])
+    assert store.max_text_lengths() == [3, 5]
+    store.widen(3)
+    assert store.column_count == 3
+    assert store.max_text_lengths() == [3, 5, 0]
+    store.append(ColumnStore.from_rows([["abcdef", 1, "xy"]]))
+    assert store.max_text_lengths() == [6, 5, 2]
+
+def test_frame_round_trip():
+    store = ColumnStore.from_rows([[1, "a"], [2, "b"]])
+    store.rechunk()
+    restored = ColumnStore.from_frame(store.to_frame().rename({"column_0": "x"}))
+    assert restored.row(1) == [2, "b"]
+    assert restored.column(0).name == "column_0"
@@ -0,0 +1,66 @@
+from datetime import date, datetime, time
+from models.column_types import (SQL_DATE, SQL_DATETIME, SQL_INTEGER, SQL_REAL, SQL_TEXT, SQL_TIME,
+                                 convert_row_chunks, get_column_converters, infer_column_types, sample_rows)
+
+def test_infer_column_types():
+    rows = [
+        [1, 1.5, "a", datetime(2024, 1, 1), date(2024, 1, 1), time(8, 30), "", True, 2.0],
+        [2, 2, "", date(2024, 1, 2), "", None, "", False, 3.0],
+    ]
+    assert infer_column_types(rows, 10) == [
+        SQL_INTEGER, SQL_REAL, SQL_TEXT, SQL_DATETIME, SQL_DATE, SQL_TIME, SQL_TEXT, SQL_INTEGER, SQL_INTEGER,
+        SQL_TEXT,
+    ]
+
+def test_text_wins_over_other_types():
+    assert infer_column_types([[1], ["x"], [2.5]], 1) == [SQL_TEXT]
+
+def test_sample_rows_covers_the_whole_sequence():
+    rows = list(range(10000))
+    sample = sample_rows(rows, 100)
+    assert sample[:50] == list(range(50))
+    assert sample[-1] > 9000
+    assert len(sample) <= 101
+    assert sample_rows(rows[:10], 100) == rows[:10]
+
+def convert(column_type, values):
+    (converter,) = get_column_converters([column_type])
+    return list(converter(tuple(values)))
+
+def test_number_converters():
+    assert convert(SQL_INTEGER, [1, 2.0, 2.5, "", None, True, " x "]) == [1, 2.0, 2.5, None, None, 1, "x"]
+    assert convert(SQL_REAL, [1.5, 2, "", False, datetime(2024, 1, 1, 8)]) == [1.5, 2, None, 0, "2024-01-01 08:00:00"]
+
+def test_number_column_without_conversion_is_returned_as_is():
+    (converter,) = get_column_converters([SQL_REAL])
+    values = (1, 2.5, 3)
+    assert converter(values) is values
+
+def test_text_converter():
+    assert convert(SQL_TEXT, [" a ", "b\x00c", "", 3, date(2024, 1, 2)]) == ["a", "bc", "", 3, "2024-01-02"]
+    assert convert(SQL_TEXT, [" a ", "b\x00"]) == ["a", "b"]
+    assert convert(SQL_TEXT, ["abc \x00", "\x00 d"]) == ["abc", "d"]
+    assert convert(SQL_TEXT, ["abc \x00", 1]) == ["abc", 1]
+    (converter,) = get_column_converters([SQL_TEXT])
+    values = ("a", "b")
+    assert converter(values) is values
+
+def test_temporal_converter():
+    assert convert(SQL_DATETIME, [datetime(2024, 1, 1, 8, 30), date(2024, 1, 2), "", None]) == [
+        "2024-01-01 08:30:00", "2024-01-02", None, None,
+    ]
+    assert convert(SQL_TIME, [time(8, 30)]) == ["08:30:00"]
+
+def test_convert_row_chunks():
+    rows = [[1, " a ", ""], [2.0, "b", datetime(2024, 1, 1)], [3, "c", None]]
+    chunks = list(convert_row_chunks(iter(rows), [SQL_INTEGER, SQL_TEXT, SQL_DATETIME], chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert [tuple(row) for chunk in chunks for row in chunk] == [
+        (1, "a", None), (2.0, "b", "2024-01-01 00:00:00"), (3, "c", None),
+    ]
+
+def test_convert_row_chunks_passes_through_clean_chunks():
+    chunk = [(1, "a"), (2, "b")]
+    (converted,) = convert_row_chunks(chunk, [SQL_INTEGER, SQL_TEXT])
+    assert converted == chunk
+    assert list(convert_row_chunks([], [SQL_TEXT])) == []
@@ -0,0 +1,80 @@
+import sqlite3
+import pytest
+from excel_processor import ExcelProcessor, SAVE_MODE_DIFF, SAVE_MODE_FULL, SAVE_MODE_SKIPPED
+from models.fingerprint import FingerprintBuilder, row_hash, sheet_fingerprint
+
+HEADERS = ["id", "name"]
+
+def test_row_hash_distinguishes_types():
+    assert row_hash((1, "a")) == row_hash([1, "a"])
+    assert row_hash((1, "a")) != row_hash(("1", "a"))
+
+def test_builder_matches_sheet_fingerprint():
+    hashes = [row_hash((idx, f"row{idx}")) for idx in range(10)]
+    merged = [((0, 0), (1, 1))]
+    builder = FingerprintBuilder(HEADERS, ["INTEGER", "TEXT"])
+    builder.update(hashes[:4])
+    builder.update(hashes[4:])
+    assert builder.hexdigest(merged) == sheet_fingerprint(HEADERS, ["INTEGER", "TEXT"], hashes, merged)
+    assert builder.hexdigest() != builder.hexdigest(merged)
+
+@pytest.fixture
+def processor(tmp_path):
+    return ExcelProcessor(db_path=str(tmp_path / "data.db"))
+
+def save(processor, rows, **kwargs):
+    # 以迭代器传入，覆盖按块流式比较的路径
+    return processor.save_sheet_data("book.xlsx", "Sheet1", HEADERS, iter(rows), incremental=True, **kwargs)
+
+def read_table(processor, table_name):
+    conn = sqlite3.connect(processor.db_path)
+    try:
+        rows = [list(row) for row in conn.execute(f"SELECT id, name FROM [{table_name}] ORDER BY rowid")]
+        max_rowid = conn.execute(f"SELECT MAX(rowid) FROM [{table_name}]").fetchone()[0]
+        return rows, max_rowid
+    finally:
+        conn.close()
+
+def make_rows(count):
+    return [[idx, f"row{idx}"] for idx in range(count)]
+
+def test_incremental_modes(processor):
+    rows = make_rows(12000)
+    assert save(processor, rows).mode == SAVE_MODE_FULL
+
+    result = save(processor, rows)
+    assert (result.mode, result.changed_rows) == (SAVE_MODE_SKIPPED, 0)
+
+    rows[5][1] = "changed"
+    rows[11000][1] = "changed"
+    result = save(processor, rows)
+    assert (result.mode, result.changed_rows) == (SAVE_MODE_DIFF, 2)
+    assert read_table(processor, result.table_name) == (rows, 12000)
+
+def test_incremental_append_and_truncate(processor):
+    rows = make_rows(6000)
+    save(processor, rows)
+
+    longer = rows + [[idx, "new"] for idx in range(6000, 13000)]
+    result = save(processor, longer)
+    assert (result.mode, result.changed_rows) == (SAVE_MODE_DIFF, 7000)
+    assert read_table(processor, result.table_name) == (longer, 13000)
+
+    result = save(processor, longer[:100])
+    assert (result.mode, result.changed_rows) == (SAVE_MODE_DIFF, 12900)
+    assert read_table(processor, result.table_name) == (longer[:100], 100)
+
+def test_skipped_save_updates_catalog(processor):
+    rows = make_rows(10)
+    save(processor, rows, data_origin=(0, 0))
+    result = save(processor, rows, data_origin=(2, 1))
+    assert result.mode == SAVE_MODE_SKIPPED
+    entry = processor.find_imported_sheet("book.xlsx", "Sheet1")
+    assert (entry.data_row, entry.data_col, entry.row_count) == (2, 1, 10)
+
+def test_merged_cells_change_fingerprint(processor):
+    rows = make_rows(10)
+    save(processor, rows)
+    result = save(processor, rows, merged_cells=[((0, 0), (1, 0))])
+    assert (result.mode, result.changed_rows) == (SAVE_MODE_DIFF, 0)
+    assert save(processor, rows, merged_cells=[((0, 0), (1, 0))]).mode == SAVE_MODE_SKIPPED
@@ -0,0 +1,60 @@
+import sqlite3
+from excel_processor import ExcelProcessor, decode_sheet_for_import
+from conftest import write_offset_workbook
+
+def read_table(db_path, table_name):
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(f"SELECT * FROM [{table_name}] ORDER BY rowid")
+        return [description[0] for description in cursor.description], [list(row) for row in cursor]
+    finally:
+        conn.close()
+
+def test_decode_offset_sheet_uses_first_used_row_as_header(offset_workbook):
+    sheet_name, header, frames, merged_cells, data_origin, _ = decode_sheet_for_import(offset_workbook, "Sheet1")
+    assert sheet_name == "Sheet1"
+    assert header == ["h1", "h2"]
+    assert [list(row) for frame in frames for row in frame.iter_rows()] == [[1.0, "2.0"], [3.0, None], [5.0, "x"]]
+    # 第一个数据单元格是 C4
+    assert data_origin == (3, 2)
+    assert merged_cells == [((4, 2), (4, 3))]
+
+def test_import_offset_sheet(offset_workbook, tmp_path):
+    db_path = str(tmp_path / "data.db")
+    processor = ExcelProcessor(db_path=db_path)
+    result = processor.import_workbook(offset_workbook, max_workers=1)
+    (sheet,) = result.sheets
+    assert sheet.error is None
+    columns, rows = read_table(db_path, sheet.table_name)
+    assert columns[:2] == ["h1", "h2"]
+    assert [row[:2] for row in rows] == [[1, "2.0"], [3, None], [5, "x"]]
+    entry = processor.find_imported_sheet(offset_workbook, "Sheet1")
+    assert (entry.data_row, entry.data_col, entry.row_count) == (3, 2, 3)
+
+def test_search_reports_source_cell_coordinates(offset_workbook, tmp_path):
+    processor = ExcelProcessor(db_path=str(tmp_path / "data.db"))
+    processor.import_workbook(offset_workbook, max_workers=1, index_text=True)
+    matches = {match.value: (match.row, match.column, match.column_name)
+               for match in processor.search_cells("x")}
+    # "x" 在 D6
+    assert matches == {"x": (5, 3, "h2")}
+    matches = {match.value: (match.row, match.column) for match in processor.search_cells("5")}
+    assert matches["5"] == (5, 2)
+
+def test_same_file_name_in_different_folders(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    first = write_offset_workbook(str(tmp_path / "a" / "report.xlsx"))
+    second = write_offset_workbook(str(tmp_path / "b" / "report.xlsx"),
+                                   rows=[["h1", "h2"], [7, 8], [9, None], [11, "y"]])
+    db_path = str(tmp_path / "data.db")
+    processor = ExcelProcessor(db_path=db_path)
+    processor.import_workbook(first, max_workers=1)
+    processor.import_workbook(second, max_workers=1)
+
+    first_entry = processor.find_imported_sheet(first, "Sheet1")
+    second_entry = processor.find_imported_sheet(second, "Sheet1")
+    assert first_entry.table_name != second_entry.table_name
+    assert len(processor.list_imported_sheets()) == 2
+    assert [row[0] for row in read_table(db_path, first_entry.table_name)[1]] == [1, 3, 5]
+    assert [row[0] for row in read_table(db_path, second_entry.table_name)[1]] == [7, 9, 11]
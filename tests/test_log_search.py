@@ -0,0 +1,45 @@
+from models.log_search import LogSearch
+
+LINES = ["INFO start", "ERROR disk full", "info done", "Error again"]
+
+def make_search(query="error"):
+    search = LogSearch()
+    search.set_query(query, 10, LINES)
+    return search
+
+def test_set_query_is_case_insensitive():
+    search = make_search()
+    assert len(search) == 2
+    assert 11 in search and 13 in search and 10 not in search
+    assert search.position(13) == 1
+    assert search.position(12) == -1
+
+def test_empty_query_matches_nothing():
+    search = make_search("")
+    assert len(search) == 0
+    search.add_lines(20, ["ERROR"])
+    assert len(search) == 0
+    assert search.next_match(None) is None
+    assert search.find_spans("ERROR") == []
+
+def test_add_lines_and_discard_before():
+    search = make_search()
+    search.add_lines(14, ["no match", "another error"])
+    assert 15 in search
+    search.discard_before(12)
+    assert 11 not in search
+    assert len(search) == 2
+
+def test_next_and_previous_wrap_around():
+    search = make_search()
+    assert search.next_match(None) == 11
+    assert search.next_match(11) == 13
+    assert search.next_match(13) == 11
+    assert search.previous_match(None) == 13
+    assert search.previous_match(11) == 13
+    assert search.previous_match(12) == 11
+
+def test_find_spans():
+    search = make_search("ab")
+    assert search.find_spans("xABab-aab") == [(1, 2), (3, 2), (7, 2)]
+    assert make_search("aa").find_spans("aaaa") == [(0, 2), (2, 2)]
@@ -0,0 +1,47 @@
+import threading
+from models.log_store import LogStore, MAX_LOG_LINE_LENGTH
+
+def test_append_splits_lines_and_tracks_sequence():
+    store = LogStore(max_lines=10)
+    store.append("first")
+    store.append("second\nthird")
+    assert store.lines() == ["first", "second", "third"]
+    assert store.total == 3
+    assert store.take_pending() == (0, ["first", "second", "third"])
+    assert store.take_pending() == (3, [])
+
+def test_ring_buffer_drops_oldest_lines():
+    store = LogStore(max_lines=3)
+    for idx in range(5):
+        store.append(f"line {idx}")
+    assert len(store) == 3
+    assert store.snapshot() == (2, ["line 2", "line 3", "line 4"])
+    # 待显示队列同样有上限，序号仍按累计行数换算
+    assert store.take_pending() == (2, ["line 2", "line 3", "line 4"])
+
+def test_long_lines_are_truncated():
+    store = LogStore()
+    store.append("x" * (MAX_LOG_LINE_LENGTH + 10))
+    (line,) = store.lines()
+    assert line == "x" * MAX_LOG_LINE_LENGTH + "..."
+
+def test_clear_keeps_total():
+    store = LogStore()
+    store.append("a\nb")
+    store.clear()
+    assert len(store) == 0
+    assert store.take_pending() == (2, [])
+
+def test_concurrent_appends():
+    store = LogStore(max_lines=100000)
+
+    def writer(prefix):
+        for idx in range(1000):
+            store.append(f"{prefix}-{idx}")
+    threads = [threading.Thread(target=writer, args=(name,)) for name in "abcd"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.total == 4000
+    assert len(set(store.lines())) == 4000
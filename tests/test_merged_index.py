@@ -0,0 +1,65 @@
+import random
+from models.merged_index import MergedRangeIndex
+
+def brute_force_find(ranges, row, col):
+    for merged in ranges:
+        start_row, start_col, end_row, end_col = merged
+        if start_row <= row <= end_row and start_col <= col <= end_col:
+            return merged
+    return None
+
+def test_find_inside_and_outside():
+    index = MergedRangeIndex(bucket_rows=4)
+    index.add((0, 0), (1, 1))
+    index.add((2, 3), (9, 5))
+    assert index.find(1, 1) == (0, 0, 1, 1)
+    assert index.find(7, 4) == (2, 3, 9, 5)
+    assert index.find(1, 2) is None
+    assert index.find(10, 4) is None
+
+def test_wide_range_in_other_bucket_does_not_hide_narrow_ranges():
+    # 另一个桶里很宽的区域不影响本桶的回溯范围
+    index = MergedRangeIndex(bucket_rows=4)
+    index.add((100, 0), (100, 999))
+    index.add((0, 10), (1, 11))
+    assert index.find(0, 11) == (0, 10, 1, 11)
+    assert index.find(0, 500) is None
+    assert index.find(100, 500) == (100, 0, 100, 999)
+
+def test_wide_range_before_narrow_ranges_in_same_bucket():
+    index = MergedRangeIndex(bucket_rows=8)
+    index.add((0, 0), (0, 50))
+    for col in range(2, 40, 3):
+        index.add((1, col), (2, col + 1))
+    assert index.find(0, 45) == (0, 0, 0, 50)
+    assert index.find(2, 9) == (1, 8, 2, 9)
+    assert index.find(2, 10) is None
+
+def test_find_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(50):
+        index = MergedRangeIndex(bucket_rows=8)
+        ranges, occupied = [], set()
+        for _ in range(30):
+            row, col = rng.randrange(60), rng.randrange(40)
+            height, width = rng.randrange(1, 12), rng.choice([1, 2, 3, 30])
+            cells = {(r, c) for r in range(row, row + height) for c in range(col, col + width)}
+            if cells & occupied:
+                continue
+            occupied |= cells
+            index.add((row, col), (row + height - 1, col + width - 1))
+            ranges.append((row, col, row + height - 1, col + width - 1))
+        for row in range(75):
+            for col in range(75):
+                assert index.find(row, col) == brute_force_find(ranges, row, col)
+
+def test_query_and_clear():
+    index = MergedRangeIndex(bucket_rows=4)
+    index.add((0, 0), (1, 1))
+    index.add((10, 2), (20, 3))
+    assert index.query(15, 16) == [(10, 2, 20, 3)]
+    assert sorted(index.query(0, 30, 1, 2)) == [(0, 0, 1, 1), (10, 2, 20, 3)]
+    assert index.query(0, 30, 4) == []
+    index.clear()
+    assert len(index) == 0
+    assert index.find(0, 0) is None
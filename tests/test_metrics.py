@@ -0,0 +1,63 @@
+import pytest
+from models.timer import Histogram, MetricsRegistry, PerformanceTimer, metrics, MAX_SAMPLES, MAX_TRACES
+
+def test_percentiles_use_nearest_rank():
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.record(value / 1000)
+    assert histogram.percentile(50) == pytest.approx(0.050)
+    assert histogram.percentile(95) == pytest.approx(0.095)
+    assert histogram.percentile(99) == pytest.approx(0.099)
+    assert histogram.percentile(100) == pytest.approx(0.100)
+    assert histogram.percentile(0) == pytest.approx(0.001)
+    stats = histogram.to_dict()
+    assert stats["count"] == 100
+    assert stats["mean"] == pytest.approx(0.0505)
+
+def test_empty_histogram():
+    assert Histogram().percentile(95) == 0.0
+    assert Histogram().to_dict()["mean"] == 0.0
+
+def test_percentiles_only_keep_recent_samples():
+    histogram = Histogram()
+    histogram.record(10.0)
+    for _ in range(MAX_SAMPLES):
+        histogram.record(0.001)
+    # 最大值精确统计，分位数只看最近的样本
+    assert histogram.max == 10.0
+    assert histogram.percentile(99) == 0.001
+    assert histogram.count == MAX_SAMPLES + 1
+
+def test_nested_spans_form_a_trace():
+    registry = MetricsRegistry()
+    outer = registry.begin_span("open", "book.xlsx")
+    inner = registry.begin_span("decode")
+    registry.add("rows", 10)
+    registry.end_span(inner, 0.2)
+    registry.end_span(outer, 0.5)
+
+    snapshot = registry.snapshot()
+    (trace,) = snapshot["traces"]
+    assert (trace["name"], trace["detail"], trace["duration"]) == ("open", "book.xlsx", 0.5)
+    assert trace["children"][0]["counters"] == {"rows": 10}
+    assert trace["id"] != trace["children"][0]["id"]
+    assert snapshot["counters"] == {"rows": 10}
+    assert set(snapshot["timers"]) == {"open", "decode"}
+
+def test_trace_ids_are_unique_and_traces_are_bounded():
+    registry = MetricsRegistry()
+    for _ in range(MAX_TRACES + 5):
+        registry.end_span(registry.begin_span("op"), 0.0)
+    traces = registry.snapshot()["traces"]
+    assert len(traces) == MAX_TRACES
+    ids = [trace["id"] for trace in traces]
+    assert ids == sorted(set(ids))
+
+def test_performance_timer_records_into_global_registry():
+    metrics.reset()
+    with PerformanceTimer("测试计时") as timer:
+        timer.add("cells", 3)
+    stats = metrics.snapshot()["timers"]["测试计时"]
+    assert stats["count"] == 1
+    assert stats["max"] == pytest.approx(timer.duration)
+    metrics.reset()
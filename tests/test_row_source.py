@@ -0,0 +1,23 @@
+from python_calamine import CalamineWorkbook
+from models.row_source import SheetRowSource
+
+def open_sheet(path):
+    with CalamineWorkbook.from_path(path) as workbook:
+        return workbook.get_sheet_by_name("Sheet1")
+
+def test_sheet_row_source_matches_to_python(offset_workbook):
+    sheet_data = open_sheet(offset_workbook)
+    expected = sheet_data.to_python(skip_empty_area=False)
+    source = SheetRowSource(sheet_data)
+    assert (source.row_count, source.column_count) == (6, 4)
+    assert source.read_rows(0, 100) == expected
+    source.close()
+
+def test_sheet_row_source_random_access(offset_workbook):
+    sheet_data = open_sheet(offset_workbook)
+    expected = sheet_data.to_python(skip_empty_area=False)
+    source = SheetRowSource(sheet_data)
+    # 向前读取、向回跳转和跨越已用区域起点的读取
+    for start, count in ((3, 2), (5, 10), (0, 3), (2, 1), (4, 2), (1, 4), (6, 1)):
+        assert source.read_rows(start, count) == expected[start:start + count], (start, count)
+    assert source.read_rows(3, 2)[0][2:] == [1.0, 2.0]
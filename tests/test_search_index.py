@@ -0,0 +1,55 @@
+import sqlite3
+import pytest
+from excel_processor import ExcelProcessor
+from models import search_index
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE [sheet] (name TEXT, note TEXT)")
+    conn.executemany("INSERT INTO [sheet] VALUES (?, ?)", [
+        ("北京分公司", "季度报告"),
+        ("上海分公司", None),
+        ("Shanghai 100%", "a_b"),
+        ("", "北京"),
+    ])
+    search_index.index_table(conn, "sheet", ["name", "note"])
+    yield conn
+    conn.close()
+
+def hits(conn, query):
+    return sorted((hit.row_id, hit.column_index, hit.value) for hit in search_index.search(conn, query))
+
+def test_fts_substring_match(conn):
+    assert hits(conn, "分公司") == [(1, 0, "北京分公司"), (2, 0, "上海分公司")]
+    assert hits(conn, "SHANGHAI") == [(3, 0, "Shanghai 100%")]
+
+def test_short_query_falls_back_to_like(conn):
+    assert len("北京") < search_index.MIN_FTS_QUERY_LENGTH
+    assert hits(conn, "北京") == [(1, 0, "北京分公司"), (4, 1, "北京")]
+
+def test_like_fallback_escapes_wildcards(conn):
+    assert hits(conn, "%") == [(3, 0, "Shanghai 100%")]
+    assert hits(conn, "_") == [(3, 1, "a_b")]
+
+def test_fts_query_is_a_phrase(conn):
+    assert hits(conn, '"北京 OR') == []
+    assert hits(conn, "") == []
+
+def test_reindex_rows_and_remove_table(conn):
+    conn.execute("UPDATE [sheet] SET name='广州分公司' WHERE rowid=1")
+    search_index.index_table(conn, "sheet", ["name", "note"], row_ids=[1])
+    assert hits(conn, "分公司") == [(1, 0, "广州分公司"), (2, 0, "上海分公司")]
+    search_index.remove_table(conn, "sheet")
+    assert hits(conn, "分公司") == []
+
+def test_search_cells_can_be_cancelled(tmp_path):
+    processor = ExcelProcessor(db_path=str(tmp_path / "data.db"))
+    processor.save_sheet_data(str(tmp_path / "book.xlsx"), "Sheet1", ["text"],
+                              [[f"value{idx}"] for idx in range(2000)], index_text=True)
+    matches = processor.search_cells("value19", limit=50)
+    assert {match.value for match in matches} >= {"value19", "value199"}
+    assert matches[0].sheet_name == "Sheet1"
+    with pytest.raises(sqlite3.OperationalError):
+        # 短查询走 LIKE 扫描，执行的指令数足以触发进度回调
+        processor.search_cells("99", limit=2000, is_cancelled=lambda: True)
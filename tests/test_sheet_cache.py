@@ -0,0 +1,89 @@
+import os
+import pytest
+from models import sheet_cache
+from models.column_store import ColumnStore
+from models.sheet_cache import SheetCache
+
+MERGED = [((0, 0), (1, 1))]
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 可控的时钟，保证最后访问时间的先后顺序
+    now = [1000.0]
+    monkeypatch.setattr(sheet_cache, "time", lambda: now[0])
+    return now
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "book.xlsx"
+    path.write_bytes(b"placeholder")
+    return str(path)
+
+def make_store(rows=100):
+    return ColumnStore.from_rows([[idx, f"text{idx}"] for idx in range(rows)])
+
+def entry_size(tmp_path, workbook):
+    probe = SheetCache(str(tmp_path / "probe"))
+    probe.put(workbook, "probe", make_store(), MERGED)
+    return probe.total_size()
+
+def test_round_trip(tmp_path, workbook):
+    cache = SheetCache(str(tmp_path / "cache"))
+    assert cache.get(workbook, "Sheet1") is None
+    cache.put(workbook, "Sheet1", make_store(), MERGED)
+    store, merged_cells = cache.get(workbook, "Sheet1")
+    assert store.row(5) == [5, "text5"]
+    assert merged_cells == MERGED
+    # 写入使用唯一的临时文件，替换后不留下残余
+    assert not [name for name in os.listdir(cache.cache_dir) if name.endswith(".tmp")]
+
+def test_evicts_least_recently_used(tmp_path, workbook, clock):
+    size = entry_size(tmp_path, workbook)
+    cache = SheetCache(str(tmp_path / "cache"), max_bytes=size * 2)
+    for name in ("a", "b"):
+        clock[0] += 1
+        cache.put(workbook, name, make_store(), MERGED)
+    clock[0] += 1
+    assert cache.get(workbook, "a") is not None  # a 比 b 更近被访问
+
+    clock[0] += 1
+    cache.put(workbook, "c", make_store(), MERGED)
+    assert cache.get(workbook, "b") is None
+    assert cache.get(workbook, "a") is not None
+    assert cache.get(workbook, "c") is not None
+    assert cache.total_size() <= size * 2
+
+def test_get_defers_index_write_until_flush(tmp_path, workbook, clock):
+    cache = SheetCache(str(tmp_path / "cache"))
+    cache.put(workbook, "Sheet1", make_store(), MERGED)
+    clock[0] = 5000.0
+    cache.get(workbook, "Sheet1")
+    assert next(iter(SheetCache(cache.cache_dir)._index.values()))["last_access"] == 1000.0
+    cache.flush()
+    assert next(iter(SheetCache(cache.cache_dir)._index.values()))["last_access"] == 5000.0
+
+def test_modified_file_replaces_stale_entry(tmp_path, workbook):
+    cache = SheetCache(str(tmp_path / "cache"))
+    cache.put(workbook, "Sheet1", make_store(10), MERGED)
+    with open(workbook, "ab") as f:
+        f.write(b"changed")
+    assert cache.get(workbook, "Sheet1") is None
+    cache.put(workbook, "Sheet1", make_store(20), [])
+    assert len(cache._index) == 1
+    assert cache.get(workbook, "Sheet1")[0].row_count == 20
+
+def test_corrupt_entry_is_dropped(tmp_path, workbook):
+    cache = SheetCache(str(tmp_path / "cache"))
+    cache.put(workbook, "Sheet1", make_store(), MERGED)
+    data_path, _ = cache._entry_paths(cache.make_key(workbook, "Sheet1"))
+    with open(data_path, "wb") as f:
+        f.write(b"not arrow")
+    assert cache.get(workbook, "Sheet1") is None
+    assert cache.total_size() == 0
+
+def test_clear(tmp_path, workbook):
+    cache = SheetCache(str(tmp_path / "cache"))
+    cache.put(workbook, "Sheet1", make_store(), MERGED)
+    cache.clear()
+    assert cache.total_size() == 0
+    assert os.listdir(cache.cache_dir) == ["index.json"]
@@ -0,0 +1,25 @@
+from python_calamine import CalamineWorkbook
+from excel_processor import ExcelProcessor
+
+def test_iter_sheet_rows_matches_to_python(offset_workbook, tmp_path):
+    processor = ExcelProcessor(db_path=str(tmp_path / "data.db"))
+    processor.read_excel_structure(offset_workbook)
+    _, sheet_data, merged_cells = processor.open_sheet(0)
+    with CalamineWorkbook.from_path(offset_workbook) as workbook:
+        expected = workbook.get_sheet_by_name("Sheet1").to_python(skip_empty_area=False)
+
+    for batch_size, first_batch_size in ((100, None), (2, 1)):
+        rows = [row for batch in processor.iter_sheet_rows(sheet_data, batch_size, first_batch_size) for row in batch]
+        assert rows == expected
+    assert len(expected) == 6
+    assert expected[2][2:] == ["h1", "h2"]
+    assert merged_cells == [((4, 2), (4, 3))]
+    processor.close()
+
+def test_read_sheet_data_and_iter_sheet_rows_agree(offset_workbook, tmp_path):
+    processor = ExcelProcessor(db_path=str(tmp_path / "data.db"))
+    processor.read_excel_structure(offset_workbook)
+    data, _ = processor.read_sheet_data(0)
+    _, sheet_data, _ = processor.open_sheet(0)
+    assert [row for batch in processor.iter_sheet_rows(sheet_data) for row in batch] == data
+    processor.close()
@@ -0,0 +1,108 @@
+import polars as pl
+import pytest
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+from models.column_store import ColumnStore
+from models.row_source import RowSource
+from models.table_model import TableModel, _contains_mask, _sort_key
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    return QApplication.instance() or QApplication([])
+
+def categorical(values):
+    with pl.StringCache():
+        return pl.Series(values, dtype=pl.Categorical)
+
+def test_sort_key_ranks_categorical_text():
+    keys = _sort_key(categorical(["b", "a", "c", "a"]))
+    assert keys.dtype == pl.UInt32
+    assert keys.to_list() == [2, 1, 3, 1]
+
+def test_sort_key_keeps_null_codes_null():
+    keys = _sort_key(categorical(["b", None, "a", "b", None]))
+    assert keys.to_list() == [2, None, 1, 2, None]
+
+def test_sort_key_all_null():
+    assert _sort_key(categorical([None, None])).to_list() == [None, None]
+
+def test_sort_key_passes_through_numeric_columns():
+    series = pl.Series([3, 1, 2])
+    assert _sort_key(series) is series
+
+def test_contains_mask_skips_nulls():
+    mask = _contains_mask(categorical(["Apple", None, "pineapple", "pear"]), "APP")
+    assert mask.to_list() == [True, False, True, False]
+
+def column_values(model, col):
+    return [model.data(model.index(row, col)) for row in range(model.rowCount())]
+
+def make_model(rows, merged_cells=None):
+    model = TableModel()
+    # 分两批追加，覆盖多个内存块的列
+    store = ColumnStore.from_rows(rows[:len(rows) // 2])
+    store.append(ColumnStore.from_rows(rows[len(rows) // 2:]))
+    model.setData(store, merged_cells or [])
+    return model
+
+def test_sort_places_empty_cells_last():
+    model = make_model([["b", 1], ["", 2], ["a", None], ["c", 4]])
+    model.sort(0, Qt.SortOrder.AscendingOrder)
+    assert column_values(model, 0) == ["a", "b", "c", ""]
+    model.sort(0, Qt.SortOrder.DescendingOrder)
+    assert column_values(model, 0) == ["c", "b", "a", ""]
+    model.sort(1, Qt.SortOrder.AscendingOrder)
+    assert column_values(model, 1) == [1, 2, 4, ""]
+
+def test_sort_uses_merged_value_for_covered_cells():
+    # 第 0、1 行合并，第 1 行按左上角的 "b" 参与排序
+    model = make_model([["b", 1], ["", 2], ["a", 3], ["", 4]], [((0, 0), (1, 0))])
+    model.sort(0, Qt.SortOrder.AscendingOrder)
+    assert column_values(model, 1) == [3, 1, 2, 4]
+
+def test_many_merged_ranges_fill_from_top_left():
+    # 每两行在第 0 列纵向合并；每三行一次 (i,1)-(i,2) 横向合并，第 2 列取第 1 列的值
+    row_count = 6000
+    rows = [[f"k{i // 2}" if i % 2 == 0 else "", i, None if i % 3 == 0 else -i] for i in range(row_count)]
+    merged_cells = [((i, 0), (i + 1, 0)) for i in range(0, row_count, 2)]
+    merged_cells += [((i, 1), (i, 2)) for i in range(0, row_count, 3)]
+    model = make_model(rows, merged_cells)
+
+    model.setFilter(0, "k1234")
+    assert column_values(model, 1) == [2468, 2469]
+    model.clearPermutation()
+
+    filled = [i if i % 3 == 0 else -i for i in range(row_count)]
+    model.sort(2, Qt.SortOrder.AscendingOrder)
+    assert column_values(model, 1) == sorted(range(row_count), key=lambda i: filled[i])
+
+def test_filter_and_clear_permutation():
+    model = make_model([["apple", 1], ["pear", 2], ["", 3], ["Pineapple", 4]])
+    model.setFilter(0, "app")
+    assert column_values(model, 1) == [1, 4]
+    model.clearPermutation()
+    assert column_values(model, 1) == [1, 2, 3, 4]
+
+class ListRowSource(RowSource):
+    def __init__(self, rows):
+        self.rows = rows
+        self.row_count = len(rows)
+        self.column_count = len(rows[0])
+        self.closed = False
+
+    def read_rows(self, start, count):
+        return self.rows[start:start + count]
+
+    def close(self):
+        self.closed = True
+
+def test_release_source_closes_virtual_source():
+    source = ListRowSource([[idx, f"row{idx}"] for idx in range(10)])
+    model = TableModel()
+    model.setSource(source, [], ColumnStore.from_rows(source.read_rows(0, TableModel.BLOCK_SIZE)))
+    assert model.isVirtual()
+    assert model.data(model.index(3, 1)) == "row3"
+    model.releaseSource()
+    assert source.closed
+    assert not model.isVirtual()
+    assert model.rowCount() == 0
@@ -0,0 +1,88 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QTableView
+from typing import List, Optional, Tuple
+import random
+
+class ColumnSizer:
+    """基于采样的列宽估算
+
+    resizeColumnsToContents/resizeRowsToContents 会在 GUI 线程上测量每一个单元格，
+    大工作表切换时耗时明显。这里只测量有限的样本行（开头、结尾和随机抽取的行），
+    再结合列式存储缓存的每列最长文本长度估算列宽；行高保持统一，
+    只有样本中出现多行文本时才调整对应的行。
+    """
+    HEAD_ROWS = 50
+    TAIL_ROWS = 50
+    RANDOM_ROWS = 100
+    MIN_WIDTH = 40
+    MAX_WIDTH = 400
+    PADDING = 16  # 单元格左右边距
+    # 行数不超过该值且存在多行文本时，直接按内容调整所有行高
+    FULL_ROW_RESIZE_LIMIT = 2000
+
+    def __init__(self, view: QTableView):
+        self.view = view
+
+    def sample_rows(self, row_count: int) -> List[int]:
+        """选取开头、结尾和随机的样本行"""
+        if row_count <= self.HEAD_ROWS + self.TAIL_ROWS + self.RANDOM_ROWS:
+            return list(range(row_count))
+        head = range(self.HEAD_ROWS)
+        tail = range(row_count - self.TAIL_ROWS, row_count)
+        # 固定随机种子，同一工作表每次得到相同的结果
+        middle = random.Random(row_count).sample(range(self.HEAD_ROWS, row_count - self.TAIL_ROWS),
+                                                 self.RANDOM_ROWS)
+        return list(head) + sorted(middle) + list(tail)
+
+    def estimate(self, model, max_text_lengths: Optional[List[int]] = None) -> Tuple[List[int], List[int]]:
+        """
+        估算每列的宽度
+        :param model: 表格模型
+        :param max_text_lengths: 每列最长文本的字符数，为 None 时只使用样本
+        :return: (每列宽度, 含多行文本的样本行)
+        """
+        metrics = self.view.fontMetrics()
+        char_width = metrics.averageCharWidth()
+        merge_model = getattr(self.view, "merge_model", None)
+        rows = self.sample_rows(model.rowCount())
+        wrapped_rows = set()
+        widths = []
+
+        for col in range(model.columnCount()):
+            header = model.headerData(col, Qt.Orientation.Horizontal)
+            width = metrics.horizontalAdvance(str(header)) if header is not None else 0
+            for row in rows:
+                text = model.data(model.index(row, col))
+                if text is None or text == "":
+                    continue
+                # 跨列的合并单元格不参与单列宽度的计算
+                if merge_model is not None and merge_model.get_cell_span(row, col)[1] != 1:
+                    continue
+                text = str(text)
+                if "\n" in text:
+                    wrapped_rows.add(row)
+                    text = max(text.split("\n"), key=len)
+                width = max(width, metrics.horizontalAdvance(text))
+            if max_text_lengths is not None and col < len(max_text_lengths):
+                # 样本之外的长文本按平均字符宽度估算
+                width = max(width, min(max_text_lengths[col] * char_width, self.MAX_WIDTH))
+            widths.append(max(self.MIN_WIDTH, min(width + self.PADDING, self.MAX_WIDTH)))
+        return widths, sorted(wrapped_rows)
+
+    def apply(self, widths: List[int], wrapped_rows: List[int]):
+        """
+        应用列宽和行高
+        :param widths: 每列宽度
+        :param wrapped_rows: 含多行文本的行
+        """
+        header = self.view.horizontalHeader()
+        for col, width in enumerate(widths):
+            header.resizeSection(col, width)
+
+        if not wrapped_rows:
+            return
+        if self.view.model().rowCount() <= self.FULL_ROW_RESIZE_LIMIT:
+            self.view.resizeRowsToContents()
+        else:
+            for row in wrapped_rows:
+                self.view.resizeRowToContents(row)
@@ -1,19 +1,28 @@
 from PyQt6.QtWidgets import (QWidget, QTabWidget, QStackedWidget, 
-                           QVBoxLayout, QTextEdit)
+                           QVBoxLayout, QTextEdit, QMenu, QInputDialog)
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import QSizePolicy
 from models.table_model import TableModel
 from excel_processor import ExcelProcessor
 from models.decorators import ExceptionHandler
+from models.timer import PerformanceTimer
+from models.sheet_loader import SheetLoader, SheetPrefetcher
+from models.sheet_cache import SheetCache
 from widgets.merged_table_view import MergedTableView
+from widgets.column_sizer import ColumnSizer
+from widgets.query_console import QueryConsole
 import numpy as np
 import logging
 
+logger = logging.getLogger(__name__)
+
 class DocumentTab(QWidget):
     """单个文档标签页的容器"""
-    def __init__(self, file_path, parent=None):
+    def __init__(self, file_path, sheet_cache=None, first_row_header=False, parent=None):
         super().__init__(parent)
         self.file_path = file_path
+        self.sheet_cache = sheet_cache  # 各文档共享的工作表磁盘缓存
+        self.first_row_header = first_row_header  # 是否使用首行作为列名
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.layout.setSpacing(0)  # 减少空隙
@@ -32,30 +41,199 @@ class DocumentTab(QWidget):
         self.text_edit = None
         self.table_model = None
         self.excel_processor = None
+        self.sheet_loader = None
+        self.sheet_prefetcher = None
+        self._pending_merged_cells = []  # 当前工作表的合并单元格信息，按结束行排序
+        self._merge_cursor = 0  # 已应用到视图的合并单元格数量
+        self.column_sizer = None
+        self._current_sheet = -1
+        self._column_widths = {}  # {工作表序号: (列宽, 含多行文本的行)}，切回时直接复用
+        self._pending_jump = None  # 等待数据加载后定位的单元格 (工作表序号, 行, 列)
 
     def change_sheet(self, index):
-        """切换表格视图的sheet"""
+        """切换表格视图的sheet，数据在后台线程中加载"""
         if index >= 0 and self.excel_processor:
-            try:
-                # 读取数据和合并单元格信息
-                data, merged_cells = self.excel_processor.read_sheet_data(index)
-                if data:  # 确保有数据
-                    # 设置数据
-                    self.table_model.setData(data, merged_cells)
-
-                    # 设置新的合并单元格信息
-                    if merged_cells:
-                        #for (start_row, start_col), (end_row, end_col) in merged_cells:
-                            
-                        self.table_view.setMergedCells(merged_cells)
-                    else:
-                        logging.info("没有合并单元格需要处理")
-                        
-                    # 调整列宽以适应内容
-                    self.table_view.resizeColumnsToContents()
-                    self.table_view.resizeRowsToContents()
-            except Exception as e:
-                logging.error(f"切换sheet时出错: {str(e)}")
+            self._current_sheet = index
+            # 加载过程中不支持排序，加载完成后再启用
+            self.table_view.setSortingEnabled(False)
+            # 预取与前台加载争用 CPU，切换时先停止，加载完成后按新位置重新预取
+            self.sheet_prefetcher.cancel()
+            self.sheet_loader.load(index)
+
+    def on_first_batch_ready(self, store, merged_cells):
+        """首批数据到达，先显示首屏内容"""
+        with PerformanceTimer("显示首批数据", str(self._current_sheet)) as timer:
+            timer.add("rows", store.row_count)
+            with PerformanceTimer("设置模型"):
+                self.table_model.setData(store, merged_cells)
+                self._reset_merged_cells(merged_cells)
+                self._update_header_row()
+
+            # 已经计算过列宽时直接复用，否则先按首屏内容估算
+            with PerformanceTimer("调整列宽"):
+                cached = self._column_widths.get(self._current_sheet)
+                if cached is not None:
+                    self.column_sizer.apply(*cached)
+                else:
+                    self.column_sizer.apply(*self.column_sizer.estimate(self.table_model, store.max_text_lengths()))
+        self._apply_pending_jump()
+
+    def on_source_ready(self, source, merged_cells, first_block):
+        """超大工作表以虚拟化模式显示，行数据随滚动按块在后台读取"""
+        self.table_model.setSource(source, merged_cells, first_block)
+        self._reset_merged_cells(merged_cells)
+        self._update_header_row()
+        self._resize_columns(self._current_sheet)
+        self._apply_pending_jump()
+
+    def on_sheet_loaded(self, index, total_rows):
+        """工作表全部数据加载完成"""
+        if not self.table_model.isVirtual():
+            # 合并分批追加产生的内存块
+            self.table_model.store().rechunk()
+            self._resize_columns(index)
+            # 数据全部在内存中，启用点击表头排序（不立即排序）
+            self.table_view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+            self.table_view.setSortingEnabled(True)
+        if not self._pending_merged_cells:
+            logger.info("没有合并单元格需要处理")
+        logger.info("工作表 %s 加载完成，共 %d 行", index, total_rows)
+        self._apply_pending_jump()
+        # 当前工作表显示后，在后台预取相邻的工作表
+        self.sheet_prefetcher.prefetch_after(index)
+
+    def _resize_columns(self, index):
+        """按采样估算列宽并按工作表缓存"""
+        with PerformanceTimer("调整列宽"):
+            cached = self._column_widths.get(index)
+            if cached is None:
+                max_text_lengths = None if self.table_model.isVirtual() else self.table_model.store().max_text_lengths()
+                cached = self.column_sizer.estimate(self.table_model, max_text_lengths)
+                self._column_widths[index] = cached
+            self.column_sizer.apply(*cached)
+
+    def _reset_merged_cells(self, merged_cells):
+        """模型重置后重新应用合并单元格
+
+        合并区域按结束行排序，只应用已经完全加载的部分。跨越未加载行的
+        合并区域会被后续的行插入拉伸，等对应的行插入后再设置。
+        """
+        self._pending_merged_cells = sorted(merged_cells, key=lambda cell: cell[1][0])
+        self._merge_cursor = 0
+        self.table_view.setMergedCells(self._take_loaded_merges())
+
+    def _take_loaded_merges(self):
+        """取出结束行已经加载的合并单元格"""
+        loaded_rows = self.table_model.rowCount()
+        start = self._merge_cursor
+        while (self._merge_cursor < len(self._pending_merged_cells)
+               and self._pending_merged_cells[self._merge_cursor][1][0] < loaded_rows):
+            self._merge_cursor += 1
+        return self._pending_merged_cells[start:self._merge_cursor]
+
+    def on_rows_inserted(self, parent, first, last):
+        """新的行加载后，应用已经完整落入加载范围的合并单元格"""
+        loaded_merges = self._take_loaded_merges()
+        if loaded_merges:
+            self.table_view.addMergedCells(loaded_merges)
+        if self._pending_jump is not None:
+            self._apply_pending_jump()
+
+    def go_to_cell(self, sheet_name, row, col):
+        """
+        切换到指定工作表并定位到单元格，数据尚未加载到该行时在加载后定位
+        :param sheet_name: 工作表名称
+        :param row: 行（从0开始）
+        :param col: 列（从0开始）
+        """
+        if not self.excel_processor:
+            return
+        names = [info.sheet_name for info in self.excel_processor.sheets_info]
+        if sheet_name not in names:
+            logger.warning(f"工作表 {sheet_name} 不存在")
+            return
+        index = names.index(sheet_name)
+        if self.table_model.hasPermutation():
+            # 目标位置是源数据中的行列，先恢复原始顺序
+            self.table_model.clearPermutation()
+        self._pending_jump = (index, row, col)
+        if self.sheet_tabs.currentIndex() != index:
+            # 切换标签页会触发 change_sheet，数据到达后再定位
+            self.sheet_tabs.setCurrentIndex(index)
+        else:
+            self._apply_pending_jump()
+
+    def _apply_pending_jump(self):
+        """数据已经加载到目标行时选中并滚动到目标单元格"""
+        if self._pending_jump is None:
+            return
+        index, row, col = self._pending_jump
+        if index != self._current_sheet:
+            return
+        # 虚拟化模式下先向视图暴露目标行所在的数据块
+        while row >= self.table_model.rowCount() and self.table_model.canFetchMore():
+            self.table_model.fetchMore()
+        if row >= self.table_model.rowCount() or col >= self.table_model.columnCount():
+            # 仍在后台加载，等后续数据到达
+            return
+        self._pending_jump = None
+        model_index = self.table_model.index(row, col)
+        self.table_view.setCurrentIndex(model_index)
+        self.table_view.scrollTo(model_index, MergedTableView.ScrollHint.PositionAtCenter)
+        self.table_view.setFocus()
+
+    def on_permutation_changed(self, active):
+        """排序或筛选后行顺序与源数据不同，合并跨度不再成立，取消后恢复"""
+        if active:
+            self.table_view.clearSpans()
+        else:
+            self.table_view.setMergedCells(self._pending_merged_cells[:self._merge_cursor])
+        self._update_header_row()
+
+    def set_first_row_header(self, enabled):
+        """切换使用首行还是Excel风格列名作为列名"""
+        self.first_row_header = enabled
+        if self.table_model:
+            self.table_model.setFirstRowAsHeader(enabled)
+            self._update_header_row()
+
+    def _update_header_row(self):
+        """首行作为列名时在视图中隐藏首行；排序和筛选后首行不在排列中，无需隐藏"""
+        if self.table_model.rowCount():
+            self.table_view.setRowHidden(0, self.first_row_header and not self.table_model.hasPermutation())
+
+    def show_header_menu(self, pos):
+        """表头右键菜单：按列筛选、取消筛选和排序"""
+        if self.table_model.isVirtual() or self.sheet_loader.is_loading():
+            return
+        header = self.table_view.horizontalHeader()
+        column = header.logicalIndexAt(pos)
+        if column < 0:
+            return
+
+        menu = QMenu(self)
+        filter_action = menu.addAction("筛选此列...")
+        clear_filter_action = menu.addAction("清除所有筛选")
+        clear_filter_action.setEnabled(bool(self.table_model.filters()))
+        clear_all_action = menu.addAction("恢复原始顺序")
+        clear_all_action.setEnabled(self.table_model.hasPermutation())
+
+        action = menu.exec(header.mapToGlobal(pos))
+        if action == filter_action:
+            column_name = self.table_model.headerData(column, Qt.Orientation.Horizontal)
+            text, ok = QInputDialog.getText(self, "筛选", f"列 {column_name} 包含：",
+                                            text=self.table_model.filters().get(column, ""))
+            if ok:
+                self.table_model.setFilter(column, text)
+        elif action == clear_filter_action:
+            self.table_model.clearFilters()
+        elif action == clear_all_action:
+            header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+            self.table_model.clearPermutation()
+
+    def on_sheet_load_failed(self, error_msg):
+        """工作表加载失败"""
+        logger.error(f"切换sheet时出错: {error_msg}")
     
     def move_sheet_tabs(self, show_at_top: bool):
         """移动sheet标签页到顶部或底部"""
@@ -106,12 +284,28 @@ class DocumentTab(QWidget):
         if not self.table_view:
             self.table_view = MergedTableView(self)
             self.table_model = TableModel()
+            self.table_model.setFirstRowAsHeader(self.first_row_header)
             
             self.table_view.setModel(self.table_model)
+            self.column_sizer = ColumnSizer(self.table_view)
+            self.table_model.rowsInserted.connect(self.on_rows_inserted)
+            self.table_model.permutationChanged.connect(self.on_permutation_changed)
+            header = self.table_view.horizontalHeader()
+            header.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+            header.customContextMenuRequested.connect(self.show_header_menu)
             
             # 初始化Excel处理器
-            self.excel_processor = ExcelProcessor()
+            self.excel_processor = ExcelProcessor(sheet_cache=self.sheet_cache)
             sheets_info = self.excel_processor.read_excel_structure(self.file_path)
+
+            # 初始化后台加载器
+            self.sheet_loader = SheetLoader(self.excel_processor, self)
+            self.sheet_loader.first_batch_ready.connect(self.on_first_batch_ready)
+            self.sheet_loader.rows_ready.connect(self.table_model.appendRows)
+            self.sheet_loader.source_ready.connect(self.on_source_ready)
+            self.sheet_loader.load_finished.connect(self.on_sheet_loaded)
+            self.sheet_loader.load_failed.connect(self.on_sheet_load_failed)
+            self.sheet_prefetcher = SheetPrefetcher(self.excel_processor, parent=self)
             
             # 清空现有的标签页
             self.sheet_tabs.clear()
@@ -122,15 +316,10 @@ class DocumentTab(QWidget):
                 sheet_widget = QWidget()
                 self.sheet_tabs.addTab(sheet_widget, sheet_info.sheet_name)
             
-            # 如果有sheet，加载第一个sheet的数据
+            # 如果有sheet，在后台加载第一个sheet的数据
             if sheets_info:
-                data, merged_cells = self.excel_processor.read_sheet_data(0)
-                if data:  # 确保有数据
-                    self.table_model.setData(data, merged_cells)
-                    # 处理合并单元格
-                    if merged_cells:
-                        self.table_view.setMergedCells(merged_cells)
                 self.sheet_tabs.setCurrentIndex(0)
+                self.change_sheet(0)
             
             # 显示sheet标签页
             self.sheet_tabs.show()
@@ -143,6 +332,21 @@ class DocumentTab(QWidget):
         self.stack.setCurrentWidget(self.table_view)
         return self.table_view
 
+    def close_document(self):
+        """关闭文档，取消后台加载和预取并释放打开的工作簿句柄"""
+        if self.sheet_prefetcher:
+            self.sheet_prefetcher.cancel()
+            self.sheet_prefetcher = None
+        if self.sheet_loader:
+            self.sheet_loader.cancel()
+            self.sheet_loader = None
+        if self.table_model:
+            # 虚拟化模式下的数据源持有工作簿或数据库连接
+            self.table_model.releaseSource()
+        if self.excel_processor:
+            self.excel_processor.close()
+            self.excel_processor = None
+
 class DocumentArea(QWidget):
     """文档区域组件，管理多个文档标签页"""
     def __init__(self, parent=None):
@@ -166,6 +370,11 @@ class DocumentArea(QWidget):
         
         # 存储打开的文档
         self.documents = {}  # {file_path: DocumentTab}
+
+        # 工作表解析结果的磁盘缓存，重新打开未修改的文件时跳过解析
+        self.sheet_cache = SheetCache()
+        self.query_console = None  # SQL 查询控制台，只打开一个
+        self.first_row_header = False  # 是否使用首行作为列名，应用到所有文档
     
     def open_document(self, file_path: str, file_type: str):
         """打开新文档或切换到已存在的文档"""
@@ -176,7 +385,7 @@ class DocumentArea(QWidget):
             return self.documents[file_path]
         
         # 创建新的文档标签
-        doc_tab = DocumentTab(file_path)
+        doc_tab = DocumentTab(file_path, self.sheet_cache, self.first_row_header)
         self.documents[file_path] = doc_tab
         
         # 添加到标签页
@@ -186,14 +395,36 @@ class DocumentArea(QWidget):
         
         # 根据文件类型设置不同的视图
         if file_type.lower() in ['.xlsx', '.xls']:
-            return doc_tab.setup_excel_view()
+            with PerformanceTimer("打开文件", file_path):
+                return doc_tab.setup_excel_view()
         else:
             return doc_tab.setup_text_view()
     
+    def set_first_row_header(self, enabled: bool):
+        """切换所有文档的列名显示方式"""
+        self.first_row_header = enabled
+        for doc_tab in self.documents.values():
+            doc_tab.set_first_row_header(enabled)
+
+    def open_query_console(self, db_path: str = "data.db"):
+        """打开 SQL 查询控制台，已经打开时切换过去并刷新已导入的表"""
+        if self.query_console is None:
+            self.query_console = QueryConsole(db_path)
+            self.tab_widget.addTab(self.query_console, "SQL 查询")
+        else:
+            self.query_console.refresh_tables()
+        self.tab_widget.setCurrentWidget(self.query_console)
+        return self.query_console
+
     def close_tab(self, index):
         """关闭指定的标签页"""
         widget = self.tab_widget.widget(index)
+        if widget is self.query_console:
+            self.query_console.close_console()
+            self.query_console = None
         file_path = next((path for path, tab in self.documents.items() if tab == widget), None)
         if file_path:
             del self.documents[file_path]
+        if isinstance(widget, DocumentTab):
+            widget.close_document()
         self.tab_widget.removeTab(index)
\ No newline at end of file
@@ -1,55 +1,50 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, 
-                           QPushButton, QLineEdit, QLabel, QFrame)
-from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QObject
-from PyQt6.QtGui import QColor, QPalette, QTextCursor, QMouseEvent
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit,
+                           QPushButton, QLineEdit, QLabel, QFrame, QTextEdit)
+from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QTimer
+from PyQt6.QtGui import QColor, QPalette, QTextCursor, QMouseEvent, QShortcut, QKeySequence
+from models.log_store import LogStore, DEFAULT_MAX_LOG_LINES
+from models.log_search import LogSearch
+from models.logging_setup import LOG_FORMAT, add_log_handler, remove_log_handler
 import sys
 import logging
 
-class QTextEditLogger(logging.Handler,QObject):
-    """自定义日志处理器，将日志输出重定向到QTextEdit"""
-    append_signal = pyqtSignal(str)
+# 日志面板刷新新日志的间隔（毫秒）
+LOG_FLUSH_INTERVAL_MS = 100
+# 输入停止多久后开始搜索（毫秒）
+LOG_SEARCH_DELAY_MS = 200
 
-    def __init__(self,text_edit):
+class LogStoreHandler(logging.Handler):
+    """自定义日志处理器，把日志写入环形缓冲区，由日志面板定时批量显示
+
+    emit 可能在任意线程中调用，这里只做格式化和入队，不直接操作界面。
+    """
+
+    def __init__(self, log_store):
         super().__init__()
-        QObject.__init__(self)
-        self.text_edit = text_edit
-        self.append_signal.connect(self.text_edit.append)
-        self._is_valid = True
+        self.log_store = log_store
 
         # 设置日志格式
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        formatter = logging.Formatter(LOG_FORMAT)
         self.setFormatter(formatter)
 
-    def emit(self,record):
+    def emit(self, record):
         """处理日志记录"""
-        if self._is_valid and self.text_edit:
-            msg = self.format(record)
-            self.append_signal.emit(msg)
+        try:
+            self.log_store.append(self.format(record))
+        except Exception:
+            self.handleError(record)
 
-    def cleanup(self):
-        """清理资源"""
-        self._is_valid = False
-        if hasattr(self, 'append_signal'):
-            try:
-                self.append_signal.disconnect()
-            except:
-                pass
-        self.text_edit = None
 
+class PrintRedirector:
+    """重定向print到日志缓冲区"""
 
-class PrintRedirector(QObject):
-    """重定向print"""
-    print_signal = pyqtSignal(str)
+    def __init__(self, log_store):
+        self.log_store = log_store
 
-    def __init__(self,text_edit):
-        super().__init__()
-        self.text_edit = text_edit
-        self.print_signal.connect(self.text_edit.append)
+    def write(self, text):
+        if text.strip(): # 如果文本不为空，则写入缓冲区
+            self.log_store.append(text.rstrip())
 
-    def write(self,text):
-        if text.strip(): # 如果文本不为空，则发出信号
-            self.print_signal.emit(text)
-        
     def flush(self):
         pass
 
@@ -58,10 +53,24 @@ class LogPanel(QWidget):
     search_text_changed = pyqtSignal(str)
     closed = pyqtSignal()  # 新增关闭信号
     
-    def __init__(self, parent=None):
+    def __init__(self, max_lines: int = DEFAULT_MAX_LOG_LINES, parent=None):
         super().__init__(parent)
+        self.log_store = LogStore(max_lines)
+        self.log_search = LogSearch()
+        self._next_seq = 0  # 下一条显示到界面的日志序号
+        self._current_match = None  # 当前定位到的匹配行序号
         self.setup_ui()
         self.setup_logger()
+
+        # 输入时延迟搜索，避免每个按键都扫描一遍日志
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.run_search)
+
+        # 日志先写入缓冲区，定时批量追加到界面，日志密集时也不会阻塞界面
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush_pending)
+        self.flush_timer.start(LOG_FLUSH_INTERVAL_MS)
         
     def setup_ui(self):
         main_layout = QVBoxLayout(self)
@@ -100,7 +109,37 @@ class LogPanel(QWidget):
             }
         """)
         self.search_input.textChanged.connect(self.on_search_text_changed)
+        self.search_input.returnPressed.connect(self.find_next)
+        QShortcut(QKeySequence("Shift+Return"), self.search_input, activated=self.find_previous)
         toolbar_layout.addWidget(self.search_input)
+
+        # 添加上一个/下一个匹配按钮和匹配数量
+        nav_button_style = """
+            QPushButton {
+                background-color: transparent;
+                border: none;
+                color: #666666;
+                padding: 2px 6px;
+            }
+            QPushButton:hover {
+                background-color: #e0e0e0;
+            }
+        """
+        self.prev_button = QPushButton("↑")
+        self.prev_button.setToolTip("上一个匹配 (Shift+Enter)")
+        self.prev_button.setStyleSheet(nav_button_style)
+        self.prev_button.clicked.connect(self.find_previous)
+        toolbar_layout.addWidget(self.prev_button)
+
+        self.next_button = QPushButton("↓")
+        self.next_button.setToolTip("下一个匹配 (Enter)")
+        self.next_button.setStyleSheet(nav_button_style)
+        self.next_button.clicked.connect(self.find_next)
+        toolbar_layout.addWidget(self.next_button)
+
+        self.match_label = QLabel()
+        self.match_label.setStyleSheet("color: #666666;")
+        toolbar_layout.addWidget(self.match_label)
         
         # 添加弹簧
         toolbar_layout.addStretch()
@@ -143,11 +182,13 @@ class LogPanel(QWidget):
         # 添加工具栏到主布局
         main_layout.addWidget(toolbar)
         
-        # 创建日志文本区域
-        self.log_area = QTextEdit()
+        # 创建日志文本区域，超过行数上限时自动删除最早的行
+        self.log_area = QPlainTextEdit()
         self.log_area.setReadOnly(True)
+        self.log_area.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.log_area.setMaximumBlockCount(self.log_store.max_lines)
         self.log_area.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: white;
                 color: #333333;
                 border: none;
@@ -157,15 +198,18 @@ class LogPanel(QWidget):
         """)
         main_layout.addWidget(self.log_area)
 
+        # 只高亮可见范围内的匹配，滚动时重新计算
+        self.log_area.verticalScrollBar().valueChanged.connect(self.highlight_visible_matches)
+
     def setup_logger(self):
         """设置日志记录器"""
-        self.logger_handler = QTextEditLogger(self.log_area)
+        self.logger_handler = LogStoreHandler(self.log_store)
 
-        logging.getLogger().addHandler(self.logger_handler)
-        logging.getLogger().setLevel(logging.INFO)
+        # 由日志监听线程写入缓冲区，记录日志的线程只需入队
+        add_log_handler(self.logger_handler)
 
-        self.stdout_redirector = PrintRedirector(self.log_area)
-        self.stderr_redirector = PrintRedirector(self.log_area)
+        self.stdout_redirector = PrintRedirector(self.log_store)
+        self.stderr_redirector = PrintRedirector(self.log_store)
 
         sys.stdout = self.stdout_redirector
         sys.stderr = self.stderr_redirector
@@ -173,9 +217,11 @@ class LogPanel(QWidget):
 
     def cleanup(self):
         """清理"""
-        if hasattr(self, 'logger_handler'):
-            self.logger_handler.cleanup()
-            logging.getLogger().removeHandler(self.logger_handler)
+        if hasattr(self, 'flush_timer'):
+            self.flush_timer.stop()
+
+        if getattr(self, 'logger_handler', None):
+            remove_log_handler(self.logger_handler)
             self.logger_handler = None
 
         if hasattr(self, 'stdout_redirector'):
@@ -198,56 +244,113 @@ class LogPanel(QWidget):
         self.closed.emit()
         
     def on_search_text_changed(self, text):
-        """处理搜索文本变化"""
+        """处理搜索文本变化，停止输入后再搜索"""
+        self.search_timer.start(LOG_SEARCH_DELAY_MS)
+
+    def run_search(self):
+        """用当前的搜索文本重建匹配索引，并定位到最后一个匹配"""
+        self.search_timer.stop()
+        text = self.search_input.text()
+        first_seq, lines = self.log_store.snapshot()
+        # 只搜索已经显示到界面的行，其余的行在下次刷新时增量搜索
+        lines = lines[:max(0, self._next_seq - first_seq)]
+        self.log_search.set_query(text, first_seq, lines)
+        self.log_search.discard_before(self._next_seq - self.log_area.blockCount())
+        self._current_match = self.log_search.previous_match(None)
+        if self._current_match is not None:
+            self._scroll_to_seq(self._current_match)
+        self.highlight_visible_matches()
+        self._update_match_label()
         self.search_text_changed.emit(text)
-        self.highlight_search_text(text)
-    
-    def highlight_search_text(self, text):
-        """高亮搜索文本"""
-        if not text:
-            # 清除所有高亮
-            cursor = self.log_area.textCursor()
-            cursor.select(QTextCursor.SelectionType.Document)
-            format = cursor.charFormat()
-            format.setBackground(QColor("white"))
-            cursor.mergeCharFormat(format)
+
+    def find_next(self):
+        """定位到下一个匹配"""
+        if self.search_timer.isActive():
+            self.run_search()
             return
-            
-        # 设置高亮颜色
-        highlight_color = QColor("#cce8ff")  # 浅蓝色背景
-        
-        # 保存当前滚动位置
-        scrollbar = self.log_area.verticalScrollBar()
-        scroll_pos = scrollbar.value()
-        
-        # 开始搜索和高亮
-        cursor = self.log_area.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.Start)
-        
-        # 清除之前的高亮
-        cursor.select(QTextCursor.SelectionType.Document)
-        format = cursor.charFormat()
-        format.setBackground(QColor("white"))
-        cursor.mergeCharFormat(format)
-        cursor.clearSelection()
-        
-        # 高亮新的匹配项
-        cursor.movePosition(QTextCursor.MoveOperation.Start)
-        while True:
-            cursor = self.log_area.document().find(text, cursor)
-            if cursor.isNull():
-                break
-            format = cursor.charFormat()
-            format.setBackground(highlight_color)
-            cursor.mergeCharFormat(format)
-        
-        # 恢复滚动位置
-        scrollbar.setValue(scroll_pos)
-    
+        self._move_to_match(self.log_search.next_match(self._current_match))
+
+    def find_previous(self):
+        """定位到上一个匹配"""
+        if self.search_timer.isActive():
+            self.run_search()
+            return
+        self._move_to_match(self.log_search.previous_match(self._current_match))
+
+    def _move_to_match(self, seq):
+        if seq is None:
+            return
+        self._current_match = seq
+        self._scroll_to_seq(seq)
+        self.highlight_visible_matches()
+        self._update_match_label()
+
+    def _block_number(self, seq: int) -> int:
+        """日志序号对应的文本块序号，行已被删除时返回负数"""
+        return self.log_area.blockCount() - (self._next_seq - seq)
+
+    def _scroll_to_seq(self, seq: int):
+        block = self.log_area.document().findBlockByNumber(self._block_number(seq))
+        if block.isValid():
+            self.log_area.setTextCursor(QTextCursor(block))
+            self.log_area.centerCursor()
+
+    def _update_match_label(self):
+        if not self.log_search.query:
+            self.match_label.clear()
+            return
+        total = len(self.log_search)
+        position = self.log_search.position(self._current_match) if self._current_match is not None else -1
+        self.match_label.setText(f"{position + 1}/{total}" if position >= 0 else f"{total} 个匹配")
+
+    def highlight_visible_matches(self):
+        """只高亮可见范围内的匹配，当前匹配使用更深的颜色"""
+        selections = []
+        if len(self.log_search):
+            viewport = self.log_area.viewport()
+            first_block = self.log_area.cursorForPosition(QPoint(0, 0)).blockNumber()
+            last_block = self.log_area.cursorForPosition(QPoint(0, viewport.height() - 1)).blockNumber()
+            document = self.log_area.document()
+            for block_number in range(first_block, last_block + 1):
+                seq = self._next_seq - (self.log_area.blockCount() - block_number)
+                if seq not in self.log_search:
+                    continue
+                block = document.findBlockByNumber(block_number)
+                color = QColor("#ffd27f") if seq == self._current_match else QColor("#cce8ff")
+                for start, length in self.log_search.find_spans(block.text()):
+                    selection = QTextEdit.ExtraSelection()
+                    selection.format.setBackground(color)
+                    selection.cursor = QTextCursor(block)
+                    selection.cursor.setPosition(block.position() + start)
+                    selection.cursor.setPosition(block.position() + start + length,
+                                                 QTextCursor.MoveMode.KeepAnchor)
+                    selections.append(selection)
+        self.log_area.setExtraSelections(selections)
+
+    def flush_pending(self):
+        """把缓冲区中新增的日志一次性追加到界面，并增量更新搜索结果"""
+        first_seq, lines = self.log_store.take_pending()
+        if not lines:
+            return
+        self.log_area.appendPlainText("\n".join(lines))
+        self._next_seq = first_seq + len(lines)
+        if self.log_search.query:
+            self.log_search.add_lines(first_seq, lines)
+            # 超出行数上限被删除的行不再参与搜索
+            self.log_search.discard_before(self._next_seq - self.log_area.blockCount())
+            if self._current_match is not None and self._current_match not in self.log_search:
+                self._current_match = None
+            self.highlight_visible_matches()
+            self._update_match_label()
+
     def append_log(self, text):
         """添加日志文本"""
-        self.log_area.append(text)
+        self.log_store.append(text)
         
     def clear_log(self):
         """清空日志"""
-        self.log_area.clear()
\ No newline at end of file
+        self.log_store.clear()
+        self.log_area.clear()
+        self.log_search.set_query(self.log_search.query, self._next_seq, [])
+        self._current_match = None
+        self._update_match_label()
@@ -0,0 +1,223 @@
+from PyQt6.QtWidgets import QTableView
+from PyQt6.QtCore import QTimer
+from models.merged_index import MergedRangeIndex
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 合并区域数量超过该值时，只为视口附近的合并区域设置 Qt 跨度
+VIEWPORT_SPAN_THRESHOLD = 2000
+# 视口上下额外保留跨度的行数，避免小幅滚动时频繁更新
+SPAN_SCROLL_MARGIN = 100
+
+class MergedCellTableModel:
+    """
+    合并单元格的数据模型包装器
+    用于管理表格中的合并单元格信息，合并区域保存在网格桶索引中，
+    不再为区域内的每个单元格单独记录跨度
+    """
+    def __init__(self):
+        # 合并区域索引，支持按单元格定位和按视口范围查询
+        self.index = MergedRangeIndex()
+
+    @property
+    def merged_cells(self):
+        """所有合并单元格的信息，格式为: [((start_row, start_col), (end_row, end_col)), ...]"""
+        return [
+            ((start_row, start_col), (end_row, end_col))
+            for start_row, start_col, end_row, end_col in self.index.ranges()
+        ]
+
+    def add_merged_cell(self, start_pos, end_pos):
+        """
+        添加一个合并单元格区域
+        :param start_pos: 起始单元格位置(row, col)
+        :param end_pos: 结束单元格位置(row, col)
+        """
+        self.index.add(start_pos, end_pos)
+
+    def clear_merged_cells(self):
+        """清除所有合并单元格信息"""
+        self.index.clear()
+
+    def find_merged_cell(self, row, col):
+        """
+        查找包含指定单元格的合并区域
+        :return: (start_row, start_col, end_row, end_col)，未合并时返回 None
+        """
+        return self.index.find(row, col)
+
+    def get_cell_span(self, row, col):
+        """
+        获取指定单元格的跨度信息
+        :return: (rowspan, colspan) 元组，默认为(1, 1)表示未合并；
+                 被合并的非起始单元格返回(0, 0)
+        """
+        merged = self.index.find(row, col)
+        if merged is None:
+            return (1, 1)
+        start_row, start_col, end_row, end_col = merged
+        if (row, col) != (start_row, start_col):
+            return (0, 0)
+        return (end_row - start_row + 1, end_col - start_col + 1)
+
+    def get_merged_cells_in_range(self, first_row, last_row, first_col=0, last_col=None):
+        """
+        获取与指定范围相交的合并区域
+        :return: [(start_row, start_col, end_row, end_col), ...]
+        """
+        return self.index.query(first_row, last_row, first_col, last_col)
+
+class MergedTableView(QTableView):
+    """
+    支持合并单元格的表格视图
+    通过继承QTableView并使用Qt的原生setSpan方法实现单元格合并
+
+    合并区域很多时切换为视口模式：所有区域只登记在索引中，Qt 跨度只为
+    与可见行（加上滚动余量）相交的区域设置，并随滚动增量更新，
+    避免 Qt 的跨度集合在数万个区域下变慢
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 创建合并单元格模型
+        self.merge_model = MergedCellTableModel()
+        # 视口模式状态
+        self._viewport_spans = False
+        self._applied_spans = set()  # 当前已设置到 Qt 的合并区域
+        self._span_timer = QTimer(self)
+        self._span_timer.setSingleShot(True)
+        self._span_timer.timeout.connect(self._apply_visible_spans)
+        self.verticalScrollBar().valueChanged.connect(self._schedule_span_update)
+        # 显示网格线
+        self.setShowGrid(True)
+        # 设置选择模式为单选
+        self.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        # 设置选择行为为选择单元格
+        self.setSelectionBehavior(QTableView.SelectionBehavior.SelectItems)
+
+    def setSpan(self, row, column, rowSpan, columnSpan):
+        """
+        设置单元格的跨度（合并单元格）
+        :param row: 起始行
+        :param column: 起始列
+        :param rowSpan: 跨越的行数
+        :param columnSpan: 跨越的列数
+        """
+        # 调用Qt原生的setSpan方法进行单元格合并
+        super().setSpan(row, column, rowSpan, columnSpan)
+        # 如果是合并单元格（跨度大于1），则更新合并单元格模型
+        if rowSpan > 1 or columnSpan > 1:
+            start_pos = (row, column)
+            end_pos = (row + rowSpan - 1, column + columnSpan - 1)
+            self.merge_model.add_merged_cell(start_pos, end_pos)
+
+    def clearSpans(self):
+        """清除所有跨度和合并单元格信息"""
+        super().clearSpans()
+        self.merge_model.clear_merged_cells()
+        self._viewport_spans = False
+        self._applied_spans.clear()
+
+    def isViewportSpanMode(self):
+        """是否只为视口附近的合并区域设置跨度"""
+        return self._viewport_spans
+
+    def _enable_viewport_spans(self):
+        """切换到视口模式，已设置的 Qt 跨度全部清除，之后按视口重新设置"""
+        if self._viewport_spans:
+            return
+        logger.info("合并区域数量为 %d，只为视口附近的区域设置跨度", len(self.merge_model.index))
+        QTableView.clearSpans(self)
+        self._applied_spans.clear()
+        self._viewport_spans = True
+        self._schedule_span_update()
+
+    def _schedule_span_update(self, *args):
+        if self._viewport_spans:
+            self._span_timer.start(0)
+
+    def _apply_visible_spans(self):
+        """为与可见行相交的合并区域设置跨度，移除离开视口的跨度"""
+        if not self._viewport_spans or self.model() is None:
+            return
+        row_count = self.model().rowCount()
+        if row_count == 0:
+            return
+
+        first_row = self.rowAt(0)
+        last_row = self.rowAt(self.viewport().height() - 1)
+        first_row = 0 if first_row < 0 else first_row
+        last_row = row_count - 1 if last_row < 0 else last_row
+        first_row = max(0, first_row - SPAN_SCROLL_MARGIN)
+        last_row = min(row_count - 1, last_row + SPAN_SCROLL_MARGIN)
+
+        wanted = set(self.merge_model.get_merged_cells_in_range(first_row, last_row))
+        for start_row, start_col, end_row, end_col in self._applied_spans - wanted:
+            # 1x1 跨度会移除已有的跨度
+            QTableView.setSpan(self, start_row, start_col, 1, 1)
+        for start_row, start_col, end_row, end_col in wanted - self._applied_spans:
+            QTableView.setSpan(self, start_row, start_col,
+                               end_row - start_row + 1, end_col - start_col + 1)
+        self._applied_spans = wanted
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_span_update()
+
+    def addMergedCells(self, merged_cells, viewport_only=None):
+        """
+        在现有合并单元格的基础上追加合并区域
+        :param merged_cells: 合并单元格信息列表，格式为[((start_row, start_col), (end_row, end_col)), ...]
+        :param viewport_only: 是否只为视口附近的区域设置跨度，默认在区域数量超过阈值时自动启用
+        """
+        if viewport_only is None:
+            viewport_only = len(self.merge_model.index) + len(merged_cells) > VIEWPORT_SPAN_THRESHOLD
+        if viewport_only:
+            self._enable_viewport_spans()
+
+        for cell in merged_cells:
+            try:
+                # 验证数据格式
+                if not isinstance(cell, tuple) or len(cell) != 2:
+                    continue
+
+                start_pos, end_pos = cell
+                if not isinstance(start_pos, tuple) or not isinstance(end_pos, tuple):
+                    continue
+
+                start_row, start_col = start_pos
+                end_row, end_col = end_pos
+
+                if not all(isinstance(x, int) for x in (start_row, start_col, end_row, end_col)):
+                    continue
+
+                # 计算跨度
+                rowspan = end_row - start_row + 1
+                colspan = end_col - start_col + 1
+
+                if self._viewport_spans:
+                    # 视口模式下只登记到索引，跨度在视口更新时设置
+                    self.merge_model.add_merged_cell(start_pos, end_pos)
+                else:
+                    # 设置单元格跨度
+                    self.setSpan(start_row, start_col, rowspan, colspan)
+
+            except Exception as e:
+                logger.error(f"Error setting merged cell {cell}: {str(e)}")
+
+        self._schedule_span_update()
+
+    def setMergedCells(self, merged_cells, viewport_only=None):
+        """
+        批量设置合并单元格
+        :param merged_cells: 合并单元格信息列表，格式为[((start_row, start_col), (end_row, end_col)), ...]
+        :param viewport_only: 是否只为视口附近的区域设置跨度，默认在区域数量超过阈值时自动启用
+        """
+        # 清除现有的合并单元格信息和跨度
+        self.clearSpans()
+
+        # 处理每个合并单元格
+        self.addMergedCells(merged_cells, viewport_only)
+
+        # 更新视图
+        self.viewport().update()
@@ -0,0 +1,128 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QSplitter,
+                             QTreeWidget, QTreeWidgetItem, QFileDialog, QLabel)
+from PyQt6.QtCore import Qt, QTimer
+from models.timer import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PerformancePanel(QWidget):
+    """性能面板：显示各计时器的耗时分布和最近操作的区间树
+
+    上方表格按计时器名称列出次数、p50/p95/p99 和最大耗时；下方列出最近的
+    顶层操作，展开后可以看到每一步（打开文件、解码、设置模型、调整列宽等）
+    的耗时和计数器。面板可见时定时刷新，刷新时原地更新已有的行，只插入新的
+    操作、移除已过期的操作，展开状态和选中项不受影响。
+    """
+
+    REFRESH_INTERVAL_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._timer_items = {}  # {计时器名称: QTreeWidgetItem}
+        self._trace_items = {}  # {区间编号: QTreeWidgetItem}
+        self.setup_ui()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(4)
+
+        button_layout = QHBoxLayout()
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #999999;")
+        button_layout.addWidget(self.summary_label, 1)
+        refresh_button = QPushButton("刷新")
+        refresh_button.clicked.connect(self.refresh)
+        button_layout.addWidget(refresh_button)
+        export_button = QPushButton("导出JSON")
+        export_button.clicked.connect(self.export_json)
+        button_layout.addWidget(export_button)
+        reset_button = QPushButton("清空")
+        reset_button.clicked.connect(self.reset)
+        button_layout.addWidget(reset_button)
+        layout.addLayout(button_layout)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        layout.addWidget(splitter)
+
+        self.timer_tree = QTreeWidget()
+        self.timer_tree.setHeaderLabels(["计时器", "次数", "p50 (ms)", "p95 (ms)", "p99 (ms)", "最大 (ms)"])
+        self.timer_tree.setRootIsDecorated(False)
+        self.timer_tree.setSortingEnabled(True)
+        self.timer_tree.setColumnWidth(0, 160)
+        splitter.addWidget(self.timer_tree)
+
+        self.trace_tree = QTreeWidget()
+        self.trace_tree.setHeaderLabels(["操作", "耗时 (ms)", "计数"])
+        self.trace_tree.setColumnWidth(0, 220)
+        splitter.addWidget(self.trace_tree)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start(self.REFRESH_INTERVAL_MS)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """从全局指标注册表刷新显示"""
+        snapshot = metrics.snapshot()
+
+        self.timer_tree.setSortingEnabled(False)
+        for name, stats in snapshot["timers"].items():
+            item = self._timer_items.get(name)
+            if item is None:
+                item = self._timer_items[name] = QTreeWidgetItem([name, "", "", "", "", ""])
+                self.timer_tree.addTopLevelItem(item)
+            for column, value in enumerate((stats["count"], stats["p50"] * 1000, stats["p95"] * 1000,
+                                            stats["p99"] * 1000, stats["max"] * 1000), start=1):
+                # 按数值排序
+                item.setData(column, Qt.ItemDataRole.DisplayRole, round(value, 2))
+        self.timer_tree.setSortingEnabled(True)
+
+        # 已滚出最近操作列表的区间从树中移除
+        trace_ids = {trace["id"] for trace in snapshot["traces"]}
+        for span_id in [span_id for span_id in self._trace_items if span_id not in trace_ids]:
+            item = self._trace_items.pop(span_id)
+            self.trace_tree.takeTopLevelItem(self.trace_tree.indexOfTopLevelItem(item))
+        # 新的操作插入到最上面，最新的在最前
+        for trace in snapshot["traces"]:
+            if trace["id"] not in self._trace_items:
+                item = self._trace_items[trace["id"]] = self._build_trace_item(trace)
+                self.trace_tree.insertTopLevelItem(0, item)
+
+        counters = "，".join(f"{name}: {value:g}" for name, value in snapshot["counters"].items())
+        self.summary_label.setText(counters)
+
+    def _build_trace_item(self, span) -> QTreeWidgetItem:
+        name = f"{span['name']} {span['detail']}" if span["detail"] else span["name"]
+        counters = ", ".join(f"{key}={value:g}" for key, value in span["counters"].items())
+        item = QTreeWidgetItem([name, f"{span['duration'] * 1000:.2f}", counters])
+        item.setToolTip(0, name)
+        for child in span["children"]:
+            item.addChild(self._build_trace_item(child))
+        return item
+
+    def export_json(self):
+        """把指标导出为 JSON 文件"""
+        path, _ = QFileDialog.getSaveFileName(self, "导出性能数据", "performance.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            metrics.export_json(path)
+            logger.info(f"性能数据已导出到 {path}")
+        except Exception as e:
+            logger.error(f"导出性能数据失败: {str(e)}")
+
+    def reset(self):
+        metrics.reset()
+        self.timer_tree.clear()
+        self.trace_tree.clear()
+        self._timer_items.clear()
+        self._trace_items.clear()
+        self.refresh()
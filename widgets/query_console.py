@@ -0,0 +1,146 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QPlainTextEdit,
+                             QPushButton, QLabel, QListWidget, QListWidgetItem, QTableView)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QShortcut, QKeySequence
+from models.table_model import TableModel
+from models.query_runner import QueryRunner
+from excel_processor import ExcelProcessor
+from widgets.column_sizer import ColumnSizer
+import logging
+
+logger = logging.getLogger(__name__)
+
+class QueryConsole(QWidget):
+    """在已导入的工作表上执行 SQL 的查询控制台
+
+    查询在后台只读连接上执行，结果按页追加到表格模型，执行期间界面保持响应，
+    可以随时取消。左侧列出目录表中已导入的工作表，双击把表名插入到编辑器。
+    """
+
+    def __init__(self, db_path: str = "data.db", parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.processor = ExcelProcessor(db_path)
+        self.runner = QueryRunner(db_path, self)
+        self.runner.columns_ready.connect(self.on_columns_ready)
+        self.runner.rows_ready.connect(self.on_rows_ready)
+        self.runner.query_finished.connect(self.on_query_finished)
+        self.runner.query_failed.connect(self.on_query_failed)
+        self._first_page = True
+        self.setup_ui()
+        self.refresh_tables()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        layout.addWidget(splitter)
+
+        self.table_list = QListWidget()
+        self.table_list.itemDoubleClicked.connect(self.insert_table_name)
+        splitter.addWidget(self.table_list)
+
+        right = QWidget()
+        right_layout = QVBoxLayout(right)
+        right_layout.setContentsMargins(4, 4, 4, 4)
+        right_layout.setSpacing(4)
+        splitter.addWidget(right)
+        splitter.setSizes([200, 800])
+
+        editor_splitter = QSplitter(Qt.Orientation.Vertical)
+        right_layout.addWidget(editor_splitter)
+
+        self.editor = QPlainTextEdit()
+        self.editor.setPlaceholderText("输入 SQL，Ctrl+Enter 执行")
+        self.editor.setStyleSheet("font-family: Consolas, 'Courier New', monospace; font-size: 12px;")
+        editor_splitter.addWidget(self.editor)
+
+        self.result_model = TableModel()
+        self.result_view = QTableView()
+        self.result_view.setModel(self.result_model)
+        self.column_sizer = ColumnSizer(self.result_view)
+        editor_splitter.addWidget(self.result_view)
+        editor_splitter.setSizes([150, 450])
+
+        button_layout = QHBoxLayout()
+        self.run_button = QPushButton("执行")
+        self.run_button.clicked.connect(self.run_query)
+        button_layout.addWidget(self.run_button)
+        self.cancel_button = QPushButton("取消")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_query)
+        button_layout.addWidget(self.cancel_button)
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #999999;")
+        button_layout.addWidget(self.status_label, 1)
+        right_layout.addLayout(button_layout)
+
+        QShortcut(QKeySequence("Ctrl+Return"), self.editor, activated=self.run_query)
+
+    def refresh_tables(self):
+        """从目录表刷新已导入工作表的列表"""
+        self.table_list.clear()
+        try:
+            entries = self.processor.list_imported_sheets()
+        except Exception as e:
+            logger.error(f"读取已导入的工作表失败: {str(e)}")
+            return
+        for entry in entries:
+            item = QListWidgetItem(entry.table_name)
+            item.setToolTip(f"{entry.file_path}\n{entry.sheet_name}（{entry.row_count} 行，{entry.column_count} 列）")
+            self.table_list.addItem(item)
+
+    def insert_table_name(self, item):
+        self.editor.insertPlainText(f"[{item.text()}]")
+        self.editor.setFocus()
+
+    def run_query(self):
+        """执行编辑器中选中的 SQL，没有选中时执行全部内容"""
+        sql = self.editor.textCursor().selectedText().replace("\u2029", "\n").strip()
+        if not sql:
+            sql = self.editor.toPlainText().strip()
+        if not sql:
+            return
+        self._first_page = True
+        self.result_model.setHeaderLabels(None)
+        self.result_model.setData([])
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.status_label.setText("正在执行...")
+        self.runner.run(sql)
+
+    def cancel_query(self):
+        self.runner.cancel()
+        self._set_idle()
+        self.status_label.setText(f"已取消，已显示 {self.result_model.rowCount()} 行")
+
+    def on_columns_ready(self, columns):
+        self.result_model.setHeaderLabels(columns)
+
+    def on_rows_ready(self, store):
+        if self._first_page:
+            self._first_page = False
+            self.result_model.setData(store)
+            self.column_sizer.apply(*self.column_sizer.estimate(self.result_model, store.max_text_lengths()))
+        else:
+            self.result_model.appendRows(store)
+        self.status_label.setText(f"正在执行... 已读取 {self.result_model.rowCount()} 行")
+
+    def on_query_finished(self, row_count: int, seconds: float, steps: int, truncated: bool):
+        self._set_idle()
+        more = "（结果过多，已截断）" if truncated else ""
+        self.status_label.setText(f"{row_count} 行{more}，耗时 {seconds * 1000:.1f} 毫秒，执行约 {steps} 条虚拟机指令")
+
+    def on_query_failed(self, error_msg: str):
+        self._set_idle()
+        self.status_label.setText(f"查询失败: {error_msg}")
+
+    def _set_idle(self):
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def close_console(self):
+        """关闭控制台，取消正在执行的查询"""
+        self.runner.cancel()
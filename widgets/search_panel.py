@@ -0,0 +1,102 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLineEdit, QLabel,
+                             QTreeWidget, QTreeWidgetItem)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from excel_processor import ExcelProcessor
+from models.search_runner import SearchRunner
+import os
+
+class SearchPanel(QWidget):
+    """在所有已导入工作表中全文搜索单元格
+
+    搜索基于 SQLite FTS5 索引，只包含导入时开启了 index_text 的工作表。
+    查询在后台线程中执行，新的搜索会取消尚未完成的搜索。
+    双击结果发出 cell_activated 信号，由主窗口打开文件并定位到单元格。
+    """
+    cell_activated = pyqtSignal(str, str, int, int)  # 文件路径, 工作表名称, 行, 列
+
+    # 输入停止多久后开始搜索（毫秒）
+    SEARCH_DELAY_MS = 250
+    MAX_RESULTS = 500
+
+    def __init__(self, processor=None, parent=None):
+        super().__init__(parent)
+        self.processor = processor or ExcelProcessor()
+        self.setup_ui()
+
+        self.search_runner = SearchRunner(self.processor, self)
+        self.search_runner.search_finished.connect(self.on_search_finished)
+        self.search_runner.search_failed.connect(self.on_search_failed)
+
+        # 输入时延迟搜索，避免每个按键都查询一次
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.timeout.connect(self.run_search)
+        self.search_input.textChanged.connect(lambda: self._search_timer.start(self.SEARCH_DELAY_MS))
+        self.search_input.returnPressed.connect(self.run_search)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(4)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜索已导入的数据...")
+        self.search_input.setClearButtonEnabled(True)
+        layout.addWidget(self.search_input)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #999999;")
+        layout.addWidget(self.status_label)
+
+        self.result_tree = QTreeWidget()
+        self.result_tree.setHeaderLabels(["内容", "工作表", "位置"])
+        self.result_tree.setRootIsDecorated(False)
+        self.result_tree.setColumnWidth(0, 160)
+        self.result_tree.itemDoubleClicked.connect(self.on_result_activated)
+        layout.addWidget(self.result_tree)
+
+    def run_search(self):
+        """在后台开始搜索，结果由 on_search_finished 显示"""
+        self._search_timer.stop()
+        query = self.search_input.text().strip()
+        self.result_tree.clear()
+        if not query:
+            self.search_runner.cancel()
+            self.status_label.clear()
+            return
+        self.status_label.setText("正在搜索...")
+        self.search_runner.search(query, self.MAX_RESULTS)
+
+    def on_search_finished(self, matches, seconds):
+        """显示搜索结果"""
+        self.result_tree.clear()
+        for match in matches:
+            item = QTreeWidgetItem([
+                match.value,
+                f"{os.path.basename(match.file_path)} - {match.sheet_name}",
+                f"{self._column_name(match.column)}{match.row + 1}",
+            ])
+            item.setToolTip(1, match.file_path)
+            item.setData(0, Qt.ItemDataRole.UserRole, match)
+            self.result_tree.addTopLevelItem(item)
+
+        more = "+" if len(matches) >= self.MAX_RESULTS else ""
+        self.status_label.setText(f"{len(matches)}{more} 个结果，耗时 {seconds * 1000:.1f} 毫秒")
+
+    def on_search_failed(self, error_msg):
+        self.status_label.setText(f"搜索失败: {error_msg}")
+
+    def on_result_activated(self, item, column):
+        match = item.data(0, Qt.ItemDataRole.UserRole)
+        if match is not None:
+            self.cell_activated.emit(match.file_path, match.sheet_name, match.row, match.column)
+
+    @staticmethod
+    def _column_name(column: int) -> str:
+        """Excel风格的列名（A, B, ..., Z, AA, ...）"""
+        name = ""
+        column += 1
+        while column:
+            column, remainder = divmod(column - 1, 26)
+            name = chr(ord('A') + remainder) + name
+        return name